@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import logging
 import os
 import sys
@@ -184,6 +185,34 @@ def _make_tempdirs(parser, args):
             shutil.rmtree(td)
 
 
+# If this environment variable names a file, the timer records of fontmake's
+# and ufo2ft's build steps are appended to it as JSON lines, whether or not
+# --timing was given. gftools-builder uses this to profile its builds.
+TIMING_LOG_VARIABLE = "FONTMAKE_TIMING_LOG"
+
+
+class _TimingLogHandler(logging.Handler):
+    def __init__(self, path):
+        super().__init__(logging.DEBUG)
+        self.path = path
+
+    def emit(self, record):
+        # Timer passes its {"msg": ..., "time": ...} as the record's args
+        if not isinstance(record.args, dict) or "time" not in record.args:
+            return
+        entry = {
+            "logger": record.name,
+            "section": record.args.get("msg") or record.getMessage(),
+            "time": record.args["time"],
+            "end": record.created,
+        }
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            self.handleError(record)
+
+
 def _configure_logging(level=None, timing=False):
     fmt = "%(levelname)s:%(name)s:%(message)s"
     if level is not None:
@@ -197,6 +226,16 @@ def _configure_logging(level=None, timing=False):
         # can enable them without needing to lower the global verbosity level
         configLogger(logger="fontmake.timer", level=logging.DEBUG, format=fmt)
         configLogger(logger="ufo2ft.timer", level=logging.DEBUG, format=fmt)
+    timing_log = os.environ.get(TIMING_LOG_VARIABLE)
+    if timing_log:
+        handler = _TimingLogHandler(timing_log)
+        for name in ("fontmake.timer", "ufo2ft.timer"):
+            logger = logging.getLogger(name)
+            logger.addHandler(handler)
+            if not timing:
+                # Record the timings without printing them
+                logger.setLevel(logging.DEBUG)
+                logger.propagate = False
 
 
 def main(args=None):
@@ -244,6 +283,19 @@ def main(args=None):
         "script, category, subCategory, etc.). Can be used more than once "
         "(for Glyphs sources only).",
     )
+    otherInputGroup.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Convert the glyphs of a Glyphs source to UFO with N processes. "
+        "The UFOs are the same whatever N is. Default: 1.",
+    )
+    otherInputGroup.add_argument(
+        "--keep-backup-layers",
+        action="store_true",
+        help="Read the backup layers and layer backgrounds of a Glyphs source, "
+        "which are otherwise skipped as they are not used to build fonts.",
+    )
 
     outputGroup = parser.add_argument_group(title="Output arguments")
     outputGroup.add_argument(
@@ -269,8 +321,11 @@ def main(args=None):
     outputSubGroup.add_argument(
         "--output-path",
         default=None,
+        action="append",
         help="Output font file path. Only valid when the output is a single "
-        "file (e.g. input is a single UFO or output is a single variable font)",
+        "file (e.g. input is a single UFO or output is a single variable font). "
+        "When building several formats from a single UFO, may be given once "
+        "for each output format, in the same order",
     )
     outputSubGroup.add_argument(
         "--output-dir",
@@ -439,6 +494,24 @@ def main(args=None):
         help="Select library to remove overlaps. Choose between: %(choices)s "
         "(default: %(default)s)",
     )
+    contourGroup.add_argument(
+        "--filter-jobs",
+        type=int,
+        metavar="N",
+        default=1,
+        help="Run the filters which work on each glyph on its own, such as "
+        "removing overlaps, with N processes when building static fonts. "
+        "The fonts are the same whatever N is. Default: %(default)s.",
+    )
+    contourGroup.add_argument(
+        "--master-jobs",
+        type=int,
+        metavar="N",
+        default=1,
+        help="Compile the masters of variable and interpolatable fonts with N "
+        "processes, after they have been preprocessed together. The fonts are "
+        "the same whatever N is. Default: %(default)s.",
+    )
     contourGroup.add_argument(
         "--keep-direction",
         dest="reverse_direction",
@@ -673,6 +746,18 @@ def main(args=None):
 
     inputs = parse_mutually_exclusive_inputs(parser, args)
 
+    output_paths = args["output_path"]
+    if output_paths is not None:
+        if len(output_paths) == 1:
+            args["output_path"] = output_paths[0]
+        elif inputs.ufo_paths and len(output_paths) == len(args["output"]):
+            args["output_path"] = dict(zip(args["output"], output_paths))
+        else:
+            parser.error(
+                "--output-path can only be given more than once for UFO "
+                "input, once for each output format"
+            )
+
     if INTERPOLATABLE_OUTPUTS.intersection(args["output"]):
         if not (inputs.glyphs_path or inputs.designspace_path):
             parser.error("Glyphs or designspace source required for variable font")
@@ -718,6 +803,8 @@ def main(args=None):
                 "master_dir",
                 "instance_dir",
                 "glyph_data",
+                "jobs",
+                "keep_backup_layers",
             ],
             inputs.format_name,
         )
@@ -743,6 +830,7 @@ def main(args=None):
         )
         args.pop("ufo_structure", None)  # unused for UFO output
         args.pop("indent_json", None)
+        args.pop("master_jobs", None)  # only for variable and interpolatable outputs
         project.run_from_ufos(
             inputs.ufo_paths, is_instance=args.pop("masters_as_instances"), **args
         )
@@ -17,11 +17,13 @@ from __future__ import annotations
 import dataclasses
 import enum
 import glob
+import json
 import logging
 import math
 import os
 import shutil
 import tempfile
+import time
 from collections import OrderedDict
 from functools import partial
 from pathlib import Path
@@ -78,6 +80,10 @@ INSTANCE_LOCATION_KEY = "com.github.googlefonts.fontmake.instance_location"
 INSTANCE_FILENAME_KEY = "com.github.googlefonts.fontmake.instance_filename"
 
 
+# A tool running fontmake can ask it to report what it is doing: each step
+# appends a JSON line to the file named by this environment variable.
+PROGRESS_LOG_VARIABLE = "FONTMAKE_PROGRESS_LOG"
+
 UFO_STRUCTURE_EXTENSIONS = {
     "package": ".ufo",
     "zip": ".ufoz",
@@ -85,6 +91,27 @@ UFO_STRUCTURE_EXTENSIONS = {
 }
 
 
+def report_progress(phase, done=None, total=None, glyphs=None):
+    """Add a progress event to the progress log, if one was asked for.
+
+    *phase* says what fontmake is doing; *done* and *total* count the fonts
+    it has worked on in this phase, and *glyphs* is the size of the current
+    one.
+    """
+    path = os.environ.get(PROGRESS_LOG_VARIABLE)
+    if not path:
+        return
+    event = {"phase": phase, "time": time.time()}
+    for key, value in (("done", done), ("total", total), ("glyphs", glyphs)):
+        if value is not None:
+            event[key] = value
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+    except OSError:
+        pass
+
+
 class CurveConversion(enum.Enum):
     # convert all cubic Bezier curves to quadratic splines: glyf format 0
     ALL_CUBIC_TO_QUAD = "cu2qu"
@@ -174,19 +201,34 @@ class FontProject:
             Path(path).with_suffix(UFO_STRUCTURE_EXTENSIONS[ufo_structure])
         )
 
-    def save_ufo_as(self, font, path, ufo_structure="package", indent_json=False):
+    def save_ufo_as(
+        self, font, path, ufo_structure="package", indent_json=False, incremental=False
+    ):
+        """Save a UFO.
+
+        A JSON UFO whose contents did not change is left untouched, so that
+        whatever depends on it need not be rebuilt. If `incremental` is true
+        (for masters built from Glyphs sources), a UFO package is updated with
+        glyphsLib.util.save_ufo_incrementally, which rewrites only the files
+        which changed but keeps a hash of each glyph in the UFO lib.
+        """
         try:
             path = _ensure_parent_dir(path)
             if ufo_structure == "json":
-                with open(path, "wb") as f:
-                    # pylint: disable=no-member
-                    font.json_dump(
-                        f,
-                        # orjson only supports either 2 or none
-                        indent=2 if indent_json else None,
-                        # makes output deterministic
-                        sort_keys=True,
-                    )  # type: ignore
+                # pylint: disable=no-member
+                data = font.json_dumps(
+                    # orjson only supports either 2 or none
+                    indent=2 if indent_json else None,
+                    # makes output deterministic
+                    sort_keys=True,
+                )  # type: ignore
+                if not _has_contents(path, data):
+                    with open(path, "wb") as f:
+                        f.write(data)
+            elif ufo_structure == "package" and incremental:
+                from glyphsLib.util import save_ufo_incrementally
+
+                save_ufo_incrementally(font, path, validate=self.validate_ufo)
             else:
                 font.save(
                     path,
@@ -212,6 +254,8 @@ class FontProject:
         indent_json=False,
         glyph_data=None,
         save_ufos=True,
+        jobs=None,
+        keep_backup_layers=False,
     ):
         """Build UFOs and designspace from Glyphs source."""
         import glyphsLib
@@ -239,7 +283,9 @@ class FontProject:
             ) from e
 
         try:
-            font = glyphsLib.load(glyphs_path)
+            # The UFOs are minimal, so what only the editor needs can be left
+            # out already when reading.
+            font = glyphsLib.load(glyphs_path, minimal=not keep_backup_layers)
         except Exception as e:
             raise FontmakeError("Loading Glyphs file failed", glyphs_path) from e
 
@@ -253,6 +299,7 @@ class FontProject:
             store_editor_state=False,
             minimal=True,
             glyph_data=glyph_data,
+            jobs=jobs or 1,
         )
 
         masters = {}
@@ -280,14 +327,16 @@ class FontProject:
 
         if save_ds:
             logger.info("Saving %s", designspace_path)
-            designspace.write(_ensure_parent_dir(designspace_path))
+            _write_designspace(designspace, _ensure_parent_dir(designspace_path))
         else:
             designspace.path = designspace_path
 
         if save_ufos:
             for ufo_path, ufo in masters.items():
                 logger.info("Saving %s", ufo_path)
-                self.save_ufo_as(ufo, ufo_path, ufo_structure, indent_json)
+                self.save_ufo_as(
+                    ufo, ufo_path, ufo_structure, indent_json, incremental=True
+                )
 
         return designspace
 
@@ -333,6 +382,7 @@ class FontProject:
         flatten_components=False,
         filters=None,
         auto_use_my_metrics=True,
+        master_jobs=1,
         **kwargs,
     ):
         if ttf:
@@ -350,6 +400,7 @@ class FontProject:
                 filters=filters,
                 flattenComponents=flatten_components,
                 autoUseMyMetrics=auto_use_my_metrics,
+                masterJobs=master_jobs,
                 inplace=True,
             )
         else:
@@ -361,6 +412,7 @@ class FontProject:
                 debugFeatureFile=debug_feature_file,
                 feaIncludeDir=fea_include_dir,
                 filters=filters,
+                masterJobs=master_jobs,
                 inplace=True,
             )
 
@@ -398,6 +450,7 @@ class FontProject:
         auto_use_my_metrics=True,
         drop_implied_oncurves=False,
         variable_features=True,
+        master_jobs=1,
         **kwargs,
     ):
         """Build OpenType variable fonts from masters in a designspace."""
@@ -444,6 +497,13 @@ class FontProject:
         logger.info(
             "Building variable fonts " + ", ".join(vf_name_to_output_path.values())
         )
+        default = designspace.findDefault()
+        report_progress(
+            "Building variable fonts",
+            done=0,
+            total=len(vf_name_to_output_path),
+            glyphs=len(default.font) if default and default.font else None,
+        )
 
         if ttf:
             ttf_curves = CurveConversion(ttf_curves)
@@ -465,6 +525,7 @@ class FontProject:
                 autoUseMyMetrics=auto_use_my_metrics,
                 dropImpliedOnCurves=drop_implied_oncurves,
                 variableFeatures=variable_features,
+                masterJobs=master_jobs,
             )
         else:
             fonts = ufo2ft.compileVariableCFF2s(
@@ -479,6 +540,7 @@ class FontProject:
                 inplace=True,
                 variableFontNames=list(vf_name_to_output_path),
                 variableFeatures=variable_features,
+                masterJobs=master_jobs,
             )
 
         for name, font in fonts.items():
@@ -486,7 +548,9 @@ class FontProject:
             logger.info("Saving %s", output_path)
             font.save(_ensure_parent_dir(output_path))
 
-    def _iter_compile(self, ufos, ttf=False, debugFeatureFile=None, **kwargs):
+    def _iter_compile(
+        self, ufos, ttf=False, debugFeatureFile=None, sharedFeatures=None, **kwargs
+    ):
         # generator function that calls ufo2ft compiler for each ufo and
         # yields ttFont instances
         options = dict(kwargs)
@@ -508,13 +572,17 @@ class FontProject:
             compile_func, fmt = ufo2ft.compileOTF, "OTF"
 
         writeFontName = len(ufos) > 1
-        for ufo in ufos:
+        for done, ufo in enumerate(ufos):
             name = self._font_name(ufo)
             logger.info(f"Building {fmt} for {name}")
+            report_progress(f"Building {fmt}", done, len(ufos), len(ufo))
 
             if debugFeatureFile and writeFontName:
                 debugFeatureFile.write(f"\n### {name} ###\n")
 
+            if sharedFeatures is not None:
+                options["sharedFeatures"] = sharedFeatures.setdefault(id(ufo), {})
+
             try:
                 yield compile_func(ufo, debugFeatureFile=debugFeatureFile, **options)
             except Exception as e:
@@ -552,6 +620,8 @@ class FontProject:
         fea_include_dir=None,
         auto_use_my_metrics=True,
         drop_implied_oncurves=False,
+        shared_features=None,
+        filter_jobs=1,
     ):
         """Build OpenType binaries from UFOs.
 
@@ -613,6 +683,12 @@ class FontProject:
                 component flags (0x0200). Not needed unless the font has hinted metrics.
             drop_implied_oncurves: drop on-curve points that can be implied when exactly
                 in the middle of two off-curve points (TrueType only; default: False).
+            shared_features: a dict shared with another save_otfs call for the
+                same UFOs in the other format, so that each UFO's OpenType
+                layout tables are only compiled once.
+            filter_jobs: the number of processes with which to run the
+                filters which work on each glyph on its own, such as removing
+                overlaps. The fonts are the same whatever the number.
         """  # noqa: B950
         assert not (output_path and output_dir), "mutually exclusive args"
 
@@ -672,7 +748,9 @@ class FontProject:
             filters=filters,
             autoUseMyMetrics=auto_use_my_metrics,
             dropImpliedOnCurves=drop_implied_oncurves,
-            inplace=True,  # avoid extra copy
+            sharedFeatures=shared_features,
+            filterJobs=filter_jobs,
+            inplace=inplace,
         )
 
         if interpolate_layout_from is not None:
@@ -870,6 +948,8 @@ class FontProject:
         write_skipexportglyphs=True,
         generate_GDEF=True,
         glyph_data=None,
+        jobs=None,
+        keep_backup_layers=False,
         output=(),
         output_dir=None,
         interpolate=False,
@@ -891,6 +971,10 @@ class FontProject:
                 tags to MTI source paths which should be compiled into
                 those tables.
             glyph_data: A list of GlyphData XML file paths.
+            jobs: The number of processes to convert the glyphs to UFO with
+                (default: 1).
+            keep_backup_layers: Read the backup layers and layer backgrounds
+                too, which are otherwise skipped as the UFOs don't use them.
             kwargs: Arguments passed along to run_from_designspace.
         """
         # only save *master* UFOs when explicitly requested: i.e. outputs contain
@@ -907,6 +991,7 @@ class FontProject:
             master_dir = output_dir
 
         logger.info("Building master UFOs and designspace from Glyphs source")
+        report_progress("Building master UFOs")
         designspace = self.build_master_ufos(
             glyphs_path,
             designspace_path=designspace_path,
@@ -920,6 +1005,8 @@ class FontProject:
             indent_json=kwargs.get("indent_json"),
             glyph_data=glyph_data,
             save_ufos=save_ufos,
+            jobs=jobs,
+            keep_backup_layers=keep_backup_layers,
         )
         # 'include' statements in features.fea should be resolved relative to
         # the input .glyphs path, like Glyphs.app would do, and not relative
@@ -1004,6 +1091,7 @@ class FontProject:
         assert not (output_path and output_dir), "mutually exclusive args"
 
         logger.info("Interpolating master UFOs from designspace")
+        done = 0
         for _location, subDoc in splitInterpolable(designspace):
             try:
                 generator = instantiator.Instantiator.from_designspace(
@@ -1033,6 +1121,8 @@ class FontProject:
                     continue
 
                 logger.info("Generating instance UFO for {!r}".format(instance.name))
+                report_progress("Generating instance UFOs", done)
+                done += 1
 
                 try:
                     instance.font = generator.generate_instance(instance)
@@ -1240,6 +1330,7 @@ class FontProject:
         indent_json=False,
         output_path=None,
         output_dir=None,
+        master_jobs=1,  # only for interpolatable outputs
         **kwargs,
     ):
         save_ufos = "ufo" in outputs
@@ -1369,12 +1460,28 @@ class FontProject:
 
         # if building both OTF & TTF we must tell ufo2ft to compile with inplace=False
         inplace = not (cff_version is not None and "ttf" in output)
+        if not inplace:
+            # ...and they can share the compiled OpenType layout tables
+            kwargs.setdefault("shared_features", {})
+
+        # output_path may also be a {format: path} dict
+        output_path = kwargs.pop("output_path", None)
+        if not isinstance(output_path, dict):
+            output_path = {fmt: output_path for fmt in output}
 
         if cff_version is not None:
-            self.build_otfs(ufos, cff_version=cff_version, inplace=inplace, **kwargs)
+            self.build_otfs(
+                ufos,
+                cff_version=cff_version,
+                inplace=inplace,
+                output_path=output_path.get("otf", output_path.get("otf-cff2")),
+                **kwargs,
+            )
 
         if "ttf" in output:
-            self.build_ttfs(ufos, inplace=inplace, **kwargs)
+            self.build_ttfs(
+                ufos, inplace=inplace, output_path=output_path.get("ttf"), **kwargs
+            )
 
     @staticmethod
     def _search_instances(designspace, pattern):
@@ -1518,3 +1625,22 @@ def _normpath(fname):
 def _ensure_parent_dir(path):
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def _has_contents(path, data):
+    try:
+        return os.path.getsize(path) == len(data) and Path(path).read_bytes() == data
+    except OSError:
+        return False
+
+
+def _write_designspace(designspace, path):
+    """Write a designspace, unless the file already has the same contents."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    designspace.write(temporary)
+    designspace.path = path
+    designspace.filename = os.path.basename(path)
+    if _has_contents(path, Path(temporary).read_bytes()):
+        os.remove(temporary)
+    else:
+        os.replace(temporary, path)
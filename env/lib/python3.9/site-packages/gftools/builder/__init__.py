@@ -1,5 +1,10 @@
+import glob
+import io
+import json
 import os
+import shutil
 import subprocess
+import sys
 import tempfile
 from collections import defaultdict
 from os import chdir
@@ -10,18 +15,26 @@ from typing import Any, Dict, List, Union
 import networkx as nx
 import strictyaml
 import yaml
-from fontmake.font_project import FontProject
-from ninja import _program
-from ninja.ninja_syntax import Writer, escape_path
+from ninja import BIN_DIR, _program
+from ninja.ninja_syntax import Writer, escape, escape_path
 
 from gftools.builder.file import File
+from gftools.builder.jobrunner.client import LOG_DIR_VARIABLE
 from gftools.builder.operations import OperationBase, known_operations
 from gftools.builder.operations.copy import Copy
 from gftools.builder.recipeproviders import get_provider
 from gftools.builder.schema import BASE_SCHEMA
+from gftools.utils import shell_quote
 
 Recipe = Dict[str, List[Dict[str, Any]]]
 
+# How much memory to allow for each fontmake job by default
+FONTMAKE_MEMORY = 2 * 1024 * 1024 * 1024
+
+# Libraries which can keep a cache of their own work between runs, but only
+# do so when given a directory in these environment variables.
+TOOL_CACHES = {"GLYPHSLIB_CACHE_DIR": "glyphsLib", "UFO2FT_CACHE_DIR": "ufo2ft"}
+
 
 def edge_with_operation(node, operation):
     for newnode, attributes in node.items():
@@ -30,6 +43,29 @@ def edge_with_operation(node, operation):
     return None
 
 
+class BuildDirFile(io.StringIO):
+    """A text file in the build directory which is only written out, when
+    closed, if its contents changed. The jobs which read it would otherwise
+    look out of date to ninja on every run."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def close(self):
+        if not self.closed:
+            contents = self.getvalue()
+            try:
+                with open(self.name) as f:
+                    changed = f.read() != contents
+            except OSError:
+                changed = True
+            if changed:
+                with open(self.name, "w") as f:
+                    f.write(contents)
+        super().close()
+
+
 class GFBuilder:
     config: dict
     recipe: Recipe
@@ -54,7 +90,11 @@ class GFBuilder:
             self.config = config
 
         self.writer = Writer(open("build.ninja", "w"))
+        self.worker_pool = False
+        self.profile = None
+        self.keep_logs = False
         self.named_files = {}
+        self._intermediate_paths = set()
         self.used_operations = set([])
         self.graph = nx.DiGraph()
         self.recipe = {}  # This will be the filled-in version
@@ -71,6 +111,29 @@ class GFBuilder:
             self.recipe = self.config["recipe"]
         self.validate_recipe()
 
+    # Normally, intermediate files get random temporary names. If the
+    # config gives a buildDir, they get stable names in there instead, so
+    # that ninja can tell what is already up to date on the next run.
+    @property
+    def build_dir(self):
+        return self.config.get("buildDir")
+
+    def temporary_file(self, name: str, mode: str = "w+"):
+        """Open a file for the build's own use (config files and so on)."""
+        if not self.build_dir:
+            return NamedTemporaryFile(delete=False, mode=mode)
+        os.makedirs(self.build_dir, exist_ok=True)
+        return BuildDirFile(os.path.join(self.build_dir, name))
+
+    def intermediate_path(self, name: str) -> str:
+        path = os.path.join(self.build_dir, name)
+        count = 1
+        while path in self._intermediate_paths:
+            count += 1
+            path = os.path.join(self.build_dir, f"{name}-{count}")
+        self._intermediate_paths.add(path)
+        return path
+
     def perform_overrides(self, automatic_recipe: Recipe):
         if "recipe" not in self.config:
             return automatic_recipe
@@ -133,6 +196,8 @@ class GFBuilder:
         return self._ensure_named_file(source, type="source")
 
     def glyphs_to_ufo(self, source):
+        from fontmake.font_project import FontProject
+
         source = Path(source)
         directory = source.resolve().parent
         output = str(Path(directory) / source.with_suffix(".designspace").name)
@@ -259,6 +324,10 @@ class GFBuilder:
                         # The target is the stamp file
                         # The source is the terminal binary
                         # The implicit files are any previous stamp files
+                        if self.build_dir:
+                            step.stamppath = self.intermediate_path(
+                                f"{target.basename}-{step.opname}.stamp"
+                            )
                         binary = File(step.stamppath)
                         self.graph.add_node(binary)
                         step._sources = last_operation.targets
@@ -275,19 +344,22 @@ class GFBuilder:
                         elif step.targets:  #  Step already knows its own target
                             binary = step.targets[0]
                         else:
-                            if self.config.get("logLevel") == "DEBUG":
+                            if self.build_dir or self.config.get("logLevel") == "DEBUG":
                                 debugnames = []
                                 for s in steps[0 : ix + 1]:
                                     if isinstance(s, OperationBase):
                                         debugnames.append(s.opname)
                                     if isinstance(s, File):
                                         debugnames = [s.basename]
-                                binary = File(
-                                    os.path.join(
-                                        tempfile.gettempdir(),
-                                        f"builder-{target.basename}-{'-'.join(debugnames)}",
+                                name = f"{target.basename}-{'-'.join(debugnames)}"
+                                if self.build_dir:
+                                    binary = File(self.intermediate_path(name))
+                                else:
+                                    binary = File(
+                                        os.path.join(
+                                            tempfile.gettempdir(), f"builder-{name}"
+                                        )
                                     )
-                                )
                             else:
                                 binary = File(NamedTemporaryFile().name)
                             self.graph.add_node(binary)
@@ -304,7 +376,100 @@ class GFBuilder:
 
     # Finally we walk the graph. We do another validation pass to make
     # sure that the operations make sense, and then we emit the ninja rules.
+    @property
+    def build_cache(self):
+        if not self.config.get("buildCache"):
+            return None
+        from gftools.builder.jobrunner.cache import BuildCache
+
+        return BuildCache(
+            os.path.abspath(self.config["buildCache"]), self.build_cache_size
+        )
+
+    @property
+    def build_cache_size(self):
+        if self.config.get("buildCacheSize") is None:
+            return None
+        return int(self.config["buildCacheSize"]) * 1024 * 1024
+
+    def jobrunner_options(self):
+        options = []
+        if self.build_cache:
+            options += ["--cache-dir", self.build_cache.directory]
+            if self.build_cache_size is not None:
+                options += ["--cache-size", str(self.build_cache_size)]
+        if self.profile:
+            options += ["--profile", self.profile_log]
+        return options
+
+    def jobrunner_command(self):
+        python = shell_quote(sys.executable)
+        if self.worker_pool:
+            # Run the client as a plain script, so that each job does not
+            # have to import the whole of gftools.builder just to hand
+            # itself over to the worker pool.
+            client = os.path.join(os.path.dirname(__file__), "jobrunner", "client.py")
+            command = f"{python} {shell_quote(client)}"
+        else:
+            command = f"{python} -m gftools.builder.jobrunner"
+        for option in self.jobrunner_options():
+            command += " " + escape(shell_quote(option))
+        return command
+
+    # Ninja starts whichever ready edge came first in build.ninja, so we
+    # write the edges out longest-chain-first: a job's priority is how long
+    # it and everything which waits on it take, going by the last build's
+    # .ninja_log, or by each operation's guessed cost for outputs ninja has
+    # not built before.
+    def pools(self):
+        try:
+            memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (AttributeError, ValueError, OSError):
+            memory = None
+        fontmake_jobs = os.cpu_count() or 1
+        if memory:
+            fontmake_jobs = min(fontmake_jobs, memory // FONTMAKE_MEMORY)
+        pools = {"fontmake": max(1, fontmake_jobs), "instanceStatics": 1}
+        pools.update(self.config.get("pools", {}))
+        return pools
+
+    def job_history(self):
+        history = {}
+        try:
+            with open(".ninja_log") as f:
+                for line in f:
+                    if line.startswith("#"):
+                        continue
+                    start, end, _, output, *_ = line.rstrip("\n").split("\t")
+                    history[os.path.abspath(output)] = (int(end) - int(start)) / 1000
+        except (OSError, ValueError):
+            pass
+        return history
+
+    def edge_priorities(self):
+        history = self.job_history()
+        remaining = {}
+        priorities = {}
+        for node in reversed(list(nx.topological_sort(self.graph))):
+            remaining[node] = 0
+            for target in self.graph.successors(node):
+                operation = self.graph[node][target].get("operation")
+                if operation is None:
+                    continue
+                cost = operation.cost
+                if target.path:
+                    cost = history.get(os.path.abspath(target.path), cost)
+                priority = cost + remaining[target]
+                priorities[operation] = max(priorities.get(operation, 0), priority)
+                remaining[node] = max(remaining[node], priority)
+        return priorities
+
     def walk_graph(self):
+        self.writer.variable("jobrunner", self.jobrunner_command())
+        self.writer.newline()
+        for name, depth in self.pools().items():
+            self.writer.pool(name, depth)
+            self.writer.newline()
         actions = defaultdict(list)
         final_targets = []
         for source, target in nx.algorithms.traversal.edge_bfs(self.graph):
@@ -316,13 +481,139 @@ class GFBuilder:
             if not list(self.graph.successors(target)):
                 final_targets.append(escape_path(target.path))
 
+        priorities = self.edge_priorities()
+        edges = []
+        batches = defaultdict(list)
         for (source, operation), targets in actions.items():
-            operation.build(self.writer)
+            if operation.batch_key is not None:
+                batches[operation.batch_key].append(operation)
+            else:
+                edges.append((priorities.get(operation, 0), [operation]))
+        for operations in batches.values():
+            priority = max(priorities.get(op, 0) for op in operations)
+            edges.append((priority, operations))
+        # Stable, so equal priorities keep the recipe's order
+        edges.sort(key=lambda edge: -edge[0])
+        for _, operations in edges:
+            type(operations[0]).build_batch(self.writer, operations)
 
         assert len(final_targets), "No final targets"
         self.writer.default(final_targets)
         self.writer.close()
 
+    # While profiling, each job appends a line to the profile log; when
+    # ninja is done we write the trace and a summary from it.
+    @property
+    def profile_log(self):
+        return os.path.splitext(self.profile)[0] + ".jobs.jsonl"
+
+    def critical_path(self, entries):
+        """The jobs on the longest path through the build graph."""
+        jobs = {}
+        for entry in entries:
+            for output in entry["outputs"]:
+                jobs[output] = entry
+        graph = nx.DiGraph()
+        for source, target in self.graph.edges:
+            entry = None
+            if target.path:
+                entry = jobs.get(os.path.abspath(target.path))
+            graph.add_edge(
+                source, target, entry=entry, wall=entry["wall"] if entry else 0
+            )
+        path = []
+        nodes = nx.dag_longest_path(graph, weight="wall")
+        for source, target in zip(nodes, nodes[1:]):
+            entry = graph[source][target]["entry"]
+            # Batched jobs make several edges
+            if entry and (not path or path[-1] is not entry):
+                path.append(entry)
+        return path
+
+    def write_profile(self):
+        from gftools.builder.jobrunner import profile
+
+        entries = profile.read_log(self.profile_log)
+        critical_path = self.critical_path(entries)
+        with open(self.profile, "w") as f:
+            json.dump(profile.chrome_trace(entries, critical_path), f)
+        print(profile.summary(entries, critical_path))
+        print(f"Build profile written to {self.profile}")
+
+    # Each job streams its output into a log file, and reports its progress
+    # in a file next to it; on a terminal, we show that progress on one
+    # status line while ninja runs. Without a build directory the logs go in
+    # a temporary directory, which is deleted afterwards unless the build
+    # failed or we were asked to keep them.
+    def job_log_dir(self):
+        if self.build_dir:
+            directory = os.path.abspath(os.path.join(self.build_dir, "logs"))
+            os.makedirs(directory, exist_ok=True)
+            for progress in glob.glob(os.path.join(directory, "*.progress")):
+                os.remove(progress)
+            return directory
+        return tempfile.mkdtemp(prefix="gftools-builder-logs-")
+
+    # The same sources are read by many jobs, so we turn on the tools' own
+    # caches: in the build directory, or else just for this build.
+    def tool_cache_variables(self):
+        if self.build_dir:
+            directory = os.path.abspath(os.path.join(self.build_dir, "cache"))
+        else:
+            directory = tempfile.mkdtemp(prefix="gftools-builder-cache-")
+        return directory, {
+            variable: os.path.join(directory, name)
+            for variable, name in TOOL_CACHES.items()
+            if variable not in os.environ
+        }
+
+    def _ninja(self):
+        if not sys.stdout.isatty():
+            return _program("ninja", [])
+        from gftools.builder.jobrunner.status import run_ninja
+
+        return run_ninja(
+            os.path.join(BIN_DIR, "ninja"), [], os.environ[LOG_DIR_VARIABLE]
+        )
+
+    def run_ninja(self):
+        cache = self.build_cache
+        if cache:
+            since = cache.stats_offset()
+        if self.profile:
+            os.makedirs(os.path.dirname(self.profile_log), exist_ok=True)
+            if os.path.exists(self.profile_log):
+                os.remove(self.profile_log)
+        log_dir = self.job_log_dir()
+        os.environ[LOG_DIR_VARIABLE] = log_dir
+        tool_cache, tool_cache_variables = self.tool_cache_variables()
+        os.environ.update(tool_cache_variables)
+        result = 1
+        try:
+            if self.worker_pool:
+                from gftools.builder.jobrunner.worker import WorkerPool
+
+                with WorkerPool():
+                    result = self._ninja()
+            else:
+                result = self._ninja()
+        finally:
+            os.environ.pop(LOG_DIR_VARIABLE, None)
+            for variable in tool_cache_variables:
+                os.environ.pop(variable, None)
+            if not self.build_dir:
+                shutil.rmtree(tool_cache, ignore_errors=True)
+                if self.keep_logs or result != 0:
+                    print(f"Job logs kept in {log_dir}")
+                else:
+                    shutil.rmtree(log_dir, ignore_errors=True)
+        if cache:
+            stats = cache.stats(since)
+            print(f"Build cache: {stats['hit']} hits, {stats['miss']} misses")
+        if self.profile:
+            self.write_profile()
+        return result
+
     def draw_graph(self):
         import pydot
 
@@ -357,11 +648,30 @@ def main(args=None):
         "--graph", help="Draw a graph of the build process", action="store_true"
     )
     parser.add_argument("--no-ninja", help="Do not run ninja", action="store_true")
+    parser.add_argument(
+        "--worker-pool",
+        help="Run Python jobs in a pool of long-lived worker processes",
+        action="store_true",
+    )
     parser.add_argument(
         "--generate",
         help="Just generate and output recipe from recipe builder",
         action="store_true",
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse the outputs of previous builds from this directory",
+    )
+    parser.add_argument(
+        "--keep-logs",
+        help="Keep the job logs after the build, even if it succeeded",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="TRACE",
+        help="Time each job and write a Chrome trace of the build to this file",
+    )
     parser.add_argument("config", help="Path to config file or source file", nargs="+")
     args = parser.parse_args(args)
     yaml_files = []
@@ -385,16 +695,24 @@ def main(args=None):
             raise ValueError("Only one config file can be given for now")
         config = args.config[0]
 
+    # Resolve this before the builder changes into the config directory
+    cache_dir = os.path.abspath(args.cache_dir) if args.cache_dir else None
+    profile = os.path.abspath(args.profile) if args.profile else None
     pd = GFBuilder(config)
     if args.generate:
         config = pd.config
         config["recipe"] = pd.recipe
         print(yaml.dump(config))
         return
+    pd.worker_pool = args.worker_pool
+    pd.profile = profile
+    pd.keep_logs = args.keep_logs
+    if cache_dir:
+        pd.config["buildCache"] = cache_dir
     pd.config_to_objects()
     pd.build_graph()
     pd.walk_graph()
     if args.graph:
         pd.draw_graph()
     if not args.no_ninja:
-        raise SystemExit(_program("ninja", []))
+        raise SystemExit(pd.run_ninja())
@@ -2,11 +2,7 @@ import os
 from dataclasses import dataclass
 from functools import cached_property
 
-import ufoLib2
-from fontTools.designspaceLib import InstanceDescriptor
-from glyphsLib.builder import UFOBuilder
-
-from gftools.utils import open_ufo
+from gftools.builder.metadata import SourceMetadata, source_metadata
 
 
 @dataclass
@@ -52,7 +48,8 @@ class File:
         if self.is_glyphs:
             import glyphsLib
 
-            return glyphsLib.load(self.path)
+            # Glyphs are only parsed if they are used
+            return glyphsLib.load(self.path, lazy=True)
         return None
 
     @cached_property
@@ -63,29 +60,28 @@ class File:
             return DesignSpaceDocument.fromfile(self.path)
         return None
 
+    # What the recipe providers need to know about a source comes from its
+    # metadata, which is much cheaper to get than loading the whole thing.
     @cached_property
+    def metadata(self) -> SourceMetadata:
+        return source_metadata(self.path)
+
+    @property
     def instances(self):
-        if self.is_glyphs:
-            gsfont = self.gsfont
-            builder = UFOBuilder(gsfont, minimal=True)
-            builder.to_designspace_instances()
-            return builder._designspace.instances
-        elif self.is_designspace:
-            return self.designspace.instances
-        else:  # UFO
-            return [InstanceDescriptor(filename=self.basename)]
+        return self.metadata.instances
 
-    @cached_property
+    @property
+    def axes(self):
+        return self.metadata.axes
+
+    @property
     def family_name(self):
-        # Figure out target name
-        if self.is_glyphs:
-            name = self.gsfont.familyName
-        elif self.is_ufo:
-            ufo = open_ufo(self.path)
-            name = ufo.info.familyName
-        elif self.designspace.sources[0].familyName:
-            return self.designspace.sources[0].familyName
-        else:
-            self.designspace.loadSourceFonts(open_ufo)
-            return self.designspace.sources[0].font.info.familyName
-        return name
+        return self.metadata.family_name
+
+    @property
+    def master_count(self):
+        return self.metadata.master_count
+
+    @property
+    def feature_tags(self):
+        return self.metadata.feature_tags
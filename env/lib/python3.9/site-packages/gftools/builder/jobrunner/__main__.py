@@ -1,6 +1,8 @@
-import subprocess
 import sys
 
+from gftools.builder.jobrunner import job
+from gftools.builder.jobrunner.client import report, run_subprocess
+
 # A big problem with ninja is that because it runs multiple jobs at once,
 # the output of failing jobs is mixed up with the output of successful jobs.
 # Multiple successful short jobs can run while a big job is failing, meaning
@@ -8,12 +10,6 @@ import sys
 # wrong you
 
 if __name__ == "__main__":
-    cmd = " ".join(sys.argv[1:])
-    result = subprocess.run(sys.argv[1:], capture_output=True)
-    if result.returncode != 0:
-        print("\nCommand failed:\n" + cmd)
-        print(result.stdout.decode())
-        print(result.stderr.decode())
-    else:
-        print(cmd)
-    sys.exit(result.returncode)
+    returncode, stdout, stderr = job.run(sys.argv[1:], run_subprocess)
+    report(sys.argv[1:], returncode, stdout, stderr)
+    sys.exit(returncode)
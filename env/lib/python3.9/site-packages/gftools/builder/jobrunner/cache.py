@@ -0,0 +1,259 @@
+"""A content-addressed cache of builder job outputs.
+
+Each job is keyed by a hash of the operation name, its command line, the
+contents of every file it reads and the versions of the font tools which
+might run it. A designspace also brings in the masters it lists, and the
+feature files those masters include. Paths which are only the names of inputs or outputs (and are
+often random temporary files) are not part of the key, so a cache hit
+survives intermediate files being renamed between builds.
+
+The cache directory looks like this::
+
+    objects/ab/abcdef.../0, 1, ...   stored copies of the job's outputs
+    objects/ab/abcdef.../size        their total size in bytes
+    tmp/                             entries being written
+    stats.log                        one "hit" or "miss" line per job
+
+Entries are touched when they are used, and when the cache grows beyond
+its maximum size the least recently used entries are deleted first.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from functools import lru_cache
+from importlib import metadata
+
+KEY_VERSION = "1"
+
+TOOLS = [
+    "gftools",
+    "fontmake",
+    "fonttools",
+    "ufo2ft",
+    "glyphsLib",
+    "ufoLib2",
+    "defcon",
+    "cu2qu",
+    "booleanOperations",
+    "skia-pathops",
+    "cffsubr",
+    "ttfautohint-py",
+]
+
+
+@lru_cache(maxsize=None)
+def tool_versions():
+    versions = []
+    for tool in TOOLS:
+        try:
+            versions.append(f"{tool}=={metadata.version(tool)}")
+        except metadata.PackageNotFoundError:
+            pass
+    return "\n".join(versions)
+
+
+def digest_path(path):
+    """Hash the contents of a file, or of all the files in a directory."""
+    hasher = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                filename = os.path.join(root, name)
+                hasher.update(os.path.relpath(filename, path).encode() + b"\0")
+                hasher.update(_digest_file(filename).encode())
+    else:
+        hasher.update(_digest_file(path).encode())
+    return hasher.hexdigest()
+
+
+INCLUDE_RE = re.compile(r"\binclude\s*\(\s*([^)]+?)\s*\)")
+
+
+def source_dependencies(path):
+    """Other files which building from ``path`` reads.
+
+    For a designspace these are the master UFOs it lists and any feature
+    files included from them, which the command line never mentions.
+    """
+    if not path.endswith(".designspace"):
+        return []
+    try:
+        tree = ET.parse(path)
+    except (OSError, ET.ParseError):
+        return []
+    dependencies = []
+    base = os.path.dirname(path)
+    for source in tree.iter("source"):
+        filename = source.get("filename")
+        if not filename:
+            continue
+        master = os.path.normpath(os.path.join(base, filename))
+        if master in dependencies or not os.path.exists(master):
+            continue
+        dependencies.append(master)
+        features = os.path.join(master, "features.fea")
+        # ufo2ft resolves includes relative to the directory holding the UFO.
+        _feature_includes(features, os.path.dirname(master), dependencies)
+    return dependencies
+
+
+def _feature_includes(path, include_dir, seen):
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return
+    for match in INCLUDE_RE.finditer(text):
+        included = os.path.normpath(os.path.join(include_dir, match.group(1)))
+        if included in seen or not os.path.isfile(included):
+            continue
+        seen.append(included)
+        _feature_includes(included, include_dir, seen)
+
+
+def path_size(path):
+    """The size of a file, or of all the files in a directory."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    size = 0
+    for root, _, files in os.walk(path):
+        size += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return size
+
+
+def _digest_file(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _copy(source, destination):
+    if os.path.isdir(destination):
+        shutil.rmtree(destination)
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.isdir(source):
+        shutil.copytree(source, destination)
+    else:
+        # Not copy2: ninja needs the output to look newer than its inputs.
+        shutil.copyfile(source, destination)
+
+
+class BuildCache:
+    def __init__(self, directory, max_size=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.objects = os.path.join(directory, "objects")
+        self.tmp = os.path.join(directory, "tmp")
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.tmp, exist_ok=True)
+
+    def key(self, operation, command, inputs, outputs):
+        hasher = hashlib.sha256()
+        hasher.update(f"{KEY_VERSION}\n{operation}\n{tool_versions()}\n".encode())
+        for token in command:
+            if token in outputs:
+                token = "<output %i>" % outputs.index(token)
+            elif token in inputs or os.path.isfile(token):
+                # Inputs, and any other files the command mentions (config
+                # files, VTT sources, glyph data...) count by content.
+                dependencies = source_dependencies(token)
+                token = "<file %s>" % digest_path(token)
+                for dependency in dependencies:
+                    token += "\n<file %s>" % digest_path(dependency)
+            hasher.update(token.encode() + b"\0")
+        return hasher.hexdigest()
+
+    def entry(self, key):
+        return os.path.join(self.objects, key[:2], key)
+
+    def restore(self, key, outputs):
+        entry = self.entry(key)
+        if not os.path.isdir(entry):
+            return False
+        try:
+            for ix, output in enumerate(outputs):
+                _copy(os.path.join(entry, str(ix)), output)
+            os.utime(entry)
+        except OSError:
+            # Probably evicted underneath us; just run the job.
+            return False
+        return True
+
+    def store(self, key, outputs):
+        if not all(os.path.exists(output) for output in outputs):
+            return
+        entry = self.entry(key)
+        staging = tempfile.mkdtemp(dir=self.tmp)
+        size = 0
+        for ix, output in enumerate(outputs):
+            destination = os.path.join(staging, str(ix))
+            _copy(output, destination)
+            size += path_size(destination)
+        with open(os.path.join(staging, "size"), "w") as f:
+            f.write(str(size))
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        try:
+            os.replace(staging, entry)
+        except OSError:
+            # Someone else stored the same thing at the same time.
+            shutil.rmtree(staging, ignore_errors=True)
+        if self.max_size is not None:
+            self.evict()
+
+    def entries(self):
+        for prefix in os.listdir(self.objects):
+            for key in os.listdir(os.path.join(self.objects, prefix)):
+                entry = os.path.join(self.objects, prefix, key)
+                try:
+                    with open(os.path.join(entry, "size")) as f:
+                        size = int(f.read())
+                    yield os.path.getmtime(entry), size, entry
+                except (OSError, ValueError):
+                    continue
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    # Statistics. Jobs append a line each to the log; the builder notes
+    # where the log ended before it started ninja and counts from there.
+
+    @property
+    def stats_file(self):
+        return os.path.join(self.directory, "stats.log")
+
+    def record(self, event, operation):
+        with open(self.stats_file, "a") as f:
+            f.write(f"{event} {operation}\n")
+
+    def stats_offset(self):
+        try:
+            return os.path.getsize(self.stats_file)
+        except OSError:
+            return 0
+
+    def stats(self, since=0):
+        counts = Counter()
+        try:
+            with open(self.stats_file) as f:
+                f.seek(since)
+                for line in f:
+                    counts[line.split()[0]] += 1
+        except OSError:
+            pass
+        return counts
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.connection import Client
+
+# This module only uses the standard library, so that it can be run as a
+# plain script (python .../jobrunner/client.py ...) without importing the
+# gftools.builder package, which pulls in fontmake, ufo2ft and glyphsLib.
+# When the builder runs with a worker pool, every ninja edge goes through
+# here and hands the job to one of the pool's already-warm processes.
+
+ADDRESS_VARIABLE = "GFTOOLS_BUILDER_WORKER"
+AUTHKEY_VARIABLE = "GFTOOLS_BUILDER_WORKER_KEY"
+
+# While the builder runs ninja, each job streams its output into a log file
+# in this directory, and writes progress events (when it starts and ends,
+# and whatever fontmake reports in between) to a file next to it.
+LOG_DIR_VARIABLE = "GFTOOLS_BUILDER_LOG_DIR"
+# fontmake.font_project.PROGRESS_LOG_VARIABLE
+FONTMAKE_PROGRESS_VARIABLE = "FONTMAKE_PROGRESS_LOG"
+
+# How much of a job's output to keep in memory for the failure report
+TAIL_SIZE = 64 * 1024
+
+# Options for the jobrunner itself come before the command to run. They
+# all take a value, apart from these:
+FLAGS = {"--no-cache"}
+# The options which the client can deal with without the full jobrunner
+CLIENT_OPTIONS = {"operation", "input", "output", "no-cache"}
+
+
+def split_options(argv):
+    """Split a jobrunner command line into its options and the command."""
+    options = defaultdict(list)
+    i = 0
+    while i < len(argv) and argv[i].startswith("--"):
+        name = argv[i][2:]
+        if argv[i] in FLAGS:
+            options[name].append(True)
+            i += 1
+        else:
+            options[name].append(argv[i + 1])
+            i += 2
+    return options, argv[i:]
+
+
+class Tail:
+    """A ring buffer which keeps the last *size* bytes written to it."""
+
+    def __init__(self, size=TAIL_SIZE):
+        self.size = size
+        self.buffer = bytearray()
+        self.dropped = 0
+
+    def write(self, data):
+        self.buffer += data
+        excess = len(self.buffer) - self.size
+        if excess > 0:
+            del self.buffer[:excess]
+            self.dropped += excess
+
+    def getvalue(self):
+        if self.dropped:
+            return b"[... %i bytes cut ...]\n" % self.dropped + bytes(self.buffer)
+        return bytes(self.buffer)
+
+
+def read_tail(file, size=TAIL_SIZE):
+    """Read the last *size* bytes of an open binary file."""
+    tail = Tail(size)
+    file.seek(0, os.SEEK_END)
+    length = file.tell()
+    file.seek(max(0, length - size))
+    tail.dropped = max(0, length - size)
+    tail.write(file.read())
+    return tail.getvalue()
+
+
+def _pump(pipe, tail, log, lock):
+    while True:
+        chunk = os.read(pipe.fileno(), 65536)
+        if not chunk:
+            break
+        tail.write(chunk)
+        if log is not None:
+            with lock:
+                log.write(chunk)
+                log.flush()
+    pipe.close()
+
+
+def run_subprocess(argv, log=None):
+    """Run a command, streaming its output into the file *log* (if given)
+    and keeping only the end of it in memory.
+
+    Returns the return code and the ends of stdout and stderr."""
+    stdout, stderr = Tail(), Tail()
+    logfile = open(log, "wb") if log else None
+    lock = threading.Lock()
+    try:
+        process = subprocess.Popen(
+            argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        pumps = [
+            threading.Thread(target=_pump, args=(process.stdout, stdout, logfile, lock)),
+            threading.Thread(target=_pump, args=(process.stderr, stderr, logfile, lock)),
+        ]
+        for pump in pumps:
+            pump.start()
+        for pump in pumps:
+            pump.join()
+        returncode = process.wait()
+    finally:
+        if logfile is not None:
+            logfile.close()
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+def job_files(options):
+    """Return the paths of a job's log and progress files, or Nones if the
+    builder didn't ask for them."""
+    directory = os.environ.get(LOG_DIR_VARIABLE)
+    outputs = options.get("output")
+    if not directory or not outputs:
+        return None, None
+    # Named after the first output, which is unique to the job
+    output = os.path.abspath(outputs[0])
+    digest = hashlib.sha1(output.encode()).hexdigest()[:8]
+    stem = os.path.join(directory, f"{os.path.basename(output)}-{digest}")
+    return stem + ".log", stem + ".progress"
+
+
+def publish(path, **event):
+    """Append a progress event to a job's progress file."""
+    if not path:
+        return
+    event["time"] = time.time()
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(event) + "\n")
+    except OSError:
+        pass
+
+
+def run_job(options, command, execute):
+    """Run a job with ``execute(command, log)``, telling the builder how it
+    goes."""
+    log, progress = job_files(options)
+    if progress is None:
+        return execute(command, None)
+    publish(
+        progress,
+        event="start",
+        operation=options.get("operation", ["unknown"])[0],
+        outputs=options.get("output", []),
+    )
+    saved = os.environ.get(FONTMAKE_PROGRESS_VARIABLE)
+    os.environ[FONTMAKE_PROGRESS_VARIABLE] = progress
+    returncode = 1
+    try:
+        returncode, stdout, stderr = execute(command, log)
+    finally:
+        if saved is None:
+            del os.environ[FONTMAKE_PROGRESS_VARIABLE]
+        else:
+            os.environ[FONTMAKE_PROGRESS_VARIABLE] = saved
+        publish(progress, event="end", returncode=returncode)
+    return returncode, stdout, stderr
+
+
+def submit(argv):
+    """Run a job on the worker pool, if there is one.
+
+    Returns None if no pool is running."""
+    address = os.environ.get(ADDRESS_VARIABLE)
+    if not address:
+        return None
+    authkey = bytes.fromhex(os.environ.get(AUTHKEY_VARIABLE, ""))
+    try:
+        with Client(address, authkey=authkey) as connection:
+            connection.send({"argv": argv, "cwd": os.getcwd()})
+            return connection.recv()
+    except (OSError, EOFError):
+        return None
+
+
+def report(argv, returncode, stdout, stderr):
+    options, command = split_options(argv)
+    cmd = " ".join(command)
+    if returncode != 0:
+        print("\nCommand failed:\n" + cmd)
+        print(stdout.decode(errors="replace"))
+        print(stderr.decode(errors="replace"))
+        log, _ = job_files(options)
+        if log and os.path.exists(log):
+            print("Full output: " + log)
+    else:
+        print(cmd)
+
+
+def main(argv):
+    result = submit(argv)
+    if result is None:
+        options, command = split_options(argv)
+        if set(options) - CLIENT_OPTIONS:
+            # We need the full jobrunner to deal with these.
+            return subprocess.call(
+                [sys.executable, "-m", "gftools.builder.jobrunner", *argv]
+            )
+        result = run_job(options, command, run_subprocess)
+    returncode, stdout, stderr = result
+    report(argv, returncode, stdout, stderr)
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
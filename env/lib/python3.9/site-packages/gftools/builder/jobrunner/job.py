@@ -0,0 +1,54 @@
+"""Run a single builder job.
+
+This is the part of the jobrunner which is shared between the command line
+runner and the worker pool: it takes a jobrunner command line (options,
+then the command), deals with the options, and uses ``execute`` to actually
+run the command: ``execute(command, log)`` returns the return code and the
+ends of the command's stdout and stderr, streaming all of its output into
+the file *log* if that is not None.
+"""
+
+from gftools.builder.jobrunner import profile
+from gftools.builder.jobrunner.cache import BuildCache
+from gftools.builder.jobrunner.client import run_job, split_options
+
+
+def run(argv, execute):
+    options, command = split_options(argv)
+    if not options.get("profile"):
+        return _run(options, command, execute)
+    with profile.record(
+        options["profile"][0],
+        options.get("operation", ["unknown"])[0],
+        command,
+        options.get("input", []),
+        options.get("output", []),
+    ) as entry:
+        returncode, stdout, stderr = _run(options, command, execute, entry)
+        entry["returncode"] = returncode
+    return returncode, stdout, stderr
+
+
+def _run(options, command, execute, entry=None):
+    operation = options.get("operation", ["unknown"])[0]
+    outputs = options.get("output", [])
+
+    cache = None
+    if options.get("cache-dir") and not options.get("no-cache") and outputs:
+        max_size = options.get("cache-size")
+        cache = BuildCache(
+            options["cache-dir"][0], int(max_size[0]) if max_size else None
+        )
+        key = cache.key(operation, command, options.get("input", []), outputs)
+        if cache.restore(key, outputs):
+            cache.record("hit", operation)
+            if entry is not None:
+                entry["cached"] = True
+            return 0, b"", b""
+
+    returncode, stdout, stderr = run_job(options, command, execute)
+
+    if cache and returncode == 0:
+        cache.store(key, outputs)
+        cache.record("miss", operation)
+    return returncode, stdout, stderr
@@ -0,0 +1,266 @@
+"""Record what each builder job cost, and report on the whole build.
+
+When the builder is asked to profile a build, every job appends a JSON line
+to a log file with its wall time, CPU time, peak memory use and the sizes of
+its inputs and outputs. Jobs which run fontmake also get the sections timed
+by ``fontmake.timer`` and ``ufo2ft.timer`` (building the master UFOs,
+interpolating, each stage of compiling...), which fontmake writes to the file
+named by the ``FONTMAKE_TIMING_LOG`` environment variable.
+
+After ninja has finished, the builder turns the log into a Chrome trace
+(load it in chrome://tracing or https://ui.perfetto.dev) and prints a
+summary with the critical path through the build graph.
+
+CPU time includes the job's child processes. Peak memory is the high-water
+mark of the process which ran the job; in a worker pool, that is the peak
+of the worker over all the jobs it has run so far.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from gftools.builder.jobrunner.cache import path_size
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# fontmake.__main__.TIMING_LOG_VARIABLE; we don't want to import fontmake
+# into every jobrunner just for this.
+TIMING_LOG_VARIABLE = "FONTMAKE_TIMING_LOG"
+
+
+def _usage():
+    if resource is None:
+        return None
+    usages = [
+        resource.getrusage(resource.RUSAGE_SELF),
+        resource.getrusage(resource.RUSAGE_CHILDREN),
+    ]
+    cpu = sum(usage.ru_utime + usage.ru_stime for usage in usages)
+    peak = max(usage.ru_maxrss for usage in usages)
+    # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+    if sys.platform != "darwin":
+        peak *= 1024
+    return cpu, peak
+
+
+def _total_size(paths):
+    size = 0
+    for path in paths:
+        try:
+            size += path_size(path)
+        except OSError:
+            pass
+    return size
+
+
+def _read_lines(path):
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # A job which died halfway through writing
+    except OSError:
+        pass
+    return entries
+
+
+def _append_line(path, entry):
+    # One write to a file opened for appending, so that the lines from jobs
+    # running at the same time don't get mixed up.
+    line = (json.dumps(entry) + "\n").encode()
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def record(log, operation, command, inputs, outputs):
+    """Time the job run inside the block and append it to the profile log.
+
+    Yields the log entry, so that the caller can add to it."""
+    entry = {
+        "operation": operation,
+        "command": command,
+        "inputs": [os.path.abspath(path) for path in inputs],
+        "outputs": [os.path.abspath(path) for path in outputs],
+        "pid": os.getpid(),
+        "cached": False,
+    }
+    fd, timing_log = tempfile.mkstemp(prefix="fontmake-timing-", suffix=".jsonl")
+    os.close(fd)
+    saved = os.environ.get(TIMING_LOG_VARIABLE)
+    os.environ[TIMING_LOG_VARIABLE] = timing_log
+    before = _usage()
+    entry["start"] = time.time()
+    started = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry["wall"] = time.perf_counter() - started
+        after = _usage()
+        if saved is None:
+            del os.environ[TIMING_LOG_VARIABLE]
+        else:
+            os.environ[TIMING_LOG_VARIABLE] = saved
+        if before and after:
+            entry["cpu"] = after[0] - before[0]
+            entry["peak_rss"] = after[1]
+        entry["input_size"] = _total_size(inputs)
+        entry["output_size"] = _total_size(outputs)
+        entry["timers"] = _read_lines(timing_log)
+        os.remove(timing_log)
+        _append_line(log, entry)
+
+
+def read_log(log):
+    return _read_lines(log)
+
+
+def _lanes(entries):
+    # Give each job a row in the trace, reusing rows once they are free.
+    lanes = []
+    assignments = {}
+    for ix, entry in sorted(enumerate(entries), key=lambda e: e[1]["start"]):
+        for lane, busy_until in enumerate(lanes):
+            if busy_until <= entry["start"]:
+                break
+        else:
+            lane = len(lanes)
+            lanes.append(0)
+        lanes[lane] = entry["start"] + entry["wall"]
+        assignments[ix] = lane
+    return assignments
+
+
+def chrome_trace(entries, critical_path=()):
+    """Turn the log entries into Chrome's trace event format."""
+    if not entries:
+        return {"traceEvents": []}
+    origin = min(entry["start"] for entry in entries)
+    critical = set(id(entry) for entry in critical_path)
+    lanes = _lanes(entries)
+    events = []
+    for ix, entry in enumerate(entries):
+        args = {
+            key: entry.get(key)
+            for key in (
+                "command",
+                "outputs",
+                "cpu",
+                "peak_rss",
+                "input_size",
+                "output_size",
+                "returncode",
+            )
+        }
+        args["critical"] = id(entry) in critical
+        events.append(
+            {
+                "name": entry["operation"],
+                "cat": "cached" if entry["cached"] else "job",
+                "ph": "X",
+                "ts": (entry["start"] - origin) * 1e6,
+                "dur": entry["wall"] * 1e6,
+                "pid": 1,
+                "tid": lanes[ix],
+                "args": args,
+            }
+        )
+        for timer in entry.get("timers", []):
+            events.append(
+                {
+                    "name": timer["section"],
+                    "cat": timer["logger"],
+                    "ph": "X",
+                    "ts": (timer["end"] - timer["time"] - origin) * 1e6,
+                    "dur": timer["time"] * 1e6,
+                    "pid": 1,
+                    "tid": lanes[ix],
+                }
+            )
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "critical_path": [entry["outputs"] for entry in critical_path],
+            "critical_path_time": sum(entry["wall"] for entry in critical_path),
+        },
+    }
+
+
+def _megabytes(size):
+    if size is None:
+        return "-"
+    return "%.0fMB" % (size / 1024 / 1024)
+
+
+def _seconds(seconds):
+    if seconds is None:
+        return "-"
+    return "%.1fs" % seconds
+
+
+def summary(entries, critical_path=(), top=10):
+    """A human-readable report on the build."""
+    lines = []
+    by_operation = defaultdict(list)
+    for entry in entries:
+        by_operation[entry["operation"]].append(entry)
+    totals = sorted(
+        by_operation.items(), key=lambda item: -sum(e["wall"] for e in item[1])
+    )
+    lines.append(
+        "%-24s %5s %6s %9s %9s %9s"
+        % ("Operation", "Jobs", "Cached", "Wall", "CPU", "Peak RSS")
+    )
+    for operation, jobs in totals:
+        cpu = [e["cpu"] for e in jobs if "cpu" in e]
+        rss = [e["peak_rss"] for e in jobs if "peak_rss" in e]
+        lines.append(
+            "%-24s %5i %6i %9s %9s %9s"
+            % (
+                operation,
+                len(jobs),
+                sum(e["cached"] for e in jobs),
+                _seconds(sum(e["wall"] for e in jobs)),
+                _seconds(sum(cpu) if cpu else None),
+                _megabytes(max(rss) if rss else None),
+            )
+        )
+
+    if critical_path:
+        total = sum(entry["wall"] for entry in critical_path)
+        lines.append("")
+        lines.append(f"Critical path ({_seconds(total)}):")
+        for entry in critical_path:
+            outputs = [os.path.relpath(output) for output in entry["outputs"]]
+            if len(outputs) > 1:
+                outputs = [f"{outputs[0]} (+{len(outputs) - 1} more)"]
+            lines.append(
+                "  %8s  %-20s %s"
+                % (_seconds(entry["wall"]), entry["operation"], " ".join(outputs))
+            )
+
+    sections = defaultdict(float)
+    for entry in entries:
+        for timer in entry.get("timers", []):
+            sections[timer["section"]] += timer["time"]
+    if sections:
+        lines.append("")
+        lines.append("Slowest fontmake steps (all jobs):")
+        for section, seconds in sorted(sections.items(), key=lambda s: -s[1])[:top]:
+            lines.append("  %8s  %s" % (_seconds(seconds), section))
+    return "\n".join(lines)
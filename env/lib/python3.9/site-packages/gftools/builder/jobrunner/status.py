@@ -0,0 +1,151 @@
+"""Show what a build is doing on one live status line.
+
+When the builder runs ninja on a terminal, it reads ninja's output itself
+instead of letting ninja draw its own status line. Job output is passed
+through as it comes; ninja's ``[finished/total]`` lines and the progress
+files of the jobs which are running (see ``client.job_files``) are folded
+into a single line at the bottom of the terminal::
+
+    [12/48] buildVariable Test[wght].ttf: Building variable fonts (812 glyphs) 41s | ...
+"""
+
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+NINJA_STATUS = "[%f/%t] "
+NINJA_STATUS_RE = re.compile(r"^\[(\d+)/(\d+)\] ")
+REFRESH_INTERVAL = 0.5  # seconds
+
+
+class Progress:
+    """Follow the progress files of the jobs in a build."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.offsets = {}
+        self.running = {}
+        self.finished = set()
+
+    def poll(self):
+        for path in glob.glob(os.path.join(self.directory, "*.progress")):
+            if path in self.finished:
+                continue
+            for event in self._read(path):
+                if event.get("event") == "end":
+                    self.running.pop(path, None)
+                    self.finished.add(path)
+                    break
+                job = self.running.setdefault(path, {"started": event["time"]})
+                job.update(event)
+
+    def _read(self, path):
+        # Only complete lines; a job may be halfway through writing one
+        offset = self.offsets.get(path, 0)
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return []
+        end = data.rfind(b"\n") + 1
+        self.offsets[path] = offset + end
+        events = []
+        for line in data[:end].splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+    def describe(self, now=None):
+        """One short description per running job, oldest first."""
+        now = now or time.time()
+        descriptions = []
+        for job in sorted(self.running.values(), key=lambda job: job["started"]):
+            outputs = job.get("outputs") or ["?"]
+            text = f"{job.get('operation', '?')} {os.path.basename(outputs[0])}"
+            if "phase" in job:
+                text += ": " + job["phase"]
+                if "total" in job:
+                    current = min(job.get("done", 0) + 1, job["total"])
+                    text += " %i/%i" % (current, job["total"])
+                elif "done" in job:
+                    text += " (%i done)" % job["done"]
+                if "glyphs" in job:
+                    text += " (%i glyphs)" % job["glyphs"]
+            text += " %is" % (now - job["started"])
+            descriptions.append(text)
+        return descriptions
+
+
+class StatusLine:
+    """Output lines from ninja, with the status line kept below them."""
+
+    def __init__(self, progress, stream=sys.stdout):
+        self.progress = progress
+        self.stream = stream
+        self.counts = ""
+        self.lock = threading.Lock()
+
+    def _text(self):
+        text = " | ".join([self.counts.strip()] + self.progress.describe())
+        width = shutil.get_terminal_size().columns
+        return text[: width - 1]
+
+    def _redraw(self, output=""):
+        self.stream.write("\r\x1b[K" + output + self._text())
+        self.stream.flush()
+
+    def write(self, output):
+        with self.lock:
+            self._redraw(output)
+
+    def refresh(self, counts=None):
+        with self.lock:
+            if counts is not None:
+                self.counts = counts
+            self.progress.poll()
+            self._redraw()
+
+    def close(self):
+        with self.lock:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+
+
+def run_ninja(ninja, args, log_dir, stream=sys.stdout):
+    """Run ninja with a live status line, returning its exit code."""
+    process = subprocess.Popen(
+        [ninja, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "NINJA_STATUS": NINJA_STATUS},
+    )
+    status = StatusLine(Progress(log_dir), stream)
+    done = threading.Event()
+
+    def refresh():
+        while not done.wait(REFRESH_INTERVAL):
+            status.refresh()
+
+    refresher = threading.Thread(target=refresh, daemon=True)
+    refresher.start()
+    try:
+        for line in iter(process.stdout.readline, b""):
+            line = line.decode(errors="replace")
+            if NINJA_STATUS_RE.match(line):
+                status.refresh(counts=line.split("]", 1)[0] + "]")
+            else:
+                status.write(line)
+        return process.wait()
+    finally:
+        done.set()
+        refresher.join()
+        status.close()
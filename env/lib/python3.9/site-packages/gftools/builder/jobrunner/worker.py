@@ -0,0 +1,250 @@
+"""A pool of long-lived Python workers for the builder's jobrunner.
+
+Most of the jobs in a build are Python command line tools (fontmake,
+gftools-fix-font, fonttools ...), and for the shorter ones, starting the
+interpreter and importing fontTools, ufo2ft and glyphsLib takes longer than
+the work itself. While a :class:`WorkerPool` is active, the jobrunner client
+sends each job over a local socket to a process which already has those
+modules imported, and which calls the tool's entry point as a function.
+
+Ninja still decides what runs when; the pool only executes what it is sent.
+Anything which is not a Python entry point (ttfautohint, cp ...) is run by
+the worker as a subprocess, as before.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.metadata import entry_points
+from multiprocessing.connection import Client, Listener
+
+from gftools.builder.jobrunner import job
+from gftools.builder.jobrunner.client import (
+    ADDRESS_VARIABLE,
+    AUTHKEY_VARIABLE,
+    read_tail,
+    run_subprocess,
+)
+
+# The pool's workers are replaced after running this many jobs each (on
+# average), so that memory and module state don't build up over a build.
+JOBS_PER_WORKER = 50
+
+PRELOAD = [
+    "fontTools.ttLib",
+    "fontTools.varLib",
+    "defcon",
+    "ufoLib2",
+    "glyphsLib",
+    "ufo2ft",
+    "fontmake.font_project",
+    "gftools.fix",
+]
+
+
+def preload():
+    for module in PRELOAD:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def find_entry_point(command):
+    """Return the function behind a console script, or None."""
+    scripts = entry_points()
+    if hasattr(scripts, "select"):
+        scripts = scripts.select(group="console_scripts")
+    else:
+        scripts = scripts.get("console_scripts", [])
+    for script in scripts:
+        if script.name == command:
+            return script.load()
+    return None
+
+
+@contextmanager
+def _redirect(fd, file):
+    # Redirect at the file descriptor level so that output from C extensions
+    # and logging handlers holding on to sys.stderr is captured too.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(fd)
+    os.dup2(file.fileno(), fd)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved, fd)
+        os.close(saved)
+
+
+@contextmanager
+def _isolated_logging():
+    # Tools configure logging in their main(); don't let handlers pile up
+    # from one job to the next.
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    saved = {
+        name: (logger.level, logger.handlers[:], logger.propagate)
+        for name, logger in logging.Logger.manager.loggerDict.items()
+        if isinstance(logger, logging.Logger)
+    }
+    try:
+        with warnings.catch_warnings():
+            yield
+    finally:
+        root.handlers[:] = handlers
+        root.setLevel(level)
+        for name, logger in logging.Logger.manager.loggerDict.items():
+            if isinstance(logger, logging.Logger):
+                old_level, old_handlers, propagate = saved.get(
+                    name, (logging.NOTSET, [], True)
+                )
+                logger.setLevel(old_level)
+                logger.handlers[:] = old_handlers
+                logger.propagate = propagate
+
+
+def _call(function, argv):
+    sys.argv = list(argv)
+    try:
+        result = function()
+    except SystemExit as e:
+        result = e.code
+    except Exception:
+        traceback.print_exc()
+        return 1
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    print(result, file=sys.stderr)
+    return 1
+
+
+def execute(command, log=None):
+    """Run a command in this process if we can, returning
+    (returncode, stdout, stderr)."""
+    function = find_entry_point(command[0])
+    if function is None:
+        return run_subprocess(command, log)
+    old_argv = sys.argv
+    # Both streams go to the log as they are written (so stdout and stderr
+    # come back together, as "stderr"); we only read back the end of it.
+    output = open(log, "w+b") if log else tempfile.TemporaryFile()
+    try:
+        with output:
+            with _isolated_logging(), _redirect(1, output), _redirect(2, output):
+                returncode = _call(function, command)
+            return returncode, b"", read_tail(output)
+    finally:
+        sys.argv = old_argv
+
+
+def run_job(argv, cwd):
+    old_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        return job.run(argv, execute)
+    finally:
+        os.chdir(old_cwd)
+
+
+class WorkerPool:
+    """Serve jobrunner requests from a process pool while the block runs.
+
+    Usage::
+
+        with WorkerPool():
+            subprocess.call(["ninja"])
+    """
+
+    def __init__(self, processes=None):
+        self.processes = processes or os.cpu_count()
+        self.authkey = os.urandom(16)
+        self.listener = None
+        self.pool = None
+        self.submitted = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def __enter__(self):
+        preload()
+        self.listener = Listener(authkey=self.authkey)
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+        os.environ[ADDRESS_VARIABLE] = str(self.listener.address)
+        os.environ[AUTHKEY_VARIABLE] = self.authkey.hex()
+        return self
+
+    def __exit__(self, *exc):
+        os.environ.pop(ADDRESS_VARIABLE, None)
+        os.environ.pop(AUTHKEY_VARIABLE, None)
+        # Wake up the accept() loop so that it notices we're done.
+        with Client(self.listener.address, authkey=self.authkey) as connection:
+            connection.send(None)
+        self.thread.join()
+        self.listener.close()
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+
+    def _serve(self):
+        while True:
+            try:
+                connection = self.listener.accept()
+                request = connection.recv()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                continue
+            if request is None:
+                connection.close()
+                return
+            threading.Thread(
+                target=self._handle, args=(connection, request), daemon=True
+            ).start()
+
+    def _submit(self, *args):
+        # A new pool replaces the current one once it has run its share of
+        # jobs, or once it is broken. The old pool finishes the jobs it has
+        # and its workers exit.
+        with self.lock:
+            if self.pool is None or self.submitted >= self.processes * JOBS_PER_WORKER:
+                if self.pool is not None:
+                    self.pool.shutdown(wait=False)
+                self.pool = ProcessPoolExecutor(self.processes, initializer=preload)
+                self.submitted = 0
+            self.submitted += 1
+            return self.pool, self.pool.submit(run_job, *args)
+
+    def _handle(self, connection, request):
+        with connection:
+            pool = None
+            try:
+                pool, future = self._submit(request["argv"], request["cwd"])
+                result = future.result()
+            except BrokenProcessPool:
+                # A worker died (crashed, or was killed for using too much
+                # memory); fail the job rather than leave ninja waiting.
+                with self.lock:
+                    if self.pool is pool:
+                        pool.shutdown(wait=False)
+                        self.pool = None
+                message = "The worker running this job died\n" + traceback.format_exc()
+                result = (1, b"", message.encode())
+            except Exception:
+                result = (1, b"", traceback.format_exc().encode())
+            connection.send(result)
@@ -0,0 +1,287 @@
+"""Cheap facts about font sources, cached between runs.
+
+Writing a recipe needs to know a few things about each source: its axes and
+instances, its family name, how many masters it has and which OpenType
+features it defines. The obvious way to find these out is to load the whole
+source and, for Glyphs files, to build a designspace from it, which converts
+every glyph of every master into a UFO glyph. That takes seconds on a real
+project, and the recipe provider asks several times.
+
+Instead, we read only the parts of the source which we need (for a Glyphs
+file, everything but the glyphs and kerning) and keep the result in a hidden
+file next to the source, ``.<source name>.gftools-metadata.json``. This is
+reused for as long as the files it was made from are unchanged: their
+modification times and sizes are checked first, and their contents hashed
+only if those have changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+import glyphsLib
+from fontTools.designspaceLib import (
+    AxisDescriptor,
+    DesignSpaceDocument,
+    InstanceDescriptor,
+)
+from fontTools.misc import plistlib
+
+from gftools.utils import open_ufo
+
+# Bump this when the contents of the metadata change
+VERSION = 1
+
+# Top-level keys of a Glyphs file which are not needed for the metadata
+# and which make up most of the file.
+GLYPHS_SKIPPED_KEYS = (
+    "glyphs",
+    "kerning",
+    "kerningLTR",
+    "kerningRTL",
+    "kerningVertical",
+    "vertKerning",
+)
+
+FEATURE_RE = re.compile(r"\bfeature\s+([A-Za-z0-9_.]{1,4})\s*\{")
+
+
+@dataclass
+class SourceMetadata:
+    axes: List[AxisDescriptor] = field(default_factory=list)
+    instances: List[InstanceDescriptor] = field(default_factory=list)
+    family_name: str = None
+    master_count: int = 1
+    feature_tags: List[str] = field(default_factory=list)
+
+    def asdict(self):
+        # Axes and instances are kept as designspace XML, which already
+        # knows how to write and read them.
+        doc = DesignSpaceDocument()
+        doc.axes = self.axes
+        doc.instances = self.instances
+        return {
+            "designspace": doc.tostring().decode("utf-8"),
+            "family_name": self.family_name,
+            "master_count": self.master_count,
+            "feature_tags": self.feature_tags,
+        }
+
+    @classmethod
+    def fromdict(cls, data):
+        doc = DesignSpaceDocument.fromstring(data["designspace"])
+        return cls(
+            axes=doc.axes,
+            instances=doc.instances,
+            family_name=data["family_name"],
+            master_count=data["master_count"],
+            feature_tags=data["feature_tags"],
+        )
+
+
+def sidecar_path(path):
+    path = os.path.normpath(path)
+    directory, basename = os.path.split(path)
+    return os.path.join(directory, f".{basename}.gftools-metadata.json")
+
+
+def source_metadata(path) -> SourceMetadata:
+    """Return the metadata of a source, from the sidecar file if it is
+    still good, or by reading the source (and writing the sidecar) if not."""
+    sidecar = sidecar_path(path)
+    directory = os.path.dirname(sidecar)
+    cached = _read_sidecar(sidecar)
+    if cached is not None:
+        stamps = _check_stamps(directory, cached["files"])
+        if stamps is not None:
+            metadata = SourceMetadata.fromdict(cached["metadata"])
+            if stamps != cached["files"]:
+                # Touched but not changed; save hashing it next time
+                _write_sidecar(sidecar, metadata, stamps)
+            return metadata
+
+    metadata, dependencies = _read_source(path)
+    stamps = {
+        os.path.relpath(dependency, directory or "."): _stamp(dependency)
+        for dependency in dependencies
+    }
+    _write_sidecar(sidecar, metadata, stamps)
+    return metadata
+
+
+def _cache_version():
+    return f"{VERSION} {glyphsLib.__version__}"
+
+
+def _read_sidecar(sidecar):
+    try:
+        with open(sidecar, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != _cache_version():
+        return None
+    return cached
+
+
+def _write_sidecar(sidecar, metadata, stamps):
+    contents = {
+        "version": _cache_version(),
+        "files": stamps,
+        "metadata": metadata.asdict(),
+    }
+    temporary = sidecar + f".{os.getpid()}.tmp"
+    try:
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(contents, f, indent=1)
+        os.replace(temporary, sidecar)
+    except OSError:
+        # A read-only source directory; we just won't have a cache
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+def _hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_size, _hash(path)]
+    except OSError:
+        return None  # The file did not exist; it had better not appear
+
+
+def _check_stamps(directory, stamps):
+    """Return up-to-date stamps if none of the files have changed, or None."""
+    current = {}
+    for name, stamp in stamps.items():
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            if stamp is not None:
+                return None
+            current[name] = None
+            continue
+        if stamp is None:
+            return None
+        if [stat.st_mtime_ns, stat.st_size] == stamp[:2]:
+            current[name] = stamp
+            continue
+        if stat.st_size != stamp[1]:
+            return None
+        try:
+            digest = _hash(path)
+        except OSError:
+            return None
+        if digest != stamp[2]:
+            return None
+        current[name] = [stat.st_mtime_ns, stat.st_size, digest]
+    return current
+
+
+def _read_source(path):
+    """Work out the metadata of a source. Returns the metadata and the
+    files it was worked out from."""
+    if path.endswith((".glyphs", ".glyphspackage")):
+        return _read_glyphs(path)
+    if path.endswith(".designspace"):
+        return _read_designspace(path)
+    family_name, features, dependencies = _read_ufo(path)
+    return (
+        SourceMetadata(
+            instances=[InstanceDescriptor(filename=os.path.basename(path))],
+            family_name=family_name,
+            feature_tags=_feature_tags(features),
+        ),
+        dependencies,
+    )
+
+
+def _read_glyphs(path):
+    from glyphsLib.builder import UFOBuilder
+    from glyphsLib.classes import GSFont
+    from glyphsLib.parser import Parser, openstep_plist  # or its fallback
+
+    if os.path.isdir(path):
+        # A .glyphspackage keeps its glyphs in separate files anyway
+        infofile = os.path.join(path, "fontinfo.plist")
+        with open(infofile, encoding="utf-8") as f:
+            data = openstep_plist.load(f, use_numbers=True)
+        dependencies = [infofile]
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = openstep_plist.load(f, use_numbers=True)
+        dependencies = [path]
+    for key in GLYPHS_SKIPPED_KEYS:
+        data.pop(key, None)
+    gsfont = GSFont()
+    Parser(current_type=GSFont).parse_into_object(gsfont, data)
+
+    # With no glyphs, building the designspace is cheap.
+    designspace = UFOBuilder(gsfont, minimal=True).designspace
+    return (
+        SourceMetadata(
+            axes=designspace.axes,
+            instances=designspace.instances,
+            family_name=gsfont.familyName,
+            master_count=len(gsfont.masters),
+            feature_tags=[feature.name for feature in gsfont.features],
+        ),
+        dependencies,
+    )
+
+
+def _read_designspace(path):
+    designspace = DesignSpaceDocument.fromfile(path)
+    dependencies = [path]
+    family_name = None
+    features = ""
+    if designspace.sources:
+        first = designspace.sources[0]
+        family_name, features, ufo_dependencies = _read_ufo(first.path)
+        dependencies += ufo_dependencies
+        family_name = first.familyName or family_name
+    return (
+        SourceMetadata(
+            axes=designspace.axes,
+            instances=designspace.instances,
+            family_name=family_name,
+            master_count=len(designspace.sources),
+            feature_tags=_feature_tags(features),
+        ),
+        dependencies,
+    )
+
+
+def _read_ufo(path):
+    """Return the family name, feature code and files read of a UFO."""
+    if not os.path.isdir(path):
+        ufo = open_ufo(path)
+        return ufo.info.familyName, ufo.features.text or "", [path]
+    infofile = os.path.join(path, "fontinfo.plist")
+    featurefile = os.path.join(path, "features.fea")
+    family_name = None
+    if os.path.exists(infofile):
+        with open(infofile, "rb") as f:
+            family_name = plistlib.load(f).get("familyName")
+    features = ""
+    if os.path.exists(featurefile):
+        with open(featurefile, encoding="utf-8") as f:
+            features = f.read()
+    return family_name, features, [infofile, featurefile]
+
+
+def _feature_tags(features):
+    return sorted(set(FEATURE_RE.findall(features)))
@@ -9,6 +9,8 @@ import sys
 from os.path import dirname
 from tempfile import NamedTemporaryFile
 
+from ninja.ninja_syntax import escape
+
 from gftools.builder.file import File
 from gftools.utils import shell_quote
 
@@ -22,6 +24,12 @@ class OperationBase:
     implicit: set = field(default_factory=set)
 
     in_place = False
+    cacheable = True  # False if the outputs depend on more than the inputs
+    # A rough guess at how long this takes (in seconds, for a typical
+    # family), used to start the longest chains of jobs first when ninja
+    # has no timings from a previous build.
+    cost = 1
+    pool = None  # A ninja pool limiting how many of these run at once
     description = "A badly described rule"
     rule: str = "echo"  # Must be overridden in subclass
 
@@ -51,11 +59,7 @@ class OperationBase:
             cmd = "cmd /c " + cls.rule + " $stamp"
         else:
             cmd = cls.rule + " $stamp"
-        writer.rule(
-            name,
-            f"{shell_quote(sys.executable)} -m gftools.builder.jobrunner {cmd}",
-            description=name,
-        )
+        writer.rule(name, f"$jobrunner $jobrunner_args {cmd}", description=name)
         writer.newline()
 
     @property
@@ -76,6 +80,35 @@ class OperationBase:
     def variables(self):
         return {k: v for k, v in self.original.items() if k != "needs"}
 
+    # Operations which share a (non-None) batch key are written out
+    # together by build_batch; subclasses which batch override it to write
+    # them as a single ninja edge.
+    @property
+    def batch_key(self):
+        return None
+
+    @classmethod
+    def build_batch(cls, writer, operations):
+        for operation in operations:
+            operation.build(writer)
+
+    def jobrunner_variables(self, targets):
+        args = ["--operation", self.opname]
+        for dependency in self.dependencies:
+            args += ["--input", dependency]
+        for target in targets:
+            args += ["--output", target]
+        if self.postprocess or not self.cacheable:
+            args.append("--no-cache")
+        return {"jobrunner_args": " ".join(escape(shell_quote(a)) for a in args)}
+
+    @property
+    def pool_variables(self):
+        pool = self.original.get("pool", self.pool)
+        if pool is None:
+            return {}
+        return {"pool": pool}
+
     def build(self, writer):
         if self.postprocess:
             # Check this *is* a post-process step
@@ -90,18 +123,32 @@ class OperationBase:
                 self.stamppath,
                 self.opname,
                 self.dependencies,
-                variables={"stamp": stamp, **self.variables},
+                variables={
+                    "stamp": stamp,
+                    # We modify our inputs in place, so ninja must record the
+                    # stamp's real mtime rather than when the command started,
+                    # or the stamp will always look out of date.
+                    "restat": 1,
+                    **self.variables,
+                    **self.pool_variables,
+                    **self.jobrunner_variables([self.stamppath]),
+                },
                 implicit=[
                     t.path for t in self.implicit if t.path not in self.dependencies
                 ],
             )
         else:
+            targets = list(set([t.path for t in self.targets]))
             writer.comment("Generating " + ", ".join([t.path for t in self.targets]))
             writer.build(
-                list(set([t.path for t in self.targets])),
+                targets,
                 self.opname,
                 self.dependencies,
-                variables=self.variables,
+                variables={
+                    **self.variables,
+                    **self.pool_variables,
+                    **self.jobrunner_variables(targets),
+                },
             )
 
     def __hash__(self):
@@ -131,6 +178,11 @@ class OperationBase:
 
 
 class FontmakeOperationBase(OperationBase):
+    cost = 20
+    # fontmake can use a lot of memory, so the builder limits how many
+    # fontmake jobs run in parallel according to the machine's RAM.
+    pool = "fontmake"
+
     @property
     def variables(self):
         vars = defaultdict(str)
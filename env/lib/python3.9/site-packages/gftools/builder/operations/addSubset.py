@@ -1,6 +1,7 @@
+import hashlib
 import os
 import sys
-from tempfile import NamedTemporaryFile, TemporaryDirectory
+from tempfile import TemporaryDirectory
 
 import yaml
 
@@ -11,6 +12,7 @@ from gftools.builder.operations import OperationBase
 class AddSubset(OperationBase):
     description = "Add a subset from another font"
     rule = "gftools-add-ds-subsets -j -y $yaml -o $out $in"
+    cacheable = False
 
     def validate(self):
         # Ensure there is a new name
@@ -20,9 +22,15 @@ class AddSubset(OperationBase):
             raise ValueError("No subsets defined")
 
     def convert_dependencies(self, builder):
-        self._target = TemporaryDirectory()  # Stow object
-        self._orig = NamedTemporaryFile(delete=False, mode="w")
-        yaml.dump(self.original["subsets"], self._orig)
+        subsets = yaml.dump(self.original["subsets"])
+        if builder.build_dir:
+            name = "addSubset-" + hashlib.sha1(subsets.encode()).hexdigest()[:8]
+            self._directory = os.path.join(builder.build_dir, name)
+        else:
+            self._target = TemporaryDirectory()  # Stow object
+            self._directory = self._target.name
+        self._orig = builder.temporary_file(os.path.basename(self._directory) + ".yaml")
+        self._orig.write(subsets)
         self._orig.close()
 
     @property
@@ -30,7 +38,7 @@ class AddSubset(OperationBase):
         if "directory" in self.original:
             target = self.original["directory"]
         else:
-            target = self._target.name
+            target = self._directory
         dspath = os.path.join(
             target, self.first_source.basename.rsplit(".", 1)[0] + ".designspace"
         )
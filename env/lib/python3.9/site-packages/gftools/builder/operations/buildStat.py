@@ -58,7 +58,7 @@ class BuildSTAT(OperationBase):
                 self.stamppath,
                 "buildSTAT-postprocess",
                 self.dependencies,
-                variables={"stamp": stamp, **self.variables},
+                variables={"stamp": stamp, "restat": 1, **self.variables},
                 implicit=[
                     t.path for t in self.implicit if t.path not in self.dependencies
                 ],
@@ -0,0 +1,65 @@
+from ninja.ninja_syntax import escape
+
+from gftools.builder.operations import buildTTF
+from gftools.utils import shell_quote
+
+FORMATS = ("otf", "ttf")
+
+
+class BuildStatic(buildTTF.BuildTTF):
+    description = "Build a static TTF or OTF from a source file"
+    rule = "fontmake $outputs $fontmake_type $in $args"
+
+    # The TTF and the OTF of an instance are separate steps with separate
+    # targets, but both are written by a single fontmake run, which loads
+    # the UFO once and compiles its OpenType layout features once for both.
+
+    @property
+    def format(self):
+        return self.original.get("format", "ttf")
+
+    def validate(self):
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown static font format {self.format}")
+        return super().validate()
+
+    @property
+    def batch_key(self):
+        if self.postprocess:
+            return None
+        variables = sorted(
+            (k, str(v)) for k, v in self.variables.items() if k != "outputs"
+        )
+        return (self.opname, self.first_source.path, tuple(variables))
+
+    @staticmethod
+    def output_args(formats, targets):
+        args = ["-o", *formats]
+        for target in targets:
+            args += ["--output-path", target]
+        return " ".join(escape(shell_quote(arg)) for arg in args)
+
+    @property
+    def variables(self):
+        vars = super().variables
+        vars.pop("format", None)
+        vars["outputs"] = self.output_args([self.format], [self.first_target.path])
+        return vars
+
+    @classmethod
+    def build_batch(cls, writer, operations):
+        by_format = {op.format: op for op in operations}
+        if len(by_format) != len(operations):
+            # fontmake can only write one font of each format per run
+            for operation in operations:
+                operation.build(writer)
+            return
+        formats = [fmt for fmt in FORMATS if fmt in by_format]
+        targets = [by_format[fmt].first_target.path for fmt in formats]
+        first = operations[0]
+        variables = first.variables
+        variables["outputs"] = cls.output_args(formats, targets)
+        variables.update(first.pool_variables)
+        variables.update(first.jobrunner_variables(targets))
+        writer.comment("Generating " + ", ".join(targets))
+        writer.build(targets, first.opname, first.dependencies, variables=variables)
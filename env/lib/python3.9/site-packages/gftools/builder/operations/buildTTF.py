@@ -10,14 +10,6 @@ class BuildTTF(FontmakeOperationBase):
             # We can't check this file (assume it was generated as part of the
             # build), so user is on their own.
             return
-        if self.first_source.is_glyphs and len(self.first_source.gsfont.masters) > 1:
-            raise ValueError(
-                f"Cannot build a static font from {self.first_source.path}"
-            )
-        if (
-            self.first_source.designspace
-            and len(self.first_source.designspace.sources) > 1
-        ):
-            raise ValueError(
-                f"Cannot build a static font from {self.first_source.path}"
-            )
+        source = self.first_source
+        if (source.is_glyphs or source.is_designspace) and source.master_count > 1:
+            raise ValueError(f"Cannot build a static font from {source.path}")
@@ -0,0 +1,6 @@
+from gftools.builder.operations import OperationBase
+
+
+class CompareStatics(OperationBase):
+    description = "Compare a static font with a reference build of it"
+    rule = "gftools compare-statics $in -o $out $args"
@@ -4,6 +4,7 @@ from gftools.builder.operations import OperationBase
 class Exec(OperationBase):
     description = "Run an arbitrary executable"
     rule = "$exe $args"
+    cacheable = False
 
     def validate(self):
         if "exe" not in self.original:
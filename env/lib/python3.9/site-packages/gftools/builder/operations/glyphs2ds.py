@@ -8,19 +8,25 @@ from gftools.builder.operations import OperationBase
 class Glyphs2DS(OperationBase):
     description = "Turn a Glyphs file into a Designspace file"
     rule = "fontmake -o ufo -g $in --output-dir $outdir $fontmake_args"
+    cacheable = False
 
     def convert_dependencies(self, builder):
-        self._target = TemporaryDirectory()  # Stow object
+        if builder.build_dir:
+            self._directory = os.path.join(builder.build_dir, "glyphs2ds")
+        else:
+            self._target = TemporaryDirectory()  # Stow object
+            self._directory = self._target.name
 
     @property
     def targets(self):
-        target = self._target.name
+        stem = self.first_source.basename.rsplit(".", 1)[0]
+        # Masters of different sources can have the same file name, so each
+        # source gets its own directory
+        target = os.path.join(self._directory, stem)
         if "directory" in self.original:
             target = self.original["directory"]
 
-        dspath = os.path.join(
-            target, self.first_source.basename.rsplit(".", 1)[0] + ".designspace"
-        )
+        dspath = os.path.join(target, stem + ".designspace")
         return [File(dspath)]
 
     @property
@@ -11,6 +11,7 @@ SUBSETTER_ENV_KEY = "GFTOOLS_SUBSETTER"
 class HbSubset(OperationBase):
     description = "Run a subsetter to slim down a font"
     rule = "$subsetter --output-file=$in.subset --notdef-outline --unicodes=* --name-IDs=* --layout-features=* --glyph-names $args $in && mv $in.subset $out"
+    cacheable = False
 
     @property
     def subsetter(self):
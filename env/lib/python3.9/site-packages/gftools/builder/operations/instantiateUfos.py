@@ -0,0 +1,53 @@
+import re
+
+from ninja.ninja_syntax import escape
+
+from gftools.builder.operations import instantiateUfo
+from gftools.utils import shell_quote
+
+
+class InstantiateUFOs(instantiateUfo.InstantiateUFO):
+    description = "Create all instance UFOs from a Glyphs or designspace file at once"
+    rule = "fontmake -i $instance_names -o ufo $fontmake_type $in $args"
+
+    # Each step in the recipe still asks for a single instance, and each
+    # instance UFO is still its own ninja target; but all the instances
+    # wanted from the same source are generated by a single fontmake run,
+    # which loads the source and builds the master UFOs once and then
+    # interpolates every instance from the same Instantiator.
+
+    @property
+    def batch_key(self):
+        if self.postprocess:
+            return None
+        variables = sorted(
+            (k, str(v))
+            for k, v in self.variables.items()
+            if k not in ("instance_name", "instance_names")
+        )
+        return (self.opname, self.first_source.path, tuple(variables))
+
+    @staticmethod
+    def instance_pattern(names):
+        # fontmake matches instance names with re.fullmatch
+        pattern = "|".join(re.escape(name).replace("\\ ", " ") for name in names)
+        return escape(shell_quote(pattern))
+
+    @property
+    def variables(self):
+        vars = super().variables
+        vars["instance_names"] = self.instance_pattern([self.original["instance_name"]])
+        return vars
+
+    @classmethod
+    def build_batch(cls, writer, operations):
+        first = operations[0]
+        targets = sorted(set(t.path for op in operations for t in op.targets))
+        names = sorted(set(op.original["instance_name"] for op in operations))
+        variables = first.variables
+        del variables["instance_name"]
+        variables["instance_names"] = cls.instance_pattern(names)
+        variables.update(first.pool_variables)
+        variables.update(first.jobrunner_variables(targets))
+        writer.comment("Generating " + ", ".join(targets))
+        writer.build(targets, first.opname, first.dependencies, variables=variables)
@@ -0,0 +1,65 @@
+from ninja.ninja_syntax import escape
+
+from gftools.builder.operations import OperationBase
+from gftools.utils import shell_quote
+
+
+class InstantiateVariable(OperationBase):
+    description = "Generate static fonts by instancing a variable font"
+    rule = "gftools instance-statics $in $instances $args"
+    cost = 5
+    # gftools-instance-statics already uses every CPU, so only one runs at
+    # a time.
+    pool = "instanceStatics"
+
+    # Each static is its own step and target, but all the statics cut from
+    # the same variable font are made by one gftools-instance-statics run,
+    # which instances them in a process pool.
+
+    @property
+    def batch_key(self):
+        if self.postprocess:
+            return None
+        variables = sorted(
+            (k, str(v)) for k, v in self.variables.items() if k != "instances"
+        )
+        return (self.opname, self.first_source.path, tuple(variables))
+
+    def validate(self):
+        if "location" not in self.original or "style_name" not in self.original:
+            raise ValueError(
+                "instantiateVariable operation needs a location and a style_name"
+            )
+
+    @staticmethod
+    def instance_args(operations):
+        args = []
+        for op in sorted(operations, key=lambda op: op.first_target.path):
+            args += [
+                "--instance",
+                op.first_target.path,
+                op.original["location"],
+                op.original["style_name"],
+            ]
+        return " ".join(escape(shell_quote(arg)) for arg in args)
+
+    @property
+    def variables(self):
+        vars = {
+            k: v
+            for k, v in super().variables.items()
+            if k not in ("location", "style_name")
+        }
+        vars["instances"] = self.instance_args([self])
+        return vars
+
+    @classmethod
+    def build_batch(cls, writer, operations):
+        first = operations[0]
+        targets = sorted(set(op.first_target.path for op in operations))
+        variables = first.variables
+        variables["instances"] = cls.instance_args(operations)
+        variables.update(first.pool_variables)
+        variables.update(first.jobrunner_variables(targets))
+        writer.comment("Generating " + ", ".join(targets))
+        writer.build(targets, first.opname, first.dependencies, variables=variables)
@@ -2,10 +2,10 @@ import copy
 import logging
 import os
 import re
-from tempfile import NamedTemporaryFile
+import tempfile
+from functools import cached_property
 from typing import Optional, Tuple
 
-from glyphsLib.builder import UFOBuilder
 import yaml
 from fontTools.designspaceLib import DesignSpaceDocument, InstanceDescriptor
 from strictyaml import load, YAMLValidationError
@@ -17,7 +17,7 @@ from gftools.builder.schema import (
     stat_schema,
     stat_schema_by_font_name,
 )
-from gftools.utils import open_ufo
+from gftools.utils import shell_quote
 
 logger = logging.getLogger("GFBuilder")
 
@@ -86,7 +86,7 @@ class GFBuilder(RecipeProviderBase):
         )
 
         if "stat" in self.config:
-            self.statfile = NamedTemporaryFile(delete=False, mode="w+")
+            self.statfile = self.builder.temporary_file("stat.yaml")
             try:
                 load(yaml.dump(self.config["stat"]), stat_schema)
             except YAMLValidationError:
@@ -105,26 +105,14 @@ class GFBuilder(RecipeProviderBase):
         return self.recipe
 
     def _has_slant_ital(self, source: File) -> Italic:
-        if source.is_glyphs:
-            tags = [ax.axisTag for ax in source.gsfont.axes]
-        elif source.is_designspace:
-            tags = [ax.tag for ax in source.designspace.axes]
-        else:
-            return
+        tags = [ax.tag for ax in source.axes]
         if "ital" in tags:
             slanty_axis = "ital"
         elif "slnt" in tags:
             slanty_axis = "slnt"
         else:
             return
-        if source.is_glyphs:
-            gsfont = source.gsfont
-            builder = UFOBuilder(gsfont, minimal=True)
-            builder.to_designspace_axes()
-            axes = builder.designspace.axes
-        else:
-            axes = source.designspace.axes
-        wanted = [axis for axis in axes if axis.tag == slanty_axis]
+        wanted = [axis for axis in source.axes if axis.tag == slanty_axis]
         if slanty_axis == "ital":
             return (slanty_axis, wanted[0].minimum, wanted[0].maximum)
         else:
@@ -137,12 +125,9 @@ class GFBuilder(RecipeProviderBase):
     ):
         """Determine the file name for a variable font."""
         sourcebase = os.path.splitext(source.basename)[0]
-        if source.is_glyphs:
-            tags = [ax.axisTag for ax in source.gsfont.axes]
-        elif source.is_designspace:
-            tags = [ax.tag for ax in source.designspace.axes]
-        else:
+        if not (source.is_glyphs or source.is_designspace):
             raise ValueError("Unknown source type")
+        tags = [ax.tag for ax in source.axes]
 
         if italic_ds:
             if not roman:
@@ -208,6 +193,8 @@ class GFBuilder(RecipeProviderBase):
         else:
             if self.config.get("extraStaticFontmakeArgs") is not None:
                 args += " " + str(self.config["extraStaticFontmakeArgs"])
+        if source.is_glyphs and self.config.get("keepBackupLayers"):
+            args += " --keep-backup-layers"
 
         return args
 
@@ -227,11 +214,7 @@ class GFBuilder(RecipeProviderBase):
         if not self.config.get("buildVariable", True):
             return
         for source in self.sources:
-            if (
-                (source.is_glyphs and len(source.gsfont.masters) < 2)
-                or source.is_ufo
-                or (source.is_designspace and len(source.designspace.sources) < 2)
-            ):
+            if not self._is_variable(source):
                 continue
             italic_ds = None
             if self.config["splitItalic"]:
@@ -245,6 +228,9 @@ class GFBuilder(RecipeProviderBase):
                 self.build_a_variable(source)
         self.build_STAT()
 
+    def _is_variable(self, source: File):
+        return not source.is_ufo and source.master_count >= 2
+
     def build_STAT(self):
         # Add buildStat to a variable target, it'll do for all of them
 
@@ -324,6 +310,81 @@ class GFBuilder(RecipeProviderBase):
     def build_a_static(self, source: File, instance: InstanceDescriptor, output):
         target = self._static_filename(instance, extension=output)
 
+        if (
+            output == "ttf"
+            and self.config.get("staticsFromVariable")
+            and self._is_variable(source)
+        ):
+            steps = self._instance_variable_steps(source, instance)
+            if self.config.get("verifyStaticsFromVariable"):
+                self._verify_static(source, instance, target)
+        else:
+            steps = self._compile_static_steps(source, instance, output)
+        steps += self._autohint_steps(target) + self._vtt_steps(target)
+        steps += self._fix_step()
+        self.recipe[target] = steps
+        self.build_a_webfont(target, self._static_filename(instance, extension="woff2"))
+        if self._do_smallcap(source):
+            self.recipe[
+                self._static_filename(instance, extension=output, suffix="SC")
+            ] = self._smallcap_steps(source, target)
+
+    # With staticsFromVariable, static TTFs are cut from the source's
+    # variable font (as fontmake built it, before any fixing) instead of
+    # being interpolated and compiled one by one. OTFs still need compiling.
+    def _instance_variable_steps(self, source: File, instance: InstanceDescriptor):
+        axes = source.axes
+        doc = DesignSpaceDocument()
+        doc.axes = axes
+        location = instance.getFullUserLocation(doc)
+        args = "--family-name " + shell_quote(
+            instance.familyName or source.family_name
+        )
+        if self.config.get("removeOutlineOverlaps") is False:
+            args += " --keep-overlaps"
+        return [
+            {"source": source.path},
+            {
+                "operation": "buildVariable",
+                "args": self.fontmake_args(source, variable=True),
+            },
+            {
+                "operation": "instantiateVariable",
+                "location": ",".join(
+                    f"{axis.tag}={location[axis.name]:g}" for axis in axes
+                ),
+                "style_name": instance.styleName,
+                "args": args,
+            },
+        ]
+
+    # ...and with verifyStaticsFromVariable, each one is also built the
+    # usual way and compared with that. The reference fonts and the reports
+    # go in the build directory (or a temporary one), not with the fonts.
+    @cached_property
+    def verify_directory(self):
+        if self.builder.build_dir:
+            return os.path.join(self.builder.build_dir, "verifyStatics")
+        return tempfile.mkdtemp(prefix="gftools-verify-statics-")
+
+    def _verify_static(self, source: File, instance: InstanceDescriptor, target):
+        reference = os.path.join(self.verify_directory, os.path.basename(target))
+        self.recipe[reference] = (
+            self._compile_static_steps(source, instance, "ttf")
+            + self._autohint_steps(reference)
+            + self._fix_step()
+        )
+        compare = {"operation": "compareStatics", "needs": [reference]}
+        if self.config.get("failOnStaticsDifferences"):
+            compare["args"] = "--fail"
+        self.recipe[os.path.splitext(reference)[0] + ".txt"] = [
+            {"source": target},
+            compare,
+        ]
+
+    def _compile_static_steps(
+        self, source: File, instance: InstanceDescriptor, output
+    ):
         steps = [
             {"source": source.path},
         ]
@@ -337,28 +398,19 @@ class GFBuilder(RecipeProviderBase):
                 instancename = instance.familyName + " " + instance.styleName
             steps.append(
                 {
-                    "operation": "instantiateUfo",
+                    "operation": "instantiateUfos",
                     "instance_name": instancename,
                     "glyphData": self.config.get("glyphData"),
                 }
             )
-        steps += (
-            [
-                {
-                    "operation": "buildTTF" if output == "ttf" else "buildOTF",
-                    "args": self.fontmake_args(source, variable=False),
-                }
-            ]
-            + self._autohint_steps(target)
-            + self._vtt_steps(target)
-            + self._fix_step()
+        steps.append(
+            {
+                "operation": "buildStatic",
+                "format": output,
+                "args": self.fontmake_args(source, variable=False),
+            }
         )
-        self.recipe[target] = steps
-        self.build_a_webfont(target, self._static_filename(instance, extension="woff2"))
-        if self._do_smallcap(source):
-            self.recipe[
-                self._static_filename(instance, extension=output, suffix="SC")
-            ] = self._smallcap_steps(source, target)
+        return steps
 
     def build_a_webfont(self, original_target, wf_filename):
         if not self.config["buildWebfont"]:
@@ -385,13 +437,7 @@ class GFBuilder(RecipeProviderBase):
     def _do_smallcap(self, source):
         if not self.config.get("buildSmallCap"):
             return False
-        if source.is_glyphs:
-            return "smcp" in source.gsfont.features
-        elif source.is_designspace:
-            source.designspace.loadSourceFonts(open_ufo)
-            return "feature smcp" in source.designspace.sources[0].font.features.text
-        else:  # UFO
-            return "feature smcp" in open_ufo(source.path).features.text
+        return "smcp" in source.feature_tags
 
     def _smallcap_steps(self, source, original):
         new_family_name = source.family_name + " SC"
@@ -440,7 +486,7 @@ class GFBuilder(RecipeProviderBase):
         # "italic enough" to convince gftools-fix-font to apply all its italic
         # font fixes (post.italicAngle etc.) when we call it with
         # --include-source-fixes.
-        configfile = NamedTemporaryFile(delete=False, mode="w+")
+        configfile = self.builder.temporary_file("italic-fixup.yaml")
         family_name = self.sources[0].family_name.replace(" ", "")
         # Since this is mad YAML, we can't use the normal YAML library
         # to write this. We'll just write it out manually.
@@ -70,7 +70,7 @@ class NotoBuilder(GFBuilder):
         familyname_path = source.family_name.replace(" ", "")
         sourcebase = os.path.splitext(source.basename)[0]
         if source.is_designspace:
-            tags = [ax.tag for ax in source.designspace.axes]
+            tags = [ax.tag for ax in source.axes]
         else:
             raise ValueError("Unknown source type " + source.path)
         axis_tags = ",".join(sorted(tags))
@@ -81,6 +81,9 @@ GOOGLEFONTS_SCHEMA = Map(
         Optional("buildStatic"): Bool(),
         Optional("buildOTF"): Bool(),
         Optional("buildTTF"): Bool(),
+        Optional("staticsFromVariable"): Bool(),
+        Optional("verifyStaticsFromVariable"): Bool(),
+        Optional("failOnStaticsDifferences"): Bool(),
         Optional("buildWebfont"): Bool(),
         Optional("outputDir"): Str(),
         Optional("vfDir"): Str(),
@@ -104,10 +107,15 @@ GOOGLEFONTS_SCHEMA = Map(
         Optional("version"): Str(),
         Optional("addGftoolsVersion"): Bool(),
         Optional("glyphData"): Seq(Str()),
+        Optional("keepBackupLayers"): Bool(),
         Optional("extraFontmakeArgs"): Str(),
         Optional("extraVariableFontmakeArgs"): Str(),
         Optional("extraStaticFontmakeArgs"): Str(),
         Optional("buildSmallCap"): Bool(),
         Optional("splitItalic"): Bool(),
+        Optional("buildDir"): Str(),
+        Optional("buildCache"): Str(),
+        Optional("buildCacheSize"): Int(),
+        Optional("pools"): MapPattern(Str(), Int()),
     }
 )
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+gftools compare-statics
+
+Check that a static font made another way (e.g. by instancing the variable
+font) matches a reference static font: the same glyphs and character map,
+the same advance widths, glyph bounding boxes and outline areas within a
+tolerance, and the same vertical metrics.
+
+Outlines are compared by bounds and area rather than point by point, as
+overlap removal and curve conversion can produce different (but equivalent)
+contours.
+
+Differences are reported as a warning; with --fail, the script also exits
+with status 1 if there are any.
+
+Usage:
+
+gftools compare-statics Lora-Bold.ttf reference/Lora-Bold.ttf -o report.txt
+"""
+import argparse
+import sys
+
+from fontTools.pens.areaPen import AreaPen
+from fontTools.pens.boundsPen import BoundsPen
+from fontTools.ttLib import TTFont
+
+METRICS = {
+    "head": ["unitsPerEm"],
+    "hhea": ["ascent", "descent", "lineGap"],
+    "OS/2": [
+        "usWeightClass",
+        "sTypoAscender",
+        "sTypoDescender",
+        "sTypoLineGap",
+        "usWinAscent",
+        "usWinDescent",
+        "sxHeight",
+        "sCapHeight",
+    ],
+}
+
+
+def _outline(glyphset, name):
+    bounds = BoundsPen(glyphset)
+    area = AreaPen(glyphset)
+    glyphset[name].draw(bounds)
+    glyphset[name].draw(area)
+    return bounds.bounds, abs(area.value)
+
+
+def compare(font, reference, tolerance=1, area_tolerance=0.01):
+    """Return a list of differences between two static fonts."""
+    differences = []
+
+    for table, attributes in METRICS.items():
+        for attribute in attributes:
+            ours = getattr(font[table], attribute, None)
+            theirs = getattr(reference[table], attribute, None)
+            if ours != theirs:
+                differences.append(f"{table}.{attribute}: {ours} != {theirs}")
+
+    if font.getBestCmap() != reference.getBestCmap():
+        differences.append("cmap differs")
+
+    glyphs = set(font.getGlyphOrder())
+    reference_glyphs = set(reference.getGlyphOrder())
+    for name in sorted(reference_glyphs - glyphs):
+        differences.append(f"{name}: missing")
+    for name in sorted(glyphs - reference_glyphs):
+        differences.append(f"{name}: not in reference")
+
+    glyphset = font.getGlyphSet()
+    reference_glyphset = reference.getGlyphSet()
+    for name in sorted(glyphs & reference_glyphs):
+        advance = font["hmtx"][name][0]
+        reference_advance = reference["hmtx"][name][0]
+        if abs(advance - reference_advance) > tolerance:
+            differences.append(f"{name}: advance {advance} != {reference_advance}")
+
+        bounds, area = _outline(glyphset, name)
+        reference_bounds, reference_area = _outline(reference_glyphset, name)
+        if (bounds is None) != (reference_bounds is None) or (
+            bounds
+            and any(abs(a - b) > tolerance for a, b in zip(bounds, reference_bounds))
+        ):
+            differences.append(f"{name}: bounds {bounds} != {reference_bounds}")
+        if abs(area - reference_area) > area_tolerance * max(reference_area, 1):
+            differences.append(f"{name}: area {area:.0f} != {reference_area:.0f}")
+    return differences
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("font", help="Static font to check")
+    parser.add_argument("reference", help="Static font to check it against")
+    parser.add_argument("--output", "-o", help="Write the report to this file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1,
+        help="Allowed difference in advances and bounds, in units (default: 1)",
+    )
+    parser.add_argument(
+        "--area-tolerance",
+        type=float,
+        default=0.01,
+        help="Allowed relative difference in outline area (default: 0.01)",
+    )
+    parser.add_argument(
+        "--fail", action="store_true", help="Exit with status 1 on differences"
+    )
+    args = parser.parse_args(args)
+
+    differences = compare(
+        TTFont(args.font),
+        TTFont(args.reference),
+        tolerance=args.tolerance,
+        area_tolerance=args.area_tolerance,
+    )
+    report = f"{args.font} vs {args.reference}: "
+    if differences:
+        report += f"{len(differences)} differences\n"
+        report += "".join(f"  {difference}\n" for difference in differences)
+    else:
+        report += "no differences\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report, end="")
+    if differences:
+        print(
+            f"WARNING: {args.font} differs from {args.reference}", file=sys.stderr
+        )
+        if args.fail:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
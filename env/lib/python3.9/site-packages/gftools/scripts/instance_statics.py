@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+gftools instance-statics
+
+Generate GF spec compliant static fonts from a variable font, several at a
+time. Each --instance gives the output path, the location to instance at
+(in the variable font's user coordinates; axes which are not given are
+left at their default) and the style name.
+
+Usage:
+
+gftools instance-statics Lora[wght].ttf \\
+    --instance Lora-Regular.ttf wght=400 Regular \\
+    --instance Lora-Bold.ttf wght=700 Bold
+
+# Keep overlaps, use two processes
+gftools instance-statics Lora[wght].ttf --keep-overlaps -j 2 \\
+    --instance Lora-Regular.ttf wght=400 Regular \\
+    --instance Lora-Bold.ttf wght=700 Bold
+"""
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fontTools.ttLib import TTFont
+
+from gftools.instancer import gen_static_font
+
+# The variable font, loaded once in each worker process
+_var_font = None
+
+
+def _load(path):
+    global _var_font
+    _var_font = TTFont(path)
+
+
+def _instance(job):
+    output, location, family_name, style_name, keep_overlaps = job
+    gen_static_font(
+        _var_font,
+        dict(location),
+        family_name=family_name,
+        style_name=style_name,
+        keep_overlaps=keep_overlaps,
+        dst=output,
+    )
+    return output
+
+
+def parse_location(string):
+    location = {}
+    for axis in string.split(","):
+        if not axis:
+            continue
+        tag, value = axis.split("=")
+        location[tag.strip()] = float(value)
+    return location
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("font", help="Variable TTF file")
+    parser.add_argument(
+        "--instance",
+        nargs=3,
+        action="append",
+        required=True,
+        metavar=("OUTPUT", "LOCATION", "STYLE"),
+        help="Output path, location (e.g. wght=700,wdth=100) and style name",
+    )
+    parser.add_argument("--family-name", help="Family name of the statics")
+    parser.add_argument(
+        "--keep-overlaps", action="store_true", help="Do not remove overlaps"
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of processes to use (default: number of CPUs)",
+    )
+    args = parser.parse_args(args)
+
+    jobs = [
+        (
+            output,
+            tuple(parse_location(location).items()),
+            args.family_name,
+            style_name,
+            args.keep_overlaps,
+        )
+        for output, location, style_name in args.instance
+    ]
+    processes = min(args.jobs or 1, len(jobs))
+    # Daemonic processes (like the builder's worker pool) can't have children
+    if processes <= 1 or multiprocessing.current_process().daemon:
+        _load(args.font)
+        for job in jobs:
+            print(_instance(job))
+        return
+    with ProcessPoolExecutor(
+        processes, initializer=_load, initargs=(args.font,)
+    ) as pool:
+        for output in pool.map(_instance, jobs):
+            print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,10 @@ from glyphsLib.classes import *  # noqa
 from glyphsLib.builder import to_ufos, to_designspace, to_glyphs  # noqa
 from glyphsLib.parser import load, loads  # noqa
 from glyphsLib.writer import dump, dumps  # noqa
-from glyphsLib.util import clean_ufo, ufo_create_background_layer_for_all_glyphs
+from glyphsLib.util import (
+    save_ufo_incrementally,
+    ufo_create_background_layer_for_all_glyphs,
+)
 
 try:
     from ._version import version as __version__
@@ -94,6 +97,7 @@ def build_masters(
     ufo_module=None,
     minimal=False,
     glyph_data=None,
+    jobs=1,
 ):
     """Write and return UFOs from the masters and the designspace defined in a
     .glyphs file.
@@ -104,13 +108,19 @@ def build_masters(
             written alongside the master UFOs though no instances will be built.
         family_name: If provided, the master UFOs will be given this name and
             only instances with this name will be included in the designspace.
+        jobs: The number of processes to convert the glyphs with.
 
     Returns:
         A named tuple of master UFOs (`ufos`) and the path to the designspace
         file (`designspace_path`).
     """
 
-    font = GSFont(filename)
+    if minimal:
+        # Backup layers and backgrounds won't make it into the UFOs
+        font = load(filename, minimal=True)
+        font.filepath = os.fsdecode(os.fspath(filename))
+    else:
+        font = GSFont(filename)
 
     if not os.path.isdir(master_dir):
         os.mkdir(master_dir)
@@ -133,6 +143,7 @@ def build_masters(
         ufo_module=ufo_module,
         minimal=minimal,
         glyph_data=glyph_data,
+        jobs=jobs,
     )
 
     # Only write full masters to disk. This assumes that layer sources are always part
@@ -147,8 +158,7 @@ def build_masters(
             ufo_create_background_layer_for_all_glyphs(source.font)
 
         ufo_path = os.path.join(master_dir, source.filename)
-        clean_ufo(ufo_path)
-        source.font.save(ufo_path)
+        save_ufo_incrementally(source.font, ufo_path)
 
         if normalize_ufos:
             import ufonormalizer
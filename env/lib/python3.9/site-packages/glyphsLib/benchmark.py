@@ -0,0 +1,48 @@
+"""Benchmark reading and writing .glyphs files.
+
+    python -m glyphsLib.benchmark sources/AndadaPro.glyphs ...
+"""
+
+import io
+import os
+import sys
+import timeit
+
+from glyphsLib.parser import load
+from glyphsLib.writer import dump
+
+
+def parse(path):
+    # From a file object, which is never read from the cache
+    with open(path, encoding="utf-8") as fp:
+        return load(fp)
+
+
+def write(font, binary=False):
+    dump(font, io.BytesIO() if binary else io.StringIO())
+
+
+def run_benchmark(label, function, repeat=5, number=1):
+    results = timeit.repeat(function, repeat=repeat, number=number)
+    print("  %-20s%8.1fms" % (label + ":", min(results) * 1000.0 / number))
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if not args:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    for path in args:
+        print("%s (%.1f MB):" % (path, os.path.getsize(path) / (1 << 20)))
+        font = parse(path)
+        # Writing has side effects on a font the first time (such as making
+        # empty backgrounds), so write it once before timing
+        write(font)
+        run_benchmark("parse", lambda: parse(path))
+        run_benchmark("write", lambda: write(font))
+        run_benchmark("write to bytes", lambda: write(font, binary=True))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,6 +37,7 @@ def to_ufos(
     minimal=False,
     glyph_data=None,
     preserve_original=False,
+    jobs=1,
 ):
     """Take a GSFont object and convert it into one UFO per master.
 
@@ -61,6 +62,9 @@ def to_ufos(
 
     If preserve_original is True, this works on a copy of the font object
     to avoid modifying the original object.
+
+    If jobs is more than 1, the glyphs are converted by that many processes.
+    The result is the same either way.
     """
     if preserve_original:
         font = copy.deepcopy(font)
@@ -76,6 +80,7 @@ def to_ufos(
         expand_includes=expand_includes,
         minimal=minimal,
         glyph_data=glyph_data,
+        jobs=jobs,
     )
 
     result = list(builder.masters)
@@ -99,6 +104,7 @@ def to_designspace(
     minimal=False,
     glyph_data=None,
     preserve_original=False,
+    jobs=1,
 ):
     """Take a GSFont object and convert it into a Designspace Document + UFOS.
     The UFOs are available as the attribute `font` of each SourceDescriptor of
@@ -126,6 +132,9 @@ def to_designspace(
 
     If preserve_original is True, this works on a copy of the font object
     to avoid modifying the original object.
+
+    If jobs is more than 1, the glyphs are converted by that many processes.
+    The result is the same either way.
     """
     if preserve_original:
         font = copy.deepcopy(font)
@@ -144,6 +153,7 @@ def to_designspace(
         expand_includes=expand_includes,
         minimal=minimal,
         glyph_data=glyph_data,
+        jobs=jobs,
     )
     return builder.designspace
 
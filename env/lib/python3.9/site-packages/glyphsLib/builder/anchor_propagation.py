@@ -7,45 +7,74 @@ from .constants import COMPONENT_INFO_KEY
 def to_ufo_propagate_font_anchors(self, ufo):
     """Copy anchors from parent glyphs' components to the parent."""
 
-    processed = set()
-    for glyph in ufo:
-        _propagate_glyph_anchors(self, ufo, glyph, processed)
+    # (xmin, ymin) of the components, by base glyph and transformation. The
+    # outlines don't change here, so each is computed only once.
+    bounds = {}
+    for glyph in _component_order(self, ufo):
+        _propagate_glyph_anchors(ufo, glyph, bounds)
+
 
+def _component_order(self, ufo):
+    """Return the glyphs of the UFO with each after its components, so that
+    components have their propagated anchors when their parent is done.
+
+    This is the order in which a depth-first walk over the components from
+    each glyph finishes them. In a component cycle, the glyph where the
+    walk entered the cycle comes last.
+    """
+    order = []
+    seen = set()
+    for glyph in ufo:
+        if glyph.name in seen:
+            continue
+        seen.add(glyph.name)
+        stack = [(glyph, iter(glyph.components))]
+        while stack:
+            parent, components = stack[-1]
+            for component in components:
+                if component.baseGlyph in seen:
+                    continue
+                try:
+                    glyph = ufo[component.baseGlyph]
+                except KeyError:
+                    self.logger.warning(
+                        "Anchors not propagated for inexistent component {} "
+                        "in glyph {}".format(component.baseGlyph, parent.name)
+                    )
+                    continue
+                seen.add(glyph.name)
+                stack.append((glyph, iter(glyph.components)))
+                break
+            else:
+                stack.pop()
+                order.append(parent)
+    return order
 
-def _propagate_glyph_anchors(self, ufo, parent, processed):
-    """Propagate anchors for a single parent glyph."""
 
-    if parent.name in processed:
-        return
-    processed.add(parent.name)
+def _propagate_glyph_anchors(ufo, parent, bounds):
+    """Propagate anchors for a single parent glyph, whose components have
+    been done already."""
 
     base_components = []
     mark_components = []
     anchor_names = set()
     to_add = {}
     for component in parent.components:
-        try:
-            glyph = ufo[component.baseGlyph]
-        except KeyError:
-            self.logger.warning(
-                "Anchors not propagated for inexistent component {} in glyph {}".format(
-                    component.baseGlyph, parent.name
-                )
-            )
+        if component.baseGlyph not in ufo:
+            continue  # Warned about in _component_order
+        glyph = ufo[component.baseGlyph]
+        if any(a.name.startswith("_") for a in glyph.anchors):
+            mark_components.append(component)
         else:
-            _propagate_glyph_anchors(self, ufo, glyph, processed)
-            if any(a.name.startswith("_") for a in glyph.anchors):
-                mark_components.append(component)
-            else:
-                base_components.append(component)
-                anchor_names |= {a.name for a in glyph.anchors}
+            base_components.append(component)
+            anchor_names |= {a.name for a in glyph.anchors}
 
     if mark_components and not base_components and _is_ligature_mark(parent):
         # The composite is a mark that is composed of other marks (E.g.
         # "circumflexcomb_tildecomb"). Promote the mark that is positioned closest
         # to the origin to a base.
         try:
-            component = _component_closest_to_origin(mark_components, ufo)
+            component = _component_closest_to_origin(mark_components, ufo, bounds)
         except Exception as e:
             raise Exception(
                 "Error while determining which component of composite "
@@ -56,11 +85,19 @@ def _propagate_glyph_anchors(self, ufo, parent, processed):
         glyph = ufo[component.baseGlyph]
         anchor_names |= {a.name for a in glyph.anchors}
 
+    # The first anchor of each name of the base components
+    base_anchors = []
+    for component in base_components:
+        anchors = {}
+        for anchor in ufo[component.baseGlyph].anchors:
+            anchors.setdefault(anchor.name, anchor)
+        base_anchors.append((component, anchors))
+
     for anchor_name in anchor_names:
         # don't add if parent already contains this anchor OR any associated
         # ligature anchors (e.g. "top_1, top_2" for "top")
         if not any(a.name.startswith(anchor_name) for a in parent.anchors):
-            _get_anchor_data(to_add, ufo, base_components, anchor_name)
+            _get_anchor_data(to_add, base_anchors, anchor_name)
 
     for component in mark_components:
         _adjust_anchors(to_add, ufo, parent, component)
@@ -71,15 +108,14 @@ def _propagate_glyph_anchors(self, ufo, parent, processed):
         parent.appendAnchor(anchor_dict)
 
 
-def _get_anchor_data(anchor_data, ufo, components, anchor_name):
-    """Get data for an anchor from a list of components."""
+def _get_anchor_data(anchor_data, base_anchors, anchor_name):
+    """Get data for an anchor from a list of (component, anchors by name)."""
 
-    anchors = []
-    for component in components:
-        for anchor in ufo[component.baseGlyph].anchors:
-            if anchor.name == anchor_name:
-                anchors.append((anchor, component))
-                break
+    anchors = [
+        (component_anchors[anchor_name], component)
+        for component, component_anchors in base_anchors
+        if anchor_name in component_anchors
+    ]
     if len(anchors) > 1:
         for i, (anchor, component) in enumerate(anchors):
             t = Transform(*component.transformation)
@@ -135,14 +171,24 @@ def _is_ligature_mark(glyph):
     return not glyph.name.startswith("_") and "_" in glyph.name
 
 
-def _component_closest_to_origin(components, glyph_set):
+def _component_closest_to_origin(components, glyph_set, bounds=None):
     """Return the component whose (xmin, ymin) bounds are closest to origin.
 
     This ensures that a component that is moved below another is
     actually recognized as such. Looking only at the transformation
-    offset can be misleading.
+    offset can be misleading. 'bounds' is an optional dictionary in which
+    to keep the bounds, for the next call with the same glyph set.
     """
-    return min(components, key=lambda comp: _distance((0, 0), _bounds(comp, glyph_set)))
+    if bounds is None:
+        bounds = {}
+
+    def distance(component):
+        key = (component.baseGlyph, tuple(component.transformation))
+        if key not in bounds:
+            bounds[key] = _bounds(component, glyph_set)
+        return _distance((0, 0), bounds[key])
+
+    return min(components, key=distance)
 
 
 def _distance(pos1, pos2):
@@ -14,6 +14,9 @@
 
 
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import multiprocessing
 import os
 from textwrap import dedent
 from typing import Dict
@@ -30,6 +33,10 @@ from .constants import (
 from .axes import WEIGHT_AXIS_DEF, WIDTH_AXIS_DEF, find_base_style, class_to_value
 from glyphsLib.util import LoggerMixin
 
+# When converting glyphs in parallel, the number of runs of glyphs given to each
+# process: more runs even out the load, fewer send less data between processes.
+PARALLEL_CHUNKS_PER_JOB = 4
+
 
 class UFOBuilder(LoggerMixin):
     """Builder for Glyphs to UFO + designspace."""
@@ -50,6 +57,7 @@ class UFOBuilder(LoggerMixin):
         expand_includes=False,
         minimal=False,
         glyph_data=None,
+        jobs=1,
     ):
         """Create a builder that goes from Glyphs to UFO + designspace.
 
@@ -87,6 +95,8 @@ class UFOBuilder(LoggerMixin):
         minimal -- If True, it is assumed that the UFOs will only be used in font
                    production, and unnecessary steps will be skipped.
         glyph_data -- A list of GlyphData.
+        jobs -- The number of processes to convert the glyphs with. The UFOs
+                are the same whatever the number.
         """
         self.font = font
 
@@ -105,6 +115,7 @@ class UFOBuilder(LoggerMixin):
         self.write_skipexportglyphs = write_skipexportglyphs
         self.expand_includes = expand_includes
         self.minimal = minimal
+        self.jobs = jobs
 
         if propagate_anchors is None:
             propagate_anchors = font.customParameters["Propagate Anchors"]
@@ -263,6 +274,9 @@ class UFOBuilder(LoggerMixin):
         # stores background data from "associated layers"
         supplementary_layer_data = []
 
+        # The (glyph, layer, parent glyph) to convert, in order.
+        layers = []
+
         # Generate the main (master) layers first.
         for glyph in self.font.glyphs:
             for layer in glyph.layers.values():
@@ -273,9 +287,7 @@ class UFOBuilder(LoggerMixin):
                     supplementary_layer_data.append((glyph, layer))
                     continue
 
-                ufo_layer = self.to_ufo_layer(glyph, layer)  # .layers
-                ufo_glyph = ufo_layer.newGlyph(glyph.name)
-                self.to_ufo_glyph(ufo_glyph, layer, glyph)  # .glyph
+                layers.append((glyph, layer, glyph))
 
         # And sublayers (brace, bracket, ...) second.
         for glyph, layer in supplementary_layer_data:
@@ -320,9 +332,94 @@ class UFOBuilder(LoggerMixin):
             ):
                 continue
             else:
-                ufo_layer = self.to_ufo_layer(glyph, layer)  # .layers
-                ufo_glyph = ufo_layer.newGlyph(glyph.name)
-                self.to_ufo_glyph(ufo_glyph, layer, layer.parent)  # .glyph
+                layers.append((glyph, layer, layer.parent))
+
+        if self.jobs > 1 and len(layers) > 1 and self._can_convert_in_parallel():
+            self._to_ufo_glyphs_in_parallel(layers)
+            return
+        for glyph, layer, parent in layers:
+            ufo_layer = self.to_ufo_layer(glyph, layer)  # .layers
+            ufo_glyph = ufo_layer.newGlyph(glyph.name)
+            self.to_ufo_glyph(ufo_glyph, layer, parent)  # .glyph
+
+    def _can_convert_in_parallel(self):
+        import ufoLib2
+
+        if not issubclass(self.ufo_module.Font, ufoLib2.Font):
+            # Other UFO objects may not survive being sent between processes
+            self.logger.warning(
+                "Converting glyphs in parallel needs ufoLib2; using one process."
+            )
+            return False
+        if "fork" not in multiprocessing.get_all_start_methods():
+            self.logger.warning(
+                "Converting glyphs in parallel needs the 'fork' start method, "
+                "which this platform does not have; using one process."
+            )
+            return False
+        if multiprocessing.current_process().daemon:
+            # e.g. inside the worker pool of a build tool
+            self.logger.warning(
+                "Daemonic processes can't convert glyphs in parallel; "
+                "using one process."
+            )
+            return False
+        return True
+
+    def _to_ufo_glyphs_in_parallel(self, layers):
+        """Do what to_ufo_layers does one layer at a time, with the glyphs
+        converted by a pool of ``self.jobs`` forked processes.
+
+        Everything which depends on the order of the layers is done here, in
+        order: making the UFO layers and (empty) glyphs, and collecting color
+        layers. Each worker then converts a run of consecutive layers with
+        ``to_ufo_glyph`` and sends back the glyphs, along with the font and
+        designspace libs, to which converting a glyph may add entries. These
+        are merged in the order of the runs, so that the result is the same
+        as when converting the glyphs one after another.
+        """
+        global _parallel_work
+
+        work = []
+        for glyph, layer, parent in layers:
+            ufo_layer = self.to_ufo_layer(glyph, layer)  # .layers
+            ufo_glyph = ufo_layer.newGlyph(glyph.name)
+            if layer.layerId == layer.associatedMasterId:
+                self.to_ufo_glyph_color(ufo_glyph, layer, parent)  # .glyph
+            background_layer = None
+            if not self.minimal and layer.hasBackground:
+                # Made now, so that the UFO layers come in the usual order
+                background_layer = self.to_ufo_background_layer(layer)
+            work.append((ufo_layer, background_layer, glyph.name, layer, parent))
+
+        libs = [source.font.lib for source in self._sources.values()]
+        libs.append(self._designspace.lib)
+        libs_before = copy.deepcopy(libs)
+
+        chunk_size = -(-len(work) // (self.jobs * PARALLEL_CHUNKS_PER_JOB))
+        starts = range(0, len(work), chunk_size)
+        _parallel_work = (self, work)
+        try:
+            with ProcessPoolExecutor(
+                self.jobs, mp_context=multiprocessing.get_context("fork")
+            ) as pool:
+                chunks = pool.map(
+                    _to_ufo_glyphs_chunk,
+                    starts,
+                    [start + chunk_size for start in starts],
+                )
+                for start, (glyphs, chunk_libs) in zip(starts, chunks):
+                    for item, (ufo_glyph, background) in zip(work[start:], glyphs):
+                        ufo_layer, background_layer = item[:2]
+                        ufo_layer.insertGlyph(ufo_glyph, overwrite=True, copy=False)
+                        if background is not None:
+                            background_layer.insertGlyph(
+                                background, overwrite=False, copy=False
+                            )
+                    for lib, before, after in zip(libs, libs_before, chunk_libs):
+                        _apply_changes(lib, before, after)
+        finally:
+            _parallel_work = None
 
     @property
     def designspace(self):
@@ -413,6 +510,60 @@ class UFOBuilder(LoggerMixin):
     )
 
 
+# The builder and work list of _to_ufo_glyphs_in_parallel, which the forked
+# worker processes inherit.
+_parallel_work = None
+
+
+def _to_ufo_glyphs_chunk(start, stop):
+    builder, work = _parallel_work
+    glyphs = []
+    for ufo_layer, background_layer, name, layer, parent in work[start:stop]:
+        ufo_glyph = ufo_layer[name]
+        # Color layers collected here are dropped; the parent collects them
+        builder.to_ufo_glyph(ufo_glyph, layer, parent)
+        background = None
+        if background_layer is not None and name in background_layer:
+            background = background_layer[name]
+        glyphs.append((ufo_glyph, background))
+    libs = [source.font.lib for source in builder._sources.values()]
+    libs.append(builder._designspace.lib)
+    return glyphs, libs
+
+
+def _apply_changes(target, before, after):
+    """Make the changes from dict ``before`` to dict ``after`` in ``target``,
+    which started out equal to ``before`` and may have been changed since.
+
+    Entries which were added or changed are set, items appended to lists are
+    appended, and dicts are compared recursively.
+    """
+    for key, value in after.items():
+        if key in before:
+            old = before[key]
+            if isinstance(value, dict) and isinstance(old, dict):
+                _apply_changes(target[key], old, value)
+                continue
+            if (
+                isinstance(value, list)
+                and isinstance(old, list)
+                and value[: len(old)] == old
+            ):
+                target[key].extend(value[len(old) :])
+                continue
+            if value == old:
+                continue
+        elif key in target:
+            # Also added by an earlier run of glyphs
+            if isinstance(value, dict) and isinstance(target[key], dict):
+                _apply_changes(target[key], {}, value)
+                continue
+            if isinstance(value, list) and isinstance(target[key], list):
+                target[key].extend(value)
+                continue
+        target[key] = value
+
+
 def filter_instances_by_family(instances, family_name=None):
     """Yield instances whose 'familyName' custom parameter is
     equal to 'family_name'.
@@ -132,6 +132,8 @@ UFO_YEAR_KEY = GLYPHLIB_PREFIX + "ufoYear"
 UFO_NOTE_KEY = GLYPHLIB_PREFIX + "ufoNote"
 
 UFO_DATA_KEY = GLYPHLIB_PREFIX + "ufoData"
+# Written by glyphsLib.util.save_ufo_incrementally, not by the builder
+UFO_GLYPH_HASHES_KEY = GLYPHLIB_PREFIX + "glyphHashes"
 FONT_USER_DATA_KEY = GLYPHLIB_PREFIX + "fontUserData"
 LAYER_LIB_KEY = GLYPHLIB_PREFIX + "layerLib"
 LAYER_NAME_KEY = GLYPHLIB_PREFIX + "layerName"
@@ -22,6 +22,13 @@ def to_ufo_paths(self, ufo_glyph, layer):
     pen = ufo_glyph.getPointPen()
 
     for path in layer.paths:
+        node_data = path._node_data()
+        if not any(user_data for *_, user_data in node_data):
+            # Nothing needs the GSNode objects; don't make them if the path
+            # doesn't have them yet.
+            _to_ufo_path(pen, path.closed, node_data)
+            continue
+
         # the list is changed below, otherwise you can't draw more than once
         # per session.
         nodes = list(path.nodes)
@@ -62,6 +69,28 @@ def to_ufo_paths(self, ufo_glyph, layer):
         pen.endPath()
 
 
+def _to_ufo_path(pen, closed, nodes):
+    """Draw a path with no node user data from its _node_data()."""
+    pen.beginPath()
+    if nodes:
+        if not closed:
+            x, y, node_type, _, _ = nodes.pop(0)
+            assert node_type == "line", "Open path starts with off-curve points"
+            pen.addPoint((x, y), segmentType="move", name=None)
+        else:
+            # In Glyphs.app, the starting node of a closed contour is always
+            # stored at the end of the nodes list.
+            nodes.insert(0, nodes.pop())
+        for x, y, node_type, smooth, _ in nodes:
+            pen.addPoint(
+                (x, y),
+                segmentType=_to_ufo_node_type(node_type),
+                smooth=smooth,
+                name=None,
+            )
+    pen.endPath()
+
+
 def to_glyphs_paths(self, ufo_glyph, layer):
     # Keep track of path and node numbers, otherwise to_glyphs_node_user_data must
     # call _indices on every single GSNode, which is a huge performance drain.
@@ -19,6 +19,7 @@ import math
 import os
 import re
 import uuid
+from array import array
 from collections import OrderedDict
 from enum import IntEnum
 from io import StringIO
@@ -2235,21 +2236,195 @@ class GSNode(GSBase):
         return None
 
 
+class PackedNodes:
+    """The nodes of a path read from a file, stored compactly.
+
+    Fonts have a great many nodes, and making a GSNode object for each of
+    them is most of the time and memory it takes to load one. A GSPath read
+    from a file keeps its nodes here instead: the coordinates in an array,
+    and a byte of flags for each node with its type, whether it is smooth
+    and whether its coordinates are floats or ints. The nodes are only
+    turned into GSNode objects if something asks for ``path.nodes``; drawing
+    and writing the path read them from here.
+    """
+
+    __slots__ = "coordinates", "flags", "user_data"
+
+    TYPES = (LINE, CURVE, QCURVE, OFFCURVE)
+    TYPE_MASK = 0x03
+    SMOOTH = 0x04
+    X_FLOAT = 0x08
+    Y_FLOAT = 0x10
+
+    def __init__(self, coordinates, flags, user_data=None):
+        self.coordinates = array("d", coordinates)
+        self.flags = bytearray(flags)
+        self.user_data = user_data  # {node index: user data}, if any has some
+
+    @classmethod
+    def from_v3(cls, nodes):
+        """Pack nodes as parsed from a Glyphs 3 file; None if they won't go."""
+        coordinates = []
+        flags = []
+        user_data = None
+        for index, node in enumerate(nodes):
+            x, y = node[0], node[1]
+            flag = _V3_NODE_FLAGS.get(node[2])
+            coordinate_flags = _coordinate_flags(x, y)
+            if flag is None or coordinate_flags is None:
+                return None
+            coordinates += (x, y)
+            flags.append(flag | coordinate_flags)
+            if len(node) > 3:
+                if user_data is None:
+                    user_data = {}
+                user_data[index] = node[3]
+        return cls(coordinates, flags, user_data)
+
+    @classmethod
+    def from_v2(cls, nodes):
+        """Pack nodes as parsed from a Glyphs 2 file; None if they won't go."""
+        coordinates = []
+        flags = []
+        user_data = None
+        match = GSNode._PLIST_VALUE_RE.match
+        for index, line in enumerate(nodes):
+            m = match(line).groups()
+            x, y = parse_float_or_int(m[0]), parse_float_or_int(m[1])
+            flag = _NODE_TYPE_FLAGS.get(m[2].lower())
+            if flag is None:
+                return None
+            flag |= _coordinate_flags(x, y)
+            if m[3]:
+                flag |= cls.SMOOTH
+            coordinates += (x, y)
+            flags.append(flag)
+            if m[4] is not None and len(m[4]) > 0:
+                if user_data is None:
+                    user_data = {}
+                value = GSNode._decode_dict_as_string(m[4])
+                user_data[index] = Parser().parse(value)
+        return cls(coordinates, flags, user_data)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def __iter__(self):
+        """Yield (x, y, type, smooth, user data or None) for each node."""
+        coordinates = self.coordinates
+        user_data = self.user_data or {}
+        types = self.TYPES
+        for index, flag in enumerate(self.flags):
+            x = coordinates[2 * index]
+            y = coordinates[2 * index + 1]
+            yield (
+                x if flag & self.X_FLOAT else int(x),
+                y if flag & self.Y_FLOAT else int(y),
+                types[flag & self.TYPE_MASK],
+                bool(flag & self.SMOOTH),
+                user_data.get(index),
+            )
+
+    def unpack(self, path):
+        """Return the nodes as GSNode objects belonging to path."""
+        nodes = []
+        for x, y, node_type, smooth, user_data in self:
+            node = GSNode(position=(x, y), type=node_type, smooth=smooth)
+            node._parent = path
+            if user_data is not None:
+                node._userData = user_data
+            nodes.append(node)
+        return nodes
+
+    def plistValue(self, format_version=2):
+        # What writing the equivalent GSNode objects as an array gives
+        flags = self.flags
+        if not flags:
+            return "(\n)"
+        # All the coordinates at once, then all the nodes
+        masks = (self.X_FLOAT, self.Y_FLOAT)
+        floats = [flag & mask for flag in flags for mask in masks]
+        texts = [
+            floatToString5(value) if is_float else str(int(value))
+            for value, is_float in zip(self.coordinates, floats)
+        ]
+        if format_version == 2:
+            template, contents = '"%s %s %s"', _V2_NODE_CONTENTS
+        else:
+            template, contents = "(%s,%s,%s)", _V3_NODE_CONTENTS
+        kind = self.TYPE_MASK | self.SMOOTH
+        values = [
+            template % (texts[2 * index], texts[2 * index + 1], contents[flag & kind])
+            for index, flag in enumerate(flags)
+        ]
+        if self.user_data:
+            for index, (x, y, node_type, smooth, user_data) in enumerate(self):
+                if user_data is not None:
+                    node = GSNode(position=(x, y), type=node_type, smooth=smooth)
+                    node._userData = user_data
+                    values[index] = node.plistValue(format_version)
+        return "(\n" + ",\n".join(values) + "\n)"
+
+
+_NODE_TYPE_FLAGS = {node_type: i for i, node_type in enumerate(PackedNodes.TYPES)}
+_V3_NODE_TYPES = {LINE: "l", CURVE: "c", QCURVE: "q", OFFCURVE: "o"}
+_V3_NODE_FLAGS = {}
+for _node_type, _code in _V3_NODE_TYPES.items():
+    _V3_NODE_FLAGS[_code] = _NODE_TYPE_FLAGS[_node_type]
+    _V3_NODE_FLAGS[_code + "s"] = _NODE_TYPE_FLAGS[_node_type] | PackedNodes.SMOOTH
+# How a node is written, by its type and smooth flags
+_V2_NODE_CONTENTS = [
+    node_type.upper() + smooth
+    for smooth in ("", " SMOOTH")
+    for node_type in PackedNodes.TYPES
+]
+_V3_NODE_CONTENTS = [
+    _V3_NODE_TYPES[node_type] + smooth
+    for smooth in ("", "s")
+    for node_type in PackedNodes.TYPES
+]
+
+
+def _coordinate_flags(x, y):
+    """The PackedNodes flags for a node's coordinates, or None if they
+    aren't plain ints and floats."""
+    flags = 0
+    if type(x) is float:
+        flags |= PackedNodes.X_FLOAT
+    elif type(x) is not int:
+        return None
+    if type(y) is float:
+        flags |= PackedNodes.Y_FLOAT
+    elif type(y) is not int:
+        return None
+    return flags
+
+
 class GSPath(GSBase):
     _defaultsForName = {"closed": True}
     _parent = None
+    _packed = None
 
     def _serialize_to_plist(self, writer):
         if writer.format_version == 3 and self.attributes:
             writer.writeObjectKeyValue(self, "attributes", keyName="attr")
         writer.writeObjectKeyValue(self, "closed")
-        writer.writeObjectKeyValue(self, "nodes", "if_true")
+        if self._packed is not None:
+            if self._packed:
+                writer.writeKeyValue("nodes", self._packed)
+        else:
+            writer.writeObjectKeyValue(self, "nodes", "if_true")
 
     def _parse_nodes_dict(self, parser, d):
         if parser.format_version == 3:
+            packed = PackedNodes.from_v3(d)
             read_node = GSNode.read_v3
         else:
+            packed = PackedNodes.from_v2(d)
             read_node = GSNode.read
+        if packed is not None:
+            self._packed = packed
+            return
         for x in d:
             node = read_node(x)
             node._parent = self
@@ -2260,6 +2435,28 @@ class GSPath(GSBase):
         self._nodes = []
         self.attributes = {}
 
+    @property
+    def _nodes(self):
+        if self._packed is not None:
+            self._node_list = self._packed.unpack(self)
+            self._packed = None
+        return self._node_list
+
+    @_nodes.setter
+    def _nodes(self, value):
+        self._packed = None
+        self._node_list = value
+
+    def _node_data(self):
+        """Return (x, y, type, smooth, user data or None) for each node,
+        without making GSNode objects for them if there aren't any yet."""
+        if self._packed is not None:
+            return list(self._packed)
+        return [
+            (node.position.x, node.position.y, node.type, node.smooth, node._userData)
+            for node in self._node_list
+        ]
+
     def clone(self):
         """Clones the path (Does not clone attributes)"""
         cloned = GSPath()
@@ -2412,7 +2609,7 @@ class GSPath(GSBase):
 
     def drawPoints(self, pointPen: AbstractPointPen) -> None:
         """Draws points of contour with the given point pen."""
-        nodes = list(self.nodes)
+        nodes = self._node_data()
 
         pointPen.beginPath()
 
@@ -2421,12 +2618,12 @@ class GSPath(GSBase):
             return
 
         if not self.closed:
-            node = nodes.pop(0)
-            assert node.type == "line", "Open path starts with off-curve points"
-            node_data = dict(node.userData)
+            x, y, node_type, _, user_data = nodes.pop(0)
+            assert node_type == "line", "Open path starts with off-curve points"
+            node_data = dict(user_data or {})
             node_name = node_data.pop("name", None)
             pointPen.addPoint(
-                tuple(node.position),
+                (x, y),
                 segmentType="move",
                 name=node_name,
                 userData=node_data,
@@ -2436,14 +2633,14 @@ class GSPath(GSBase):
             # stored at the end of the nodes list.
             nodes.insert(0, nodes.pop())
 
-        for node in nodes:
-            node_type = node.type if node.type in _UFO_NODE_TYPES else None
-            node_data = dict(node.userData)
+        for x, y, node_type, smooth, user_data in nodes:
+            node_type = node_type if node_type in _UFO_NODE_TYPES else None
+            node_data = dict(user_data or {})
             node_name = node_data.pop("name", None)
             pointPen.addPoint(
-                tuple(node.position),
+                (x, y),
                 segmentType=node_type,
-                smooth=node.smooth,
+                smooth=smooth,
                 name=node_name,
                 userData=node_data,
             )
@@ -3656,6 +3853,9 @@ class GSLayer(GSBase):
     }
 
     def _parse_background_dict(self, parser, value):
+        if parser.minimal:
+            parser.skipped["background"] += 1
+            return
         self._background = parser._parse(value, GSBackgroundLayer)
         self._background._foreground = self
         self._background.parent = self.parent
@@ -4057,6 +4257,26 @@ GSLayer._add_parsers(
 )
 
 
+def _is_backup_layer_dict(layer, format_version):
+    """Whether the unparsed layer 'layer' is a backup of a master layer,
+    which only matters to the font editor. This mirrors the layer kinds
+    the builder looks at: masters, brace, bracket, color and smart
+    component layers are not backups, even if dangling."""
+    layer_id = layer.get("layerId")
+    if layer.get("associatedMasterId", layer_id) == layer_id:
+        return False
+    if format_version > 2:
+        return not layer.get("attr") and not layer.get("partSelection")
+    name = layer.get("name") or ""
+    if "{" in name and "}" in name and ".background" not in name:
+        return False  # brace layer
+    if GSLayer.BRACKET_LAYER_RE.match(name):
+        return False
+    if GSLayer.COLOR_PALETTE_LAYER_RE.match(name.strip()):
+        return False
+    return "PartSelection" not in (layer.get("userData") or {})
+
+
 class GSBackgroundLayer(GSLayer):
     @property
     def background(self):
@@ -4173,6 +4393,12 @@ class GSGlyph(GSBase):
         self["_unicodes"] = UnicodesList(uni)
 
     def _parse_layers_dict(self, parser, value):
+        if parser.minimal:
+            count = len(value)
+            value = [
+                l for l in value if not _is_backup_layer_dict(l, parser.format_version)
+            ]
+            parser.skipped["layer"] += count - len(value)
         layers = parser._parse(value, GSLayer)
         for l in layers:
             self.layers.append(l)
@@ -4348,6 +4574,45 @@ GSGlyph._add_parsers(
 )
 
 
+class LazyGSGlyph(GSGlyph):
+    """A glyph of a font read with ``load(..., lazy=True)``.
+
+    Only its name is read up front. The rest is parsed the first time
+    anything else about the glyph is used, at which point the object turns
+    into a plain GSGlyph.
+    """
+
+    def __init__(self, name, parse):
+        # parse(glyph) fills in an empty GSGlyph
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "parent", None)
+        object.__setattr__(self, "_parse", parse)
+
+    def __getattr__(self, name):
+        if "_parse" not in self.__dict__:
+            raise AttributeError(name)
+        self._load()
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        if name != "parent":
+            self._load()
+        object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return '<GSGlyph "{}" (not loaded yet)>'.format(self.name)
+
+    def _load(self):
+        parse = self.__dict__.pop("_parse")
+        parent = self.parent
+        object.__setattr__(self, "__class__", GSGlyph)
+        self.__init__()
+        parse(self)
+        # As if it had been added to the font after being parsed
+        if parent is not None:
+            parent._setupGlyph(self)
+
+
 class GSFont(GSBase):
     _defaultsForName = {
         "classes": [],
@@ -4541,6 +4806,8 @@ class GSFont(GSBase):
 
     def _setupGlyph(self, glyph):
         glyph.parent = self
+        if isinstance(glyph, LazyGSGlyph):
+            return  # Its layers are set up when it is loaded
         for layer in glyph.layers:
             if (
                 not hasattr(layer, "associatedMasterId")
@@ -179,6 +179,13 @@ def main(args=None):
             "script, category, subCategory, etc.). Can be used more than once."
         ),
     )
+    parser_glyphs2ufo.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Convert the glyphs with this many processes (default: %(default)s)",
+    )
 
     parser_ufo2glyphs = subparsers.add_parser("ufo2glyphs", help=ufo2glyphs.__doc__)
     parser_ufo2glyphs.set_defaults(func=ufo2glyphs)
@@ -276,6 +283,7 @@ def glyphs2ufo(options):
         ufo_module=__import__(options.ufo_module),
         minimal=options.minimal,
         glyph_data=options.glyph_data or None,
+        jobs=options.jobs,
     )
 
 
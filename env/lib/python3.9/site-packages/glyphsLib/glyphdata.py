@@ -22,12 +22,18 @@ tripping.
 
 
 import collections
+import functools
+import hashlib
+import marshal
+import os
 import re
 from fontTools import unicodedata
 import xml.etree.ElementTree
 
 import fontTools.agl
 
+from glyphsLib.util import cache_dir, write_cache_file
+
 
 __all__ = ["get_glyph", "GlyphData"]
 
@@ -40,6 +46,13 @@ Glyph = collections.namedtuple(
 # Global variable holding the actual GlyphData data, assigned on first use.
 GLYPHDATA = None
 
+# Bump this when the contents of the cache files change
+CACHE_VERSION = 1
+
+# The number of glyph names whose information in the built-in data get_glyph
+# remembers.
+LOOKUP_CACHE_SIZE = 1 << 16
+
 
 class GlyphData:
     """Map (alternative) names and production names to GlyphData data.
@@ -62,14 +75,47 @@ class GlyphData:
 
     @classmethod
     def from_files(cls, *glyphdata_files):
-        """Return GlyphData holding data from a list of XML file paths."""
+        """Return GlyphData holding data from a list of XML file paths (or
+        binary file objects).
+
+        The data can be cached, see ``glyphsLib.util.CACHE_DIR_VARIABLE``.
+        """
+        contents = []
+        for glyphdata_file in glyphdata_files:
+            if hasattr(glyphdata_file, "read"):
+                contents.append(glyphdata_file.read())
+            else:
+                with open(glyphdata_file, "rb") as f:
+                    contents.append(f.read())
+
+        cache_file = _cache_file(contents)
+        if cache_file is not None:
+            try:
+                with open(cache_file, "rb") as f:
+                    return cls(*marshal.loads(f.read()))
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        data = cls._parse(contents)
+        if cache_file is not None:
+            mappings = (
+                data.names,
+                data.alternative_names,
+                data.production_names,
+                data.unicodes,
+            )
+            write_cache_file(cache_file, lambda f: marshal.dump(mappings, f))
+        return data
+
+    @classmethod
+    def _parse(cls, contents):
         name_mapping = {}
         alt_name_mapping = {}
         production_name_mapping = {}
         unicodes_mapping = {}
 
-        for glyphdata_file in glyphdata_files:
-            glyph_data = xml.etree.ElementTree.parse(glyphdata_file).getroot()
+        for content in contents:
+            glyph_data = xml.etree.ElementTree.fromstring(content)
             for glyph in glyph_data:
                 glyph_name = glyph.attrib["name"]
                 glyph_name_alternatives = glyph.attrib.get("altNames")
@@ -91,6 +137,18 @@ class GlyphData:
         )
 
 
+def _cache_file(contents):
+    """Return the path of the cache file for GlyphData parsed from
+    ``contents``, or None if there is no cache directory."""
+    directory = cache_dir()
+    if directory is None:
+        return None
+    digest = hashlib.sha256(f"{CACHE_VERSION} {marshal.version}".encode())
+    for content in contents:
+        digest.update(hashlib.sha256(content).digest())
+    return os.path.join(directory, f"glyphdata-{digest.hexdigest()[:32]}.marshal")
+
+
 def get_glyph(glyph_name, data=None, unicodes=None):
     """Return a named tuple (Glyph) containing information derived from a glyph
     name akin to GSGlyphInfo.
@@ -98,6 +156,21 @@ def get_glyph(glyph_name, data=None, unicodes=None):
     The information is derived from an included copy of GlyphData.xml
     and GlyphData_Ideographs.xml, going by the glyph name or unicode fallback.
     """
+    if unicodes is not None:
+        unicodes = tuple(unicodes)
+    if data is None or data is GLYPHDATA:
+        return _get_builtin_glyph(glyph_name, unicodes)
+    # Custom data is loaded anew for every font, so lookups in it are not
+    # remembered: the cache would keep every such database alive.
+    return _get_glyph(glyph_name, data, unicodes)
+
+
+@functools.lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _get_builtin_glyph(glyph_name, unicodes):
+    return _get_glyph(glyph_name, None, unicodes)
+
+
+def _get_glyph(glyph_name, data, unicodes):
 
     # Read data on first use.
     global GLYPHDATA
@@ -13,24 +13,45 @@
 # limitations under the License.
 
 
-from collections import OrderedDict
+from collections import Counter, OrderedDict
+from functools import partial
 from pathlib import Path
+import gc
 import glyphsLib
+import hashlib
+import io
 import logging
-import openstep_plist
 import os
+import pickle
+import re
 import sys
 
+from glyphsLib.util import cache_dir, write_cache_file
+
+try:
+    import openstep_plist
+except ImportError:
+    # openstep_plist is a compiled extension; where it isn't built for this
+    # platform, fall back to our pure Python parser.
+    from glyphsLib import plist as openstep_plist
+
 
 logger = logging.getLogger(__name__)
 
+# Bump this when the contents of the cached fonts change (see load)
+CACHE_VERSION = 1
+
 
 class Parser:
     """Parses Python dictionaries from Glyphs files."""
 
-    def __init__(self, current_type=OrderedDict, format_version=2):
+    def __init__(self, current_type=OrderedDict, format_version=2, minimal=False):
         self.current_type = current_type
         self.format_version = format_version
+        # Whether to leave out what only editing the font needs (see load)
+        self.minimal = minimal
+        # What was left out, by kind
+        self.skipped = Counter()
 
     def parse(self, d):
         try:
@@ -41,7 +62,7 @@ class Parser:
                 d = self._fl7_format_clean(d)
                 d = openstep_plist.loads(d.decode(), use_numbers=True)
             result = self._parse(d)
-        except openstep_plist.parser.ParseError as e:
+        except openstep_plist.ParseError as e:
             raise ValueError("Failed to parse file") from e
         return result
 
@@ -140,27 +161,253 @@ def load_glyphspackage(package_dir):
     return data
 
 
-def load(file_or_path, font=None):
+# What matters when looking for the glyphs in a .glyphs file: braces, the
+# "glyphs = (" key, and strings and comments, which might contain either.
+# Everything else is skipped in bulk; a lone "/" or "g" matches on its own.
+_WORD_CHAR = rb"[A-Za-z0-9_$/:.\-]"
+_SKELETON = re.compile(
+    rb"[^{}\"'/g]*(?:"
+    rb"(\{)|(\})"
+    rb"|(glyphs)(?<!" + _WORD_CHAR + rb"glyphs)[ \t\n\r]*=[ \t\n\r]*\("
+    rb'|"[^"\\]*(?:\\.[^"\\]*)*"'
+    rb"|'[^'\\]*(?:\\.[^'\\]*)*'"
+    rb"|//(?<!" + _WORD_CHAR + rb"//)[^\n\r]*"
+    rb"|/\*(?<!" + _WORD_CHAR + rb"/\*).*?\*/"
+    rb"|[/g])",
+    re.S,
+)
+_OPEN, _CLOSE, _GLYPHS = 1, 2, 3
+_NEXT_GLYPH = re.compile(rb"[ \t\n\r]*(,?)[ \t\n\r]*([{)])")
+_GLYPHNAME = re.compile(
+    rb"[{;][ \t\n\r]*glyphname[ \t\n\r]*=[ \t\n\r]*"
+    rb'("(?:[^"\\]|\\.)*"|' + _WORD_CHAR + rb"+)[ \t\n\r]*;"
+)
+
+
+def _glyph_spans(data):
+    """Find the glyphs in the text of a .glyphs file. Return the start and
+    end of the contents of the glyphs array, and a (start, end) span for
+    each glyph in it; or None if the file has no glyphs or does not look
+    the way Glyphs writes them."""
+    depth = 0
+    spans = None
+    for match in _SKELETON.finditer(data):
+        token = match.lastindex
+        if token == _OPEN:
+            depth += 1
+            if depth == 2:
+                start = match.start(_OPEN)
+        elif token == _CLOSE:
+            depth -= 1
+            if depth == 1 and spans is not None:
+                spans.append((start, match.end()))
+                following = _NEXT_GLYPH.match(data, match.end())
+                if following is None:
+                    return None
+                comma, bracket = following.groups()
+                if bracket == b")":
+                    return array_start, following.start(2), spans
+                if not comma:
+                    return None
+        elif token == _GLYPHS and depth == 1:
+            if spans is not None:
+                return None
+            array_start = match.end()
+            following = _NEXT_GLYPH.match(data, array_start)
+            if following is None or following.groups() != (b"", b"{"):
+                return None
+            spans = []
+    return None
+
+
+def _parse_glyph(data, start, end, font_parser, glyph):
+    plist = openstep_plist.loads(data[start:end].decode("utf-8"), use_numbers=True)
+    # The parser state each glyph starts with when the font is read in full
+    p = Parser(
+        current_type=type(glyph),
+        format_version=font_parser.format_version,
+        minimal=font_parser.minimal,
+    )
+    p.skipped = font_parser.skipped
+    p._parse_dict_into_object(glyph, plist)
+
+
+def _load_lazily(data, p):
+    """Parse the text of a .glyphs file, leaving the glyphs unparsed.
+    The glyphs array comes back holding LazyGSGlyph objects."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    found = _glyph_spans(data)
+    if found is None:
+        return openstep_plist.loads(data.decode("utf-8"), use_numbers=True)
+    array_start, array_end, spans = found
+    text = (data[:array_start] + data[array_end:]).decode("utf-8")
+    plist = openstep_plist.loads(text, use_numbers=True)
+
+    glyphs = []
+    for start, end in spans:
+        match = _GLYPHNAME.search(data, start, end)
+        if match is None or data.find(b"{", start + 1, match.start()) != -1:
+            # No name where we'd expect one; parse it now
+            text = data[start:end].decode("utf-8")
+            glyphs.append(openstep_plist.loads(text, use_numbers=True))
+            continue
+        name = openstep_plist.loads(match.group(1).decode("utf-8"), use_numbers=True)
+        parse = partial(_parse_glyph, data, start, end, p)
+        glyphs.append(glyphsLib.classes.LazyGSGlyph(name, parse))
+    plist["glyphs"] = glyphs
+    return plist
+
+
+def load(file_or_path, font=None, lazy=False, minimal=False):
     """Read a .glyphs file. 'file_or_path' should be a (readable) file
     object, a file name, or in the case of a .glyphspackage file, a
     directory name. 'font' is an existing object to parse into, or None.
+    If 'lazy' is true, the glyphs of a .glyphs file are only parsed when
+    they are first used, which makes loading much quicker when only the
+    font-level information is needed.
+    If 'minimal' is true, the backup layers and layer backgrounds of the
+    glyphs are not read, as they are not needed to build fonts (compare
+    the 'minimal' argument of to_ufos). Master, brace, bracket, color and
+    smart component layers are kept. Such a font should not be written back.
+    If there is a glyphsLib cache directory (see
+    glyphsLib.util.CACHE_DIR_VARIABLE), a font read from a path is kept in
+    it, and read back from there for as long as the source and glyphsLib are
+    unchanged.
     Return a 'font' or a GSFont object.
     """
-    logger.info("Parsing .glyphs file")
     if font is None:
         font = glyphsLib.classes.GSFont()
-    p = Parser(current_type=font.__class__)
+    cache_file = digest = None
+    if not hasattr(file_or_path, "read"):
+        try:
+            cache_file, digest = _font_cache_file(file_or_path, font, minimal)
+        except OSError:
+            pass  # Reading the source will fail too, and say why
+        if cache_file is not None and _read_font_cache(cache_file, digest, font):
+            logger.info("Read .glyphs file from the cache")
+            return font
+
+    logger.info("Parsing .glyphs file")
+    p = Parser(current_type=font.__class__, minimal=minimal)
     if hasattr(file_or_path, "read"):
-        data = openstep_plist.load(file_or_path, use_numbers=True)
+        if lazy:
+            data = _load_lazily(file_or_path.read(), p)
+        else:
+            data = openstep_plist.load(file_or_path, use_numbers=True)
     elif os.path.isdir(file_or_path):
         data = load_glyphspackage(file_or_path)
+    elif lazy:
+        with open(file_or_path, "rb") as fp:
+            data = _load_lazily(fp.read(), p)
     else:
         fp = open(file_or_path, "r", encoding="utf-8")
         data = openstep_plist.load(fp, use_numbers=True)
     p.parse_into_object(font, data)
+    if p.skipped:
+        logger.info(
+            "Skipped %i backup layers and %i layer backgrounds",
+            p.skipped["layer"],
+            p.skipped["background"],
+        )
+    if cache_file is not None and not lazy:
+        _write_font_cache(cache_file, digest, font)
     return font
 
 
+def _font_cache_file(path, font, minimal):
+    """Return the path of the cache file for the font read from 'path', and
+    the digest of the source which the cached font must have been read from;
+    or (None, None) if there is no cache directory."""
+    directory = cache_dir()
+    if directory is None:
+        return None, None
+    path = os.path.abspath(path)
+    key = hashlib.sha256(
+        f"{CACHE_VERSION} {glyphsLib.__version__} {sys.version_info[:2]} "
+        f"{type(font).__module__}.{type(font).__qualname__} {minimal} "
+        f"{path}".encode()
+    )
+    cache_file = os.path.join(directory, f"font-{key.hexdigest()[:32]}.pickle")
+
+    # One file per source, replaced when the source changes
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file = os.path.join(root, name)
+                digest.update(os.path.relpath(file, path).encode() + b"\0")
+                with open(file, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    else:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return cache_file, digest.digest()
+
+
+class _FontPickler(pickle.Pickler):
+    """Pickles the state of a font, leaving out the font object itself so
+    that the state can be unpickled into another font."""
+
+    def __init__(self, file, font):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.font = font
+
+    def persistent_id(self, obj):
+        return "font" if obj is self.font else None
+
+
+class _FontUnpickler(pickle.Unpickler):
+    def __init__(self, file, font):
+        super().__init__(file)
+        self.font = font
+
+    def persistent_load(self, pid):
+        if pid != "font":
+            raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+        return self.font
+
+
+def _read_font_cache(cache_file, digest, font):
+    """Read the cached font into 'font' and return True, if it was read
+    from the source with 'digest'."""
+    try:
+        with open(cache_file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return False
+    if data[: len(digest)] != digest:
+        return False
+    # The many new objects would set off garbage collections, which can't
+    # find anything to collect but take longer than the unpickling.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        state = _FontUnpickler(io.BytesIO(data[len(digest) :]), font).load()
+    except Exception:
+        # Unreadable, for example made by a glyphsLib with other classes
+        # under the same version number; just parse the source again
+        logger.debug("Ignoring unreadable cache file %s", cache_file, exc_info=True)
+        return False
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    font.__dict__.update(state)
+    return True
+
+
+def _write_font_cache(cache_file, digest, font):
+    def write(f):
+        f.write(digest)
+        _FontPickler(f, font).dump(font.__dict__)
+
+    try:
+        write_cache_file(cache_file, write)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        logger.debug("Could not cache %s", cache_file, exc_info=True)
+
+
 def loads(s):
     """Read a .glyphs file from a (unicode) str object, or from
     a UTF-8 encoded bytes object.
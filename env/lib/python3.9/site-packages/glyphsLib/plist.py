@@ -0,0 +1,353 @@
+"""A pure Python parser for the OpenStep property lists of .glyphs files.
+
+glyphsLib normally uses the openstep_plist package, which is a compiled
+extension. Where there is no build of it for the platform, glyphsLib.parser
+falls back to this module, which has the same ``load``/``loads`` interface
+and gives the same results.
+
+It is written for speed rather than clarity: one regular expression splits
+the file into tokens in a single pass, and the most common constructs in a
+Glyphs file, a ``key = value;`` pair and a flat array such as a node
+``(354,0,l)``, are each matched as a single token.
+
+To compare its speed with openstep_plist's::
+
+    python -m glyphsLib.plist Font.glyphs
+"""
+
+import re
+
+__all__ = ["load", "loads", "ParseError"]
+
+
+class ParseError(Exception):
+    pass
+
+
+# Whitespace, as far as OpenStep plists are concerned
+_WS = "[\t\n\x0b\x0c\r \u2028\u2029]*"
+# An unquoted string; "//" or "/*" would start a comment instead
+_WORD = r"(?![/][/*])[A-Za-z0-9_$/:.\-]+"
+_WORD_NO_SLASH = r"[A-Za-z0-9_$:.\-]+"
+_QUOTED = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+
+_TOKEN = re.compile(
+    _WS
+    + r"(?:"
+    # 1: a comment
+    + "(//[^\n\r\u2028\u2029]*|/\\*.*?\\*/)"
+    # 2, 3 (key), 4, 5 (value): key = value;
+    + rf"|(?:({_WORD})|{_QUOTED}){_WS}={_WS}(?:({_WORD})|{_QUOTED}){_WS};"
+    # 6: an array of unquoted strings
+    + rf"|\({_WS}((?:{_WORD_NO_SLASH}{_WS},{_WS})*(?:{_WORD_NO_SLASH})?){_WS}\)"
+    # 7: an unquoted string
+    + rf"|({_WORD})"
+    # 8, 9: a quoted string
+    + rf"|{_QUOTED}"
+    + r"|'([^'\\]*(?:\\.[^'\\]*)*)'"
+    # 10: punctuation
+    + r"|([{}()=;,])"
+    # 11: data
+    + r"|<([^>]*)>"
+    + r")",
+    re.S,
+)
+_END = re.compile(_WS + r"\Z")
+_COMMENT, _KEY_WORD, _KEY_QUOTED, _ENTRY_WORD, _ENTRY_QUOTED = 1, 2, 3, 4, 5
+_ARRAY, _UNQUOTED, _QUOTED_DQ, _QUOTED_SQ, _PUNCTUATION, _DATA = 6, 7, 8, 9, 10, 11
+
+# What the parser expects next
+(
+    _EXPECT_VALUE,  # a value (the top level, or after "=")
+    _EXPECT_ITEM,  # an array item, or the end of the array
+    _EXPECT_KEY,  # a key, or the end of the dictionary
+    _EXPECT_EQUALS,  # "=" (or ";") after a key
+    _EXPECT_SEPARATOR,  # ";" after a dictionary value, "," or ")" in an array
+    _EXPECT_NOTHING,  # the top level value is done
+) = range(6)
+
+_NUMBER = re.compile(r"-?[0-9]+(\.[0-9]*)?")
+_ESCAPE = re.compile(r"\\([0-7]{1,3}|U[0-9A-Fa-f]{0,4}|.)", re.S)
+_SURROGATES = re.compile("[\ud800-\udbff][\udc00-\udfff]")
+_ESCAPED_CHARACTERS = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+}
+# NeXTSTEP encoding of the octal escapes 0o200-0o377
+_NEXTSTEP = "".join(
+    chr(code)
+    for code in (
+        0xA0, 0xC0, 0xC1, 0xC2, 0xC3, 0xC4, 0xC5, 0xC7, 0xC8, 0xC9,
+        0xCA, 0xCB, 0xCC, 0xCD, 0xCE, 0xCF, 0xD0, 0xD1, 0xD2, 0xD3,
+        0xD4, 0xD5, 0xD6, 0xD9, 0xDA, 0xDB, 0xDC, 0xDD, 0xDE, 0xB5,
+        0xD7, 0xF7, 0xA9, 0xA1, 0xA2, 0xA3, 0x2044, 0xA5, 0x192, 0xA7,
+        0xA4, 0x2019, 0x201C, 0xAB, 0x2039, 0x203A, 0xFB01, 0xFB02, 0xAE, 0x2013,
+        0x2020, 0x2021, 0xB7, 0xA6, 0xB6, 0x2022, 0x201A, 0x201E, 0x201D, 0xBB,
+        0x2026, 0x2030, 0xAC, 0xBF, 0xB9, 0x2CB, 0xB4, 0x2C6, 0x2DC, 0xAF,
+        0x2D8, 0x2D9, 0xA8, 0xB2, 0x2DA, 0xB8, 0xB3, 0x2DD, 0x2DB, 0x2C7,
+        0x2014, 0xB1, 0xBC, 0xBD, 0xBE, 0xE0, 0xE1, 0xE2, 0xE3, 0xE4,
+        0xE5, 0xE7, 0xE8, 0xE9, 0xEA, 0xEB, 0xEC, 0xC6, 0xED, 0xAA,
+        0xEE, 0xEF, 0xF0, 0xF1, 0x141, 0xD8, 0x152, 0xBA, 0xF2, 0xF3,
+        0xF4, 0xF5, 0xF6, 0xE6, 0xF9, 0xFA, 0xFB, 0x131, 0xFC, 0xFD,
+        0x142, 0xF8, 0x153, 0xDF, 0xFE, 0xFF, 0xFFFD, 0xFFFD,
+    )
+)  # fmt: skip
+
+
+def _unescape_one(match):
+    escape = match.group(1)
+    first = escape[0]
+    if first in "01234567":
+        code = int(escape, 8) & 0xFF
+        return chr(code) if code < 128 else _NEXTSTEP[code - 128]
+    if first == "U":
+        return chr(int(escape[1:], 16)) if len(escape) > 1 else "\0"
+    return _ESCAPED_CHARACTERS.get(first, first)
+
+
+def _combine_surrogates(match):
+    high, low = match.group(0)
+    return chr(0x10000 + (ord(high) - 0xD800) * 0x400 + ord(low) - 0xDC00)
+
+
+def _unescape(string):
+    string = _ESCAPE.sub(_unescape_one, string)
+    # Characters outside the BMP are written as two \U escapes
+    return _SURROGATES.sub(_combine_surrogates, string)
+
+
+def _scalar_converter(use_numbers):
+    # Unquoted strings repeat a lot (coordinates, node types...), so
+    # remember what each one turned out to be.
+    cache = {}
+
+    def convert(word):
+        try:
+            return cache[word]
+        except KeyError:
+            pass
+        value = word
+        if use_numbers:
+            number = _NUMBER.fullmatch(word)
+            if number:
+                value = float(word) if number.group(1) is not None else int(word)
+        cache[word] = value
+        return value
+
+    return convert
+
+
+def _line(string, pos):
+    return string.count("\n", 0, pos) + 1
+
+
+def loads(string, dict_type=dict, use_numbers=False):
+    """Parse an OpenStep property list from a string.
+
+    Unquoted strings which look like numbers are returned as ints and
+    floats if *use_numbers* is true.
+    """
+    if isinstance(string, bytes):
+        string = string.decode("utf-8")
+    if not isinstance(string, str):
+        raise TypeError(f"Could not convert to unicode: {string!r}")
+    if _END.match(string):
+        return {}
+
+    convert = _scalar_converter(use_numbers)
+    stack = []  # the enclosing containers and the state of the parser in them
+    container = key = None
+    is_dict = False
+    expect = _EXPECT_VALUE
+    result = None
+    pos = 0
+
+    for match in _TOKEN.finditer(string):
+        if match.start() != pos:
+            raise ParseError(
+                "Unexpected character at line %d: %r"
+                % (_line(string, pos), string[pos:match.start()].strip()[:1])
+            )
+        pos = match.end()
+        kind = match.lastindex
+
+        # The common cases first: a whole "key = value;" entry...
+        if kind == _ENTRY_WORD or kind == _ENTRY_QUOTED:
+            if expect != _EXPECT_KEY:
+                if container is None:
+                    # A "strings" file: dictionary contents without the braces
+                    return loads("{%s\n}" % string, dict_type, use_numbers)
+                raise ParseError("Unexpected '=' at line %d" % _line(string, pos))
+            entry_key = match.group(_KEY_WORD)
+            if entry_key is None:
+                entry_key = match.group(_KEY_QUOTED)
+                if "\\" in entry_key:
+                    entry_key = _unescape(entry_key)
+            if kind == _ENTRY_WORD:
+                container[entry_key] = convert(match.group(_ENTRY_WORD))
+            else:
+                value = match.group(_ENTRY_QUOTED)
+                container[entry_key] = _unescape(value) if "\\" in value else value
+            continue
+
+        # ...and the next value, if this token is one
+        if kind == _UNQUOTED:
+            value = match.group(_UNQUOTED)
+            if expect == _EXPECT_KEY:
+                key, expect = value, _EXPECT_EQUALS
+                continue
+            value = convert(value)
+        elif kind == _ARRAY:
+            items = match.group(_ARRAY).split(",")
+            if not items[-1]:
+                items.pop()  # () or a trailing comma
+            value = [convert(item.strip()) for item in items]
+        elif kind == _QUOTED_DQ or kind == _QUOTED_SQ:
+            value = match.group(kind)
+            if "\\" in value:
+                value = _unescape(value)
+            if expect == _EXPECT_KEY:
+                key, expect = value, _EXPECT_EQUALS
+                continue
+        elif kind == _PUNCTUATION:
+            char = match.group(_PUNCTUATION)
+            if (
+                (char == "=" or char == ";")
+                and container is None
+                and isinstance(result, str)
+            ):
+                return loads("{%s\n}" % string, dict_type, use_numbers)
+            if char == "{" or char == "(":
+                if expect != _EXPECT_VALUE and expect != _EXPECT_ITEM:
+                    raise ParseError(
+                        "Unexpected %r at line %d" % (char, _line(string, pos))
+                    )
+                stack.append((container, key, is_dict, expect))
+                if char == "{":
+                    container, key, is_dict = dict_type(), None, True
+                    expect = _EXPECT_KEY
+                else:
+                    container, key, is_dict = [], None, False
+                    expect = _EXPECT_ITEM
+                continue
+            elif char == "}" or char == ")":
+                if char == "}":
+                    closes = is_dict and expect == _EXPECT_KEY
+                else:
+                    closes = expect == _EXPECT_ITEM or (
+                        expect == _EXPECT_SEPARATOR and not is_dict
+                    )
+                if not closes:
+                    raise ParseError(
+                        "Unexpected %r at line %d" % (char, _line(string, pos))
+                    )
+                value = container
+                container, key, is_dict, expect = stack.pop()
+            elif char == "=":
+                if expect != _EXPECT_EQUALS:
+                    raise ParseError("Unexpected '=' at line %d" % _line(string, pos))
+                expect = _EXPECT_VALUE
+                continue
+            elif char == ";":
+                if is_dict and expect == _EXPECT_SEPARATOR:
+                    expect = _EXPECT_KEY
+                elif is_dict and expect == _EXPECT_EQUALS:
+                    # "key;" is short for "key = key;"
+                    container[key] = key
+                    expect = _EXPECT_KEY
+                else:
+                    raise ParseError("Unexpected ';' at line %d" % _line(string, pos))
+                continue
+            else:  # ","
+                if is_dict or expect != _EXPECT_SEPARATOR:
+                    raise ParseError("Unexpected ',' at line %d" % _line(string, pos))
+                expect = _EXPECT_ITEM
+                continue
+        elif kind == _DATA:
+            try:
+                value = bytes.fromhex(match.group(_DATA))
+            except ValueError:
+                raise ParseError(
+                    "Malformed data at line %d" % _line(string, pos)
+                ) from None
+        else:  # a comment
+            continue
+
+        # Put the value where it goes
+        if expect == _EXPECT_VALUE:
+            if container is None:
+                result = value
+                expect = _EXPECT_NOTHING
+            else:
+                container[key] = value
+                expect = _EXPECT_SEPARATOR
+        elif expect == _EXPECT_ITEM:
+            container.append(value)
+            expect = _EXPECT_SEPARATOR
+        elif expect == _EXPECT_NOTHING and isinstance(result, str) and not stack:
+            # A "strings" file: dictionary contents without the braces
+            return loads("{%s\n}" % string, dict_type, use_numbers)
+        else:
+            raise ParseError("Unexpected value at line %d" % _line(string, pos))
+
+    if not _END.match(string, pos):
+        if expect == _EXPECT_NOTHING and isinstance(result, str):
+            return loads("{%s\n}" % string, dict_type, use_numbers)
+        raise ParseError(
+            "Unexpected character at line %d: %r"
+            % (_line(string, pos), string[pos:].strip()[:1])
+        )
+    if expect != _EXPECT_NOTHING:
+        raise ParseError("Unexpected EOF while parsing plist")
+    return result
+
+
+def load(fp, dict_type=dict, use_numbers=False):
+    """Parse an OpenStep property list from a file object."""
+    return loads(fp.read(), dict_type=dict_type, use_numbers=use_numbers)
+
+
+def main(args=None):
+    """Time this parser against openstep_plist on some files."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("files", nargs="+", help=".glyphs or .plist files")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per parser (default: 5)"
+    )
+    options = parser.parse_args(args)
+
+    parsers = {"glyphsLib.plist": loads}
+    try:
+        import openstep_plist
+
+        parsers["openstep_plist"] = openstep_plist.loads
+    except ImportError:
+        print("openstep_plist is not available here")
+
+    for path in options.files:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        results = {}
+        print(f"{path} ({len(text) / 1024:.0f}KB):")
+        for name, parse in parsers.items():
+            times = []
+            for _ in range(options.repeat):
+                start = time.perf_counter()
+                results[name] = parse(text, use_numbers=True)
+                times.append(time.perf_counter() - start)
+            print(f"  {name:16} best {min(times) * 1000:8.1f}ms")
+        if len(results) > 1:
+            same = results["glyphsLib.plist"] == results["openstep_plist"]
+            print("  results are " + ("identical" if same else "DIFFERENT"))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,14 +14,49 @@
 
 # TODO: (jany) merge with builder/common.py
 
+import contextlib
+import hashlib
 import logging
 import itertools
 import os
+import pickle
 import shutil
+from fontTools.misc import plistlib
 from fontTools.misc.textTools import num2binary
 
 logger = logging.getLogger(__name__)
 
+# Some results which take a while to work out (such as parsed GlyphData
+# files) can be kept in a cache directory, and read back the next time. There
+# is no cache unless this environment variable names the directory; build
+# tools which run glyphsLib many times over set it.
+CACHE_DIR_VARIABLE = "GLYPHSLIB_CACHE_DIR"
+
+
+def cache_dir():
+    """Return the cache directory, or None if caching is turned off."""
+    return os.environ.get(CACHE_DIR_VARIABLE) or None
+
+
+def write_cache_file(cache_file, write):
+    """Write a file in the cache by calling ``write`` with a binary file
+    object. Failing to write it is not an error."""
+    # Write to a temporary file first, as another process may be reading
+    temporary = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(temporary, "wb") as f:
+            write(f)
+        os.replace(temporary, cache_file)
+    except OSError:
+        # Nowhere to write it; it will just be worked out again next time
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+        raise
+
 
 def build_ufo_path(out_dir, family_name, style_name):
     """Build string to use as a UFO path."""
@@ -57,6 +92,134 @@ def clean_ufo(path):
         shutil.rmtree(path)
 
 
+def save_ufo_incrementally(ufo, path, validate=True):
+    """Save a UFO, rewriting only the glyphs which changed since the last time
+    it was saved to the same path with this function.
+
+    A hash of each glyph is kept in the UFO lib. Saving again compares them
+    and writes the .glif files of changed glyphs only, and the plists only if
+    their contents changed, so that unchanged files keep their modification
+    times. Glyphs which were removed are deleted, as with clean_ufo.
+
+    Only ufoLib2 fonts saved as a UFO package can be saved this way; others are
+    written out in full.
+    """
+    import ufoLib2
+    from fontTools.ufoLib import UFOWriter
+    from glyphsLib.builder.constants import UFO_GLYPH_HASHES_KEY
+
+    if not isinstance(ufo, ufoLib2.Font):
+        clean_ufo(path)
+        ufo.save(path)
+        return
+
+    hashes = {
+        layer.name: {glyph.name: _glyph_hash(glyph) for glyph in layer}
+        for layer in ufo.layers
+    }
+    previous = _read_glyph_hashes(path, UFO_GLYPH_HASHES_KEY)
+    if previous is None:
+        # Not saved by us before, or not a UFO package at all
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        previous = {}
+
+    changed = False
+    ufo.lib[UFO_GLYPH_HASHES_KEY] = hashes
+    try:
+        with UFOWriter(path, structure="package", validate=validate) as writer:
+            writer.writeFeatures(ufo.features.text)
+            writer.writeGroups(ufo.groups)
+            writer.writeInfo(ufo.info)
+            writer.writeKerning(ufo.kerning)
+
+            existing_layers = writer.getLayerNames() if previous else []
+            for name in set(existing_layers).difference(ufo.layers.keys()):
+                writer.deleteGlyphSet(name)
+                changed = True
+            try:
+                lib_mtime = os.stat(os.path.join(path, "lib.plist")).st_mtime_ns
+            except OSError:
+                lib_mtime = -1
+            for layer in ufo.layers:
+                # Missing .glif files are caught below, no need to check here
+                glyph_set = writer.getGlyphSet(
+                    layer.name,
+                    defaultLayer=layer is ufo.layers.defaultLayer,
+                    validateRead=False,
+                )
+                for name in set(glyph_set.contents).difference(layer.keys()):
+                    glyph_set.deleteGlyph(name)
+                    changed = True
+                layer_directory = glyph_set.fs.getsyspath("")
+                unchanged = previous.get(layer.name, {})
+                for glyph in layer:
+                    name = glyph.name
+                    if name in glyph_set.contents and unchanged.get(name) == (
+                        hashes[layer.name][name]
+                    ):
+                        # Unless the file was changed by hand since
+                        glif = os.path.join(layer_directory, glyph_set.contents[name])
+                        try:
+                            if os.stat(glif).st_mtime_ns <= lib_mtime:
+                                continue
+                        except OSError:
+                            pass
+                    glyph_set.writeGlyph(
+                        name, glyphObject=glyph, drawPointsFunc=glyph.drawPoints
+                    )
+                    changed = True
+                glyph_set.writeContents()
+                glyph_set.writeLayerInfo(layer)
+            writer.writeLayerContents(ufo.layers.layerOrder)
+
+            for file_name in set(writer.getDataDirectoryListing()).difference(
+                ufo.data.keys()
+            ):
+                writer.removeData(file_name)
+            for file_name, data in ufo.data.items():
+                writer.writeData(file_name, data)
+            for file_name in set(writer.getImageDirectoryListing()).difference(
+                ufo.images.keys()
+            ):
+                writer.removeImage(file_name)
+            for file_name, data in ufo.images.items():
+                writer.writeImage(file_name, data)
+
+            # Last, so that .glif files changed after it can be told apart
+            writer.writeLib(ufo.lib)
+        if changed:
+            # The lib may not have changed, but it must not be older than the
+            # .glif files just written
+            os.utime(os.path.join(path, "lib.plist"))
+            writer.setModificationTime()
+    finally:
+        del ufo.lib[UFO_GLYPH_HASHES_KEY]
+
+
+def _glyph_hash(glyph):
+    # A glyph pickles to the same bytes when it has the same contents; if it
+    # ever did not, the glyph would just be written again.
+    return hashlib.blake2b(pickle.dumps(glyph, 4), digest_size=16).hexdigest()
+
+
+def _read_glyph_hashes(path, key):
+    """Return the glyph hashes stored in the UFO at path, if there is one."""
+    try:
+        with open(os.path.join(path, "metainfo.plist"), "rb") as f:
+            if plistlib.load(f).get("formatVersion") != 3:
+                return None
+        with open(os.path.join(path, "lib.plist"), "rb") as f:
+            hashes = plistlib.load(f).get(key)
+    except Exception:
+        return None
+    if not isinstance(hashes, dict):
+        return None
+    return hashes
+
+
 def ufo_create_background_layer_for_all_glyphs(ufo_font):
     """Create a background layer for all glyphs in ufo_font if not present to
     reduce roundtrip differences."""
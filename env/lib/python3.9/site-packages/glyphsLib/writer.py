@@ -15,8 +15,10 @@
 
 import glyphsLib.classes
 from glyphsLib.types import floatToString5
+import functools
 import logging
 import datetime
+import re
 from collections import OrderedDict
 from io import StringIO
 
@@ -31,6 +33,9 @@ from io import StringIO
 
 logger = logging.getLogger(__name__)
 
+# Writer.write hands its output to the file in chunks of about this many pieces
+CHUNK_SIZE = 1 << 14
+
 
 class Writer:
     def __init__(self, fp, format_version=2):
@@ -47,18 +52,34 @@ class Writer:
 
             self.file = codecs.getwriter("utf-8")(fp)
         self.format_version = format_version
+        # Where the output goes; see write
+        self._write = self.file.write
+        self._chunks = None
 
     def write(self, rootObject):
-        self.writeDict(rootObject)
-        self.file.write("\n")
+        # The output is made of very many small pieces. Rather than passing
+        # each to the file, collect them and pass them on in large chunks.
+        self._chunks = []
+        self._write = self._chunks.append
+        try:
+            self.writeDict(rootObject)
+            self._write("\n")
+        finally:
+            self._flush()
+            self._write = self.file.write
+            self._chunks = None
+
+    def _flush(self):
+        self.file.write("".join(self._chunks))
+        self._chunks.clear()
 
     def writeDict(self, dictValue):
         if hasattr(dictValue, "_serialize_to_plist"):
-            self.file.write("{\n")
+            self._write("{\n")
             dictValue._serialize_to_plist(self)
-            self.file.write("}")
+            self._write("}")
             return
-        self.file.write("{\n")
+        self._write("{\n")
         keys = dictValue.keys()
         if not isinstance(dictValue, OrderedDict):
             keys = sorted(keys)
@@ -74,10 +95,10 @@ class Writer:
             if value is None:
                 continue
             self.writeKeyValue(key, value)
-        self.file.write("}")
+        self._write("}")
 
     def writeArray(self, arrayValue):
-        self.file.write("(\n")
+        self._write("(\n")
         idx = 0
         length = len(arrayValue)
         if hasattr(arrayValue, "plistArray"):
@@ -85,26 +106,28 @@ class Writer:
         for value in arrayValue:
             self.writeValue(value)
             if idx < length - 1:
-                self.file.write(",\n")
+                self._write(",\n")
             else:
-                self.file.write("\n")
+                self._write("\n")
             idx += 1
-        self.file.write(")")
+            if self._chunks is not None and len(self._chunks) > CHUNK_SIZE:
+                self._flush()
+        self._write(")")
 
     def writeUserData(self, userDataValue):
-        self.file.write("{\n")
+        self._write("{\n")
         keys = sorted(userDataValue.keys())
         for key in keys:
             value = userDataValue[key]
             self.writeKey(key)
             self.writeValue(value, key)
-            self.file.write(";\n")
-        self.file.write("}")
+            self._write(";\n")
+        self._write("}")
 
     def writeKeyValue(self, key, value):
         self.writeKey(key)
         self.writeValue(value, key)
-        self.file.write(";\n")
+        self._write(";\n")
 
     def writeObjectKeyValue(self, d, key, condition=None, keyName=None, default=None):
         value = getattr(d, key)
@@ -118,25 +141,25 @@ class Writer:
         if condition:
             self.writeKey(keyName or key)
             self.writeValue(value, key)
-            self.file.write(";\n")
+            self._write(";\n")
 
     def writeValue(self, value, forKey=None):
         if hasattr(value, "plistValue"):
             value = value.plistValue(format_version=self.format_version)
             if value is not None:
-                self.file.write(value)
+                self._write(value)
         elif forKey in ["color", "strokeColor"] and hasattr(value, "__iter__"):
             # We have to write color tuples on one line or Glyphs 2.4.x
             # misreads it.
             if self.format_version == 2:
-                self.file.write(str(tuple(value)))
+                self._write(str(tuple(value)))
             else:
-                self.file.write("(")
+                self._write("(")
                 for ix, v in enumerate(value):
-                    self.file.write(str(v))
+                    self._write(str(v))
                     if ix < len(value) - 1:
-                        self.file.write(",")
-                self.file.write(")")
+                        self._write(",")
+                self._write(")")
         elif isinstance(value, (list, glyphsLib.classes.Proxy)):
             if isinstance(value, glyphsLib.classes.UserDataProxy):
                 self.writeUserData(value)
@@ -145,37 +168,43 @@ class Writer:
         elif isinstance(value, (dict, OrderedDict, glyphsLib.classes.GSBase)):
             self.writeDict(value)
         elif type(value) == float:
-            self.file.write(floatToString5(value))
+            self._write(floatToString5(value))
         elif type(value) == int:
-            self.file.write(str(value))
+            self._write(str(value))
         elif type(value) == bytes:
-            self.file.write("<" + value.hex() + ">")
+            self._write("<" + value.hex() + ">")
         elif type(value) == bool:
             if value:
-                self.file.write("1")
+                self._write("1")
             else:
-                self.file.write("0")
+                self._write("0")
         elif type(value) == datetime.datetime:
-            self.file.write('"%s +0000"' % str(value))
+            self._write('"%s +0000"' % str(value))
         else:
             value = self.escape_string(str(value), forKey)
-            self.file.write(value)
+            self._write(value)
 
     def writeKey(self, key):
-        key = self.escape_string(key, None)
-        self.file.write("%s = " % key)
+        self._write(_key_prefix(key, self.format_version < 3))
 
     def escape_string(self, string, forKey):
-        if _needs_quotes(string):
-            if self.format_version < 3 and forKey != "unicode":
-                string = string.replace("\\", "\\\\")
-                string = string.replace('"', '\\"')
-                string = string.replace("\n", "\\012")
-            else:
-                string = string.replace("\\", "\\\\")
-                string = string.replace('"', '\\"')
-            string = '"%s"' % string
-        return string
+        return _escape_string(string, self.format_version < 3 and forKey != "unicode")
+
+
+def _escape_string(string, escape_newlines):
+    if _needs_quotes(string):
+        string = string.replace("\\", "\\\\")
+        string = string.replace('"', '\\"')
+        if escape_newlines:
+            string = string.replace("\n", "\\012")
+        string = '"%s"' % string
+    return string
+
+
+# The keys are few, but written again and again
+@functools.lru_cache(maxsize=1024)
+def _key_prefix(key, escape_newlines):
+    return _escape_string(key, escape_newlines) + " = "
 
 
 def dump(obj, fp):
@@ -338,15 +367,20 @@ NSPropertyListNameSet = (
 )
 
 
+# A string of the characters in NSPropertyListNameSet only
+_NAME_RE = re.compile(
+    "[%s]+"
+    % re.escape("".join(chr(d) for d, ok in enumerate(NSPropertyListNameSet) if ok))
+)
+
+
 def _needs_quotes(string):
     if len(string) == 0:
         return True
 
     # Does it need quotes because of special characters?
-    for c in string:
-        d = ord(c)
-        if d >= 128 or not NSPropertyListNameSet[d]:
-            return True
+    if _NAME_RE.fullmatch(string) is None:
+        return True
 
     # Does it need quotes because it could be confused with a number?
     try:
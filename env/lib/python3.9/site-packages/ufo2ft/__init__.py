@@ -51,6 +51,12 @@ def compileTTF(ufo, **kwargs):
     *allQuadratic* (bool) specifies whether to convert all curves to quadratic - True
     by default, builds traditional glyf v0 table. If False, quadratic curves or cubic
     curves are generated depending on which has fewer points; a glyf v1 is generated.
+
+    *sharedFeatures* (Optional[dict]) lets this call share its OpenType layout
+    tables with a compileOTF call for the same UFO; see compileOTF.
+
+    *filterJobs* (int) is the number of processes with which to run the filters
+    which work on each glyph on its own, such as removing overlaps (default: 1).
     """
     return TTFCompiler(**kwargs).compile(ufo)
 
@@ -113,6 +119,13 @@ def compileOTF(ufo, **kwargs):
       By default "cffsubr" is used for both CFF 1 and CFF 2.
       NOTE: cffsubr is required for subroutinizing CFF2 tables, as compreffor
       currently doesn't support it.
+
+    *sharedFeatures* (Optional[dict]) lets this call share its OpenType layout
+      tables with a compileTTF call for the same UFO: pass the same (initially
+      empty) dict to both, and the features are compiled only once.
+
+    *filterJobs* (int) is the number of processes with which to run the filters
+      which work on each glyph on its own, such as removing overlaps (default: 1).
     """
     return OTFCompiler(**kwargs).compile(ufo)
 
@@ -138,6 +151,9 @@ def compileInterpolatableTTFs(ufos, **kwargs):
     all UFO's "public.skipExportGlyphs" lib keys will be used. If they don't
     exist, all glyphs are exported. UFO groups and kerning will be pruned of
     skipped glyphs.
+
+    *masterJobs* (int) is the number of processes with which to compile the
+      masters, once they have been preprocessed together (default: 1).
     """
     return InterpolatableTTFCompiler(**kwargs).compile(ufos)
 
@@ -161,6 +177,9 @@ def compileVariableTTFs(designSpaceDoc, **kwargs):
       by default, builds traditional glyf v0 table. If False, quadratic curves or cubic
       curves are generated depending on which has fewer points; a glyf v1 is generated.
 
+    *masterJobs* (int) is the number of processes with which to compile the
+      masters, once they have been preprocessed together (default: 1).
+
     The rest of the arguments works the same as in the other compile functions.
 
     Returns a dictionary that maps each variable font filename to a new variable
@@ -284,6 +303,9 @@ def compileVariableCFF2s(designSpaceDoc, **kwargs):
       by default, builds traditional glyf v0 table. If False, quadratic curves or cubic
       curves are generated depending on which has fewer points; a glyf v1 is generated.
 
+    *masterJobs* (int) is the number of processes with which to compile the
+      masters, once they have been preprocessed together (default: 1).
+
     The rest of the arguments works the same as in the other compile functions.
 
     Returns a dictionary that maps each variable font filename to a new variable
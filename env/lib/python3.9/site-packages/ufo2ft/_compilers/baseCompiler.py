@@ -1,4 +1,5 @@
 import logging
+import re
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Callable, Optional, Type
@@ -6,6 +7,7 @@ from typing import Callable, Optional, Type
 from fontTools import varLib
 from fontTools.designspaceLib.split import splitInterpolable, splitVariableFonts
 from fontTools.misc.loggingTools import Timer
+from fontTools.ttLib import newTable
 from fontTools.otlLib.optimize.gpos import COMPRESSION_LEVEL as GPOS_COMPRESSION_LEVEL
 
 from ufo2ft.constants import MTI_FEATURES_PREFIX
@@ -21,13 +23,32 @@ from ufo2ft.postProcessor import PostProcessor
 from ufo2ft.util import (
     _LazyFontName,
     _notdefGlyphFallback,
+    canForkWorkers,
     colrClipBoxQuantization,
     ensure_all_sources_have_names,
+    forkMap,
     getDefaultMasterFont,
     location_to_string,
     prune_unknown_kwargs,
 )
 
+# The tables which compilers sharing their features copy from one another.
+# Feature files can also set values in other tables (OS/2, head, name...),
+# in which case nothing is shared.
+SHARED_FEATURE_TABLES = ("GDEF", "GSUB", "GPOS", "BASE")
+_OTHER_TABLE_BLOCK = re.compile(r"\btable\s+(?!(?:GDEF|BASE)\b)\S+\s*\{")
+_INCLUDE = re.compile(r"\binclude\s*\(")
+
+
+def _canShareFeatures(featureCompiler):
+    features = getattr(featureCompiler, "features", None)
+    if not isinstance(features, str):
+        return False
+    if _INCLUDE.search(features):
+        # Without feature writers, includes are not resolved in the text
+        return False
+    return not _OTHER_TABLE_BLOCK.search(features)
+
 
 @dataclass
 class BaseCompiler:
@@ -50,6 +71,13 @@ class BaseCompiler:
     feaIncludeDir: Optional[str] = None
     skipFeatureCompilation: bool = False
     ftConfig: dict = field(default_factory=dict)
+    # Compilers which are given the same dict here, and compile the same UFO
+    # with the same feature options, build its OpenType layout tables only
+    # once: the first one stores them, and the others copy them into their
+    # fonts, provided the glyph order is the same.
+    sharedFeatures: Optional[dict] = None
+    # The number of processes to run per-glyph filters with
+    filterJobs: int = 1
 
     def __post_init__(self):
         self.logger = logging.getLogger("ufo2ft")
@@ -129,6 +157,19 @@ class BaseCompiler:
         in which to dump the text content of the feature file, useful for debugging
         auto-generated OpenType features like kern, mark, mkmk etc.
         """
+        shared = self.sharedFeatures
+        if ttFont is None or self.debugFeatureFile:
+            shared = None
+        if shared and shared["glyphOrder"] == ttFont.getGlyphOrder():
+            with self.timer("copy shared OpenType layout tables"):
+                for tag, data in shared["tables"].items():
+                    table = newTable(tag)
+                    table.decompile(data, ttFont)
+                    ttFont[tag] = table
+                if shared["usMaxContext"] is not None and "OS/2" in ttFont:
+                    ttFont["OS/2"].usMaxContext = shared["usMaxContext"]
+            return ttFont
+
         if self.featureCompilerClass is None:
             if any(
                 fn.startswith(MTI_FEATURES_PREFIX) and fn.endswith(".mti")
@@ -148,6 +189,18 @@ class BaseCompiler:
             if hasattr(featureCompiler, "writeFeatures"):
                 featureCompiler.writeFeatures(self.debugFeatureFile)
 
+        if shared is not None and not shared and _canShareFeatures(featureCompiler):
+            shared["glyphOrder"] = otFont.getGlyphOrder()
+            shared["tables"] = {
+                tag: otFont.getTableData(tag)
+                for tag in SHARED_FEATURE_TABLES
+                if tag in otFont
+            }
+            # feaLib also sets this from the layout tables
+            shared["usMaxContext"] = (
+                otFont["OS/2"].usMaxContext if "OS/2" in otFont else None
+            )
+
         return otFont
 
 
@@ -180,6 +233,8 @@ class BaseInterpolatableCompiler(BaseCompiler):
 
     extraSubstitutions: Optional[dict] = None
     variableFontNames: Optional[list] = None
+    # The number of processes to compile the masters with
+    masterJobs: int = 1
 
     # used to generate glyph instances on-the-fly (e.g. decomposing sparse composites)
     instantiator: Optional[Instantiator] = field(init=False, default=None)
@@ -193,15 +248,44 @@ class BaseInterpolatableCompiler(BaseCompiler):
         assert len(ufos) == len(self.layerNames)
         self.glyphSets = self.preprocess(ufos)
 
+        if self.masterJobs > 1 and len(ufos) > 1 and self._can_compile_in_parallel():
+            yield from self._compile_in_parallel(ufos)
+            return
+        for i, ufo in enumerate(ufos):
+            yield self._compile_master(ufo, i)
+
+    def _compile_master(self, ufo, index):
         default_idx = (
             self.instantiator.default_source_idx if self.instantiator else None
         )
-        for i, (ufo, glyphSet, layerName) in enumerate(
-            zip(ufos, self.glyphSets, self.layerNames)
+        if default_idx is not None:
+            self.compilingVFDefaultSource = index == default_idx
+        return self.compile_one(ufo, self.glyphSets[index], self.layerNames[index])
+
+    def _can_compile_in_parallel(self):
+        if self.debugFeatureFile:
+            # The features of all the masters are written to the one file
+            return False
+        return canForkWorkers("Compiling masters in parallel", self.logger)
+
+    def _compile_in_parallel(self, ufos):
+        """Compile the masters with a pool of `masterJobs` forked processes,
+        and return their fonts in order.
+
+        The processes inherit the compiler, with the glyph sets which have been
+        preprocessed once for all the masters, and compile one master each.
+        """
+        jobs = min(self.masterJobs, len(ufos))
+        self.logger.info("Compiling %d masters with %d processes", len(ufos), jobs)
+        fonts = []
+        for glyphSet, (font, addedGlyphs) in zip(
+            self.glyphSets,
+            forkMap(_compile_master, (self, ufos), range(len(ufos)), jobs),
         ):
-            if default_idx is not None:
-                self.compilingVFDefaultSource = i == default_idx
-            yield self.compile_one(ufo, glyphSet, layerName)
+            # such as a .notdef made by the outline compiler
+            glyphSet.update(addedGlyphs)
+            fonts.append(font)
+        return fonts
 
     def compile_one(self, ufo, glyphSet, layerName):
         fontName = _LazyFontName(ufo)
@@ -469,3 +553,14 @@ class BaseInterpolatableCompiler(BaseCompiler):
 
         # Add back feature variations, as the code above would overwrite them.
         varLib.addGSUBFeatureVariations(ttFont, designSpaceDoc)
+
+
+def _compile_master(work, index):
+    compiler, ufos = work
+    glyphSet = compiler.glyphSets[index]
+    glyphNames = set(glyphSet.keys())
+    font = compiler._compile_master(ufos[index], index)
+    addedGlyphs = {
+        name: glyph for name, glyph in glyphSet.items() if name not in glyphNames
+    }
+    return font, addedGlyphs
@@ -11,6 +11,8 @@ from ufo2ft.util import (
     _getNewGlyphFactory,
     _GlyphSet,
     _LazyFontName,
+    canForkWorkers,
+    forkMap,
     getMaxComponentDepth,
     zip_strict,
 )
@@ -29,6 +31,10 @@ logger = logging.getLogger("ufo2ft.filters")
 # can selectively configure
 timing_logger = logging.getLogger("ufo2ft.timer")
 
+# When filtering glyphs in parallel, the number of chunks of glyphs given to
+# each job: more chunks spread the work more evenly, fewer cost less overhead
+PARALLEL_CHUNKS_PER_JOB = 4
+
 
 class BaseFilter:
     # tuple of strings listing the names of required positional arguments
@@ -43,6 +49,10 @@ class BaseFilter:
     # filters
     _pre = False
 
+    # True if filtering a glyph only reads and modifies that glyph (and the
+    # context), so that glyphs can be filtered in parallel; see __call__
+    _perGlyph = False
+
     def __init__(self, *args, **kwargs):
         self.options = options = SimpleNamespace()
 
@@ -185,7 +195,7 @@ class BaseFilter:
     def name(self):
         return self.__class__.__name__
 
-    def __call__(self, font, glyphSet=None):
+    def __call__(self, font, glyphSet=None, *, jobs=1):
         """Run this filter on all the included glyphs.
         Return the set of glyph names that were modified, if any.
 
@@ -193,6 +203,11 @@ class BaseFilter:
         the glyphs contained therein (which may be copies).
         Otherwise, run the filter in-place on the font's default
         glyph set.
+
+        If `jobs` is more than 1 and the filter is per-glyph (`_perGlyph`),
+        the glyphs are filtered by that many processes, with the same
+        result as filtering them one after another. This needs ufoLib2
+        glyphs and the 'fork' start method; otherwise one process is used.
         """
         fontName = _LazyFontName(font)
         if glyphSet is not None and getattr(glyphSet, "name", None):
@@ -218,12 +233,15 @@ class BaseFilter:
         )
 
         with Timer() as t:
-            for glyphName in orderedGlyphs:
-                if glyphName in modified:
-                    continue
-                glyph = glyphSet[glyphName]
-                if include(glyph) and filter_(glyph):
-                    modified.add(glyphName)
+            if jobs > 1 and self._perGlyph and self._can_run_in_parallel(glyphSet):
+                self._filter_in_parallel(glyphSet, orderedGlyphs, jobs)
+            else:
+                for glyphName in orderedGlyphs:
+                    if glyphName in modified:
+                        continue
+                    glyph = glyphSet[glyphName]
+                    if include(glyph) and filter_(glyph):
+                        modified.add(glyphName)
 
         num = len(modified)
         if num > 0:
@@ -236,6 +254,47 @@ class BaseFilter:
             )
         return modified
 
+    def _can_run_in_parallel(self, glyphSet):
+        try:
+            from ufoLib2.objects import Glyph
+        except ImportError:
+            Glyph = None
+        if Glyph is None or not all(isinstance(g, Glyph) for g in glyphSet.values()):
+            # Other glyph objects may not survive being sent between processes
+            logger.warning(
+                "Running %s in parallel needs ufoLib2 glyphs; using one process.",
+                self.name,
+            )
+            return False
+        return canForkWorkers(f"Running {self.name} in parallel", logger)
+
+    def _filter_in_parallel(self, glyphSet, glyphNames, jobs):
+        """Filter the included glyphs among `glyphNames` with a pool of
+        `jobs` forked processes, adding the modified ones to the context.
+
+        Each worker filters a chunk of the glyphs and sends back those it
+        modified, whose contents then replace those of the glyphs in
+        `glyphSet` (which may be the font's own), in the order of the chunks.
+        """
+        include = self.include
+        modified = self.context.modified
+        glyphNames = [
+            glyphName
+            for glyphName in glyphNames
+            if glyphName not in modified and include(glyphSet[glyphName])
+        ]
+        if not glyphNames:
+            return
+        chunkSize = -(-len(glyphNames) // (jobs * PARALLEL_CHUNKS_PER_JOB))
+        chunks = [
+            glyphNames[i : i + chunkSize] for i in range(0, len(glyphNames), chunkSize)
+        ]
+        for glyphs in forkMap(_filter_chunk, (self, glyphSet), chunks, jobs):
+            for glyph in glyphs:
+                # the unpickled glyph is not shared, so take its state
+                glyphSet[glyph.name].__setstate__(glyph.__getstate__())
+                modified.add(glyph.name)
+
     @classmethod
     def getInterpolatableFilterClass(cls) -> BaseIFilter | None:
         """Return interpolatable filter class if one is found in the same module.
@@ -254,6 +313,15 @@ class BaseFilter:
         return getattr(module, ifilter_name, None)
 
 
+def _filter_chunk(work, glyphNames):
+    filter_, glyphSet = work
+    return [
+        glyphSet[glyphName]
+        for glyphName in glyphNames
+        if filter_.filter(glyphSet[glyphName])
+    ]
+
+
 HashableLocation: TypeAlias = FrozenSet[Tuple[str, float]]
 
 
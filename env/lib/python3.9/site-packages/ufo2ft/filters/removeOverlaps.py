@@ -1,12 +1,64 @@
+import contextlib
+import hashlib
 import logging
+import os
+import pickle
+from collections import OrderedDict
 from enum import Enum
 
+from fontTools.pens.hashPointPen import HashPointPen
+from fontTools.pens.recordingPen import RecordingPen, RecordingPointPen
+
 from ufo2ft.filters import BaseFilter
 
 logger = logging.getLogger(__name__)
 
+# Bump this when changing how the cached outlines are keyed or stored
+CACHE_VERSION = 1
+
+# If this environment variable names a directory, the outlines are also kept
+# there, so that other processes and later builds can reuse them.
+CACHE_DIR_VARIABLE = "UFO2FT_CACHE_DIR"
+
+# The maximum number of outlines kept in memory, least recently used first out
+MEMORY_CACHE_SIZE = 1 << 15
+
+# Outlines with their overlaps removed, by cache key
+_memoryCache = OrderedDict()
+
+
+class _ContoursHashPen(HashPointPen):
+    """A HashPointPen for the input of an overlap backend.
+
+    Unlike HashPointPen, coordinates are kept at full precision, and the
+    smooth flags and point names are included, as the backends carry them
+    over to the unioned contours.
+    """
+
+    def addPoint(
+        self,
+        pt,
+        segmentType=None,
+        smooth=False,
+        name=None,
+        identifier=None,
+        **kwargs,
+    ):
+        self.data.append(
+            f"{segmentType and segmentType[0] or 'o'}{pt[0]!r},{pt[1]!r}"
+            f"{'s' if smooth else ''}{'' if name is None else ascii(name)}"
+        )
+
 
 class RemoveOverlapsFilter(BaseFilter):
+    """Remove the overlaps between the contours of each glyph.
+
+    As the same contours come up again and again (in the TTF and OTF of the
+    same font, or the same masters in several builds), unioned contours are
+    cached by a hash of the contours, the backend and its version: in memory,
+    and on disk if the UFO2FT_CACHE_DIR environment variable is set.
+    """
+
     class Backend(Enum):
         BOOLEAN_OPERATIONS = "booleanOperations"
         SKIA_PATHOPS = "pathops"
@@ -14,38 +66,117 @@ class RemoveOverlapsFilter(BaseFilter):
     # use booleanOperations by default, unless pathops specified as backend
     _kwargs = {"backend": Backend.BOOLEAN_OPERATIONS}
 
+    _perGlyph = True
+
     def start(self):
         self.options.backend = self.Backend(self.options.backend)
 
         if self.options.backend is self.Backend.BOOLEAN_OPERATIONS:
+            import booleanOperations
             from booleanOperations import BooleanOperationsError, union
 
             self.union = union
             self.Error = BooleanOperationsError
             self.penGetter = "getPointPen"
+            self.recordingPen = RecordingPointPen
+            version = booleanOperations.__version__
 
             logger.debug("using booleanOperations as RemoveOverlapsFilter backend")
         elif self.options.backend is self.Backend.SKIA_PATHOPS:
+            import pathops
             from pathops import PathOpsError, union
 
             self.union = union
             self.Error = PathOpsError
             self.penGetter = "getPen"
+            self.recordingPen = RecordingPen
+            version = pathops.__version__
 
             logger.debug("using skia-pathops as RemoveOverlapsFilter backend")
         else:
             raise AssertionError(self.options.backend)
 
+        self.cacheTag = f"{CACHE_VERSION}\n{self.options.backend.value}=={version}\n"
+
     def filter(self, glyph):
         if not len(glyph):
             return False
 
         contours = list(glyph)
+        key = self.cacheKey(contours)
+        recording = self.recordingPen()
+        value = _getCached(key)
+        if value is None:
+            try:
+                self.union(contours, recording)
+            except self.Error:
+                logger.error("Failed to remove overlaps for %s", glyph.name)
+                raise
+            _setCached(key, recording.value)
+        else:
+            recording.value = value
         glyph.clearContours()
-        pen = getattr(glyph, self.penGetter)()
-        try:
-            self.union(contours, pen)
-        except self.Error:
-            logger.error("Failed to remove overlaps for %s", glyph.name)
-            raise
+        recording.replay(getattr(glyph, self.penGetter)())
         return True
+
+    def cacheKey(self, contours):
+        """Return the key of the unioned contours in the cache."""
+        hashPen = _ContoursHashPen()
+        for contour in contours:
+            contour.drawPoints(hashPen)
+        return hashlib.sha256((self.cacheTag + hashPen.hash).encode()).hexdigest()
+
+
+def _cacheFile(key):
+    directory = os.environ.get(CACHE_DIR_VARIABLE)
+    if not directory:
+        return None
+    return os.path.join(directory, "overlaps", key[:2], key[2:])
+
+
+def _getCached(key):
+    # Return the recording of the unioned contours for the key, or None
+    try:
+        _memoryCache.move_to_end(key)
+    except KeyError:
+        pass
+    else:
+        return _memoryCache[key]
+    cacheFile = _cacheFile(key)
+    if cacheFile is None:
+        return None
+    try:
+        with open(cacheFile, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A broken entry is overwritten with a good one
+        logger.debug("Ignoring cache file %s: %s", cacheFile, e)
+        return None
+    _remember(key, value)
+    return value
+
+
+def _setCached(key, value):
+    _remember(key, value)
+    cacheFile = _cacheFile(key)
+    if cacheFile is None:
+        return
+    # Replace the entry in one go, as another process may be reading it
+    temporary = f"{cacheFile}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cacheFile), exist_ok=True)
+        with open(temporary, "wb") as f:
+            pickle.dump(value, f, -1)
+        os.replace(temporary, cacheFile)
+    except OSError as e:
+        logger.debug("Could not write cache file %s: %s", cacheFile, e)
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+
+
+def _remember(key, value):
+    _memoryCache[key] = value
+    if len(_memoryCache) > MEMORY_CACHE_SIZE:
+        _memoryCache.popitem(last=False)
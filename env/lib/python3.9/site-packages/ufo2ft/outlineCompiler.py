@@ -1,5 +1,6 @@
 import logging
 import math
+from array import array
 from collections import Counter, namedtuple
 from io import BytesIO
 from types import SimpleNamespace
@@ -22,7 +23,14 @@ from fontTools.pens.t2CharStringPen import T2CharStringPen
 from fontTools.pens.ttGlyphPen import TTGlyphPointPen
 from fontTools.ttLib import TTFont, newTable
 from fontTools.ttLib.standardGlyphOrder import standardGlyphOrder
-from fontTools.ttLib.tables._g_l_y_f import Glyph, flagCubic
+from fontTools.ttLib.tables import ttProgram
+from fontTools.ttLib.tables._g_l_y_f import (
+    Glyph,
+    GlyphCoordinates,
+    dropImpliedOnCurvePoints,
+    flagCubic,
+    flagOnCurve,
+)
 from fontTools.ttLib.tables._h_e_a_d import mac_epoch_diff
 from fontTools.ttLib.tables.O_S_2f_2 import Panose
 
@@ -64,6 +72,14 @@ logger = logging.getLogger(__name__)
 BoundingBox = namedtuple("BoundingBox", ["xMin", "yMin", "xMax", "yMax"])
 EMPTY_BOUNDING_BOX = BoundingBox(0, 0, 0, 0)
 
+# The TrueType flags of the points of quadratic contours, by point type
+_QUADRATIC_POINT_FLAGS = {
+    None: 0,
+    "move": flagOnCurve,
+    "line": flagOnCurve,
+    "qcurve": flagOnCurve,
+}
+
 
 def _isNonBMP(s):
     for c in s:
@@ -1696,6 +1712,10 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
         glyphDataFormat = self.glyphDataFormat
         for name in self.glyphOrder:
             glyph = allGlyphs[name]
+            ttGlyph = _compileQuadraticGlyph(glyph, self.dropImpliedOnCurves, round)
+            if ttGlyph is not None:
+                ttGlyphs[name] = ttGlyph
+                continue
             pen = TTGlyphPointPen(allGlyphs)
             try:
                 glyph.drawPoints(pen)
@@ -1710,7 +1730,7 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
                 if (
                     glyphDataFormat == 0
                     and ttGlyph.numberOfContours > 0
-                    and any(f & flagCubic for f in ttGlyph.flags)
+                    and max(ttGlyph.flags) & flagCubic
                 ):
                     raise ValueError(
                         f"{name!r} has cubic Bezier curves, but glyphDataFormat=0; "
@@ -1731,7 +1751,9 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
         glyphBoxes = {}
         ttGlyphs = self.getCompiledGlyphs()
         for glyphName, glyph in ttGlyphs.items():
-            glyph.recalcBounds(ttGlyphs)
+            if not hasattr(glyph, "xMin"):
+                # the bounds of quadratic glyphs are set when compiling them
+                glyph.recalcBounds(ttGlyphs)
             bounds = BoundingBox(glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax)
             if bounds == EMPTY_BOUNDING_BOX:
                 bounds = None
@@ -1846,6 +1868,64 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
         self._autoUseMyMetrics = bool(value)
 
 
+def _compileQuadraticGlyph(glyph, dropImpliedOnCurves=False, round=otRound):
+    """Return a TrueType glyph made straight from the points of a ufoLib2
+    glyph without components or cubic curves, with its bounds set, or None
+    if the glyph is to be drawn with a TTGlyphPointPen.
+
+    The glyph is the same as the one the pen makes, without the calls for
+    every point, and the bounds are computed along with the coordinates.
+    """
+    contours = getattr(glyph, "contours", None)
+    if contours is None or glyph.components:
+        return None
+    # otRound is inlined, unless the implied on-curve points are to be dropped
+    # from the coordinates before rounding them
+    roundNow = round is otRound and not dropImpliedOnCurves
+    floor = math.floor
+    coordinates = GlyphCoordinates()
+    values = coordinates.array
+    flags = array("B")
+    endPts = []
+    try:
+        for contour in contours:
+            points = contour.points
+            if not points:
+                continue
+            flags.extend([_QUADRATIC_POINT_FLAGS[point.type] for point in points])
+            if roundNow:
+                values.extend(
+                    [
+                        v
+                        for point in points
+                        for v in (floor(point.x + 0.5), floor(point.y + 0.5))
+                    ]
+                )
+            else:
+                values.extend([v for point in points for v in (point.x, point.y)])
+            endPts.append(len(flags) - 1)
+    except (AttributeError, KeyError):
+        # not a ufoLib2 glyph, or a cubic curve
+        return None
+
+    ttGlyph = Glyph()
+    ttGlyph.coordinates = coordinates
+    ttGlyph.endPtsOfContours = endPts
+    ttGlyph.flags = flags
+    ttGlyph.numberOfContours = len(endPts)
+    ttGlyph.program = ttProgram.Program()
+    ttGlyph.program.fromBytecode(b"")
+    if dropImpliedOnCurves:
+        dropImpliedOnCurvePoints(ttGlyph)
+    coordinates = ttGlyph.coordinates
+    if not roundNow:
+        coordinates.toInt(round=round)
+    ttGlyph.xMin, ttGlyph.yMin, ttGlyph.xMax, ttGlyph.yMax = (
+        coordinates.calcIntBounds()
+    )
+    return ttGlyph
+
+
 class StubGlyph:
     """
     This object will be used to create missing glyphs
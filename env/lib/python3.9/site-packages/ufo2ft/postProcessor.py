@@ -3,7 +3,8 @@ import logging
 import re
 from io import BytesIO
 
-from fontTools.ttLib import TTFont
+from fontTools.ttLib import TTFont, getTableClass
+from fontTools.ttLib.sfnt import SFNTWriter
 from fontTools.ttLib.standardGlyphOrder import standardGlyphOrder
 
 from ufo2ft.constants import (
@@ -21,6 +22,9 @@ class CFFVersion(enum.IntEnum):
     CFF2 = 2
 
 
+CFF_TABLE_TAGS = {CFFVersion.CFF: "CFF ", CFFVersion.CFF2: "CFF2"}
+
+
 class PostProcessor:
     """Does some post-processing operations on a compiled OpenType font, using
     info from the source UFO where necessary.
@@ -96,9 +100,17 @@ class PostProcessor:
           "compreffor". By default "cffsubr" is used for both CFF 1 and CFF 2.
           NOTE: compreffor currently doesn't support input fonts with CFF2 table.
         """
-        if self._get_cff_version(self.otf):
+        cffInputVersion = self._get_cff_version(self.otf)
+        if cffInputVersion:
             if not isinstance(optimizeCFF, bool):
                 optimizeCFF = optimizeCFF >= CFFOptimization.SUBROUTINIZE
+            if optimizeCFF:
+                # The subroutinizer saves the whole font for tx to read: compile
+                # the other tables now, so that they are not compiled again then
+                # or when the font is saved
+                self.otf = _reloadFont(
+                    self.otf, keep=("head", "post", CFF_TABLE_TAGS[cffInputVersion])
+                )
             self.process_cff(
                 optimizeCFF=optimizeCFF,
                 cffVersion=cffVersion,
@@ -162,7 +174,8 @@ class PostProcessor:
                 # After reloading, we can immediately set a new glyph order and update
                 # the tables (post or CFF) that stores the new postcript names; any
                 # other tables that get loaded subsequently will use the new glyph names.
-                self.otf = _reloadFont(self.otf)
+                # The tables which are renamed are kept as they are, uncompiled.
+                self.otf = _reloadFont(self.otf, keep=("head", "post", "CFF ", "CFF2"))
                 self._rename_glyphs_from_ufo()
 
         else:
@@ -175,7 +188,9 @@ class PostProcessor:
                 # setting the post format to 3.0, since other tables may still use
                 # the old glyph names.
                 self.set_post_table_format(self.otf, 3.0)
-                self.otf = _reloadFont(self.otf)
+                self.otf = _reloadFont(
+                    self.otf, keep=("head", "post"), glyphOrder=False
+                )
 
     def _rename_glyphs_from_ufo(self):
         """Rename glyphs using ufo.lib.public.postscriptNames in UFO."""
@@ -416,10 +431,47 @@ def _stripCharStringWidth(program):
     return result
 
 
-def _reloadFont(font: TTFont) -> TTFont:
-    """Recompile a font to arrive at the final internal layout."""
+def _reloadFont(font: TTFont, keep=(), glyphOrder=True) -> TTFont:
+    """Recompile a font to arrive at the final internal layout.
+
+    The tables listed in ``keep`` which are loaded are moved to the new font
+    as they are instead, uncompiled, as they are still to be changed. The
+    other tables are only compiled again if they are loaded from the new font,
+    so that saving it mostly writes out the data compiled here.
+
+    The glyph order is copied to the new font, unless ``glyphOrder`` is False,
+    in which case it is read back from the tables (e.g. after dropping glyph
+    names from the 'post' table).
+    """
+    kept = {tag for tag in keep if font.isLoaded(tag)}
+    compiled = {}
+
+    # compile the tables in the same order as TTFont.save, which compiles the
+    # tables that others depend on first
+    def compileTable(tag):
+        if tag in compiled or tag in kept:
+            return
+        for dependency in getTableClass(tag).dependencies:
+            if dependency in font:
+                compileTable(dependency)
+        compiled[tag] = font.getTableData(tag)
+
+    for tag in font.keys():
+        if tag != "GlyphOrder":
+            compileTable(tag)
+
     stream = BytesIO()
-    font.save(stream)
+    writer = SFNTWriter(stream, len(compiled), font.sfntVersion)
+    for tag, data in compiled.items():
+        writer[tag] = data
+    writer.close()
     stream.seek(0)
     # keep the same Config (constructor will make a copy)
-    return TTFont(stream, cfg=font.cfg)
+    reloaded = TTFont(stream, cfg=font.cfg)
+    reloaded.flavor = font.flavor
+    reloaded.flavorData = font.flavorData
+    for tag in sorted(kept):
+        reloaded[tag] = font[tag]
+    if glyphOrder:
+        reloaded.setGlyphOrder(font.getGlyphOrder())
+    return reloaded
@@ -75,6 +75,9 @@ class BasePreProcessor:
     insert additional filters before or after those already defined in the
     UFO lib, as opposed to discard/replace them which is the default behavior
     when ``...`` is absent.
+
+    Filters which work on each glyph on its own (such as removing overlaps)
+    are run by ``filterJobs`` processes, when it is more than 1.
     """
 
     def __init__(
@@ -84,11 +87,13 @@ class BasePreProcessor:
         layerName=None,
         skipExportGlyphs=None,
         filters=None,
+        filterJobs=1,
         **kwargs,
     ):
         self.ufo = ufo
         self.inplace = inplace
         self.layerName = layerName
+        self.filterJobs = filterJobs
         self.glyphSet = _GlyphSet.from_layer(
             ufo, layerName, copy=not inplace, skipExportGlyphs=skipExportGlyphs
         )
@@ -105,7 +110,10 @@ class BasePreProcessor:
         ufo = self.ufo
         glyphSet = self.glyphSet
         for func in self.preFilters + self.defaultFilters + self.postFilters:
-            func(ufo, glyphSet)
+            if self.filterJobs > 1 and getattr(func, "_perGlyph", False):
+                func(ufo, glyphSet, jobs=self.filterJobs)
+            else:
+                func(ufo, glyphSet)
         return glyphSet
 
 
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import importlib
 import logging
+import multiprocessing
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from functools import partial
 from inspect import currentframe, getfullargspec
@@ -826,6 +828,55 @@ def openFont(*args, ufo_module=None, **kwargs):
     return openFontFactory(ufo_module=ufo_module)(*args, **kwargs)
 
 
+def canForkWorkers(task, logger=logger):
+    """Return whether `task` (e.g. "Compiling masters in parallel") can use
+    forkMap in this process, or log a warning that it will use one process.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning(
+            "%s needs the 'fork' start method, which this platform does not "
+            "have; using one process.",
+            task,
+        )
+        return False
+    if multiprocessing.current_process().daemon:
+        # e.g. inside the worker pool of a build tool, as daemonic processes
+        # can't have children
+        logger.warning(
+            "%s can't be done in a daemonic process; using one process.", task
+        )
+        return False
+    return True
+
+
+# The function and work of forkMap, which the forked worker processes inherit.
+_forkedWork = None
+
+
+def forkMap(function, work, items, jobs, chunksize=1):
+    """Return the list of `function(work, item)` for each of `items`, called
+    in a pool of `jobs` forked processes.
+
+    The processes inherit `work` (and `function`) rather than receiving them
+    pickled, so only the items and the results are sent between processes.
+    """
+    global _forkedWork
+
+    _forkedWork = (function, work)
+    try:
+        with ProcessPoolExecutor(
+            jobs, mp_context=multiprocessing.get_context("fork")
+        ) as pool:
+            return list(pool.map(_callForkedWork, items, chunksize=chunksize))
+    finally:
+        _forkedWork = None
+
+
+def _callForkedWork(item):
+    function, work = _forkedWork
+    return function(work, item)
+
+
 # zip(strict=True) was added with Python 3.10, we provide a backport below
 # https://docs.python.org/3/library/functions.html#zip
 if sys.version_info[:2] < (3, 10):
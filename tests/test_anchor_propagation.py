@@ -0,0 +1,179 @@
+import logging
+
+import pytest
+import ufoLib2
+
+from glyphsLib.builder.anchor_propagation import to_ufo_propagate_font_anchors
+from glyphsLib.builder.constants import COMPONENT_INFO_KEY
+
+IDENTITY = (1, 0, 0, 1, 0, 0)
+
+
+class _Builder:
+    logger = logging.getLogger(__name__)
+
+
+def _glyph(ufo, name, anchors=(), components=(), box=None):
+    glyph = ufo.newGlyph(name)
+    for anchor_name, x, y in anchors:
+        glyph.appendAnchor({"name": anchor_name, "x": x, "y": y})
+    pen = glyph.getPointPen()
+    for base, transformation in components:
+        pen.addComponent(base, transformation)
+    if box:
+        xmin, ymin, xmax, ymax = box
+        pen = glyph.getPen()
+        pen.moveTo((xmin, ymin))
+        pen.lineTo((xmin, ymax))
+        pen.lineTo((xmax, ymax))
+        pen.lineTo((xmax, ymin))
+        pen.closePath()
+    return glyph
+
+
+def _anchors(glyph):
+    return [(a.name, a.x, a.y) for a in glyph.anchors]
+
+
+@pytest.fixture
+def ufo():
+    ufo = ufoLib2.Font()
+    _glyph(ufo, "a", [("top", 250, 500), ("bottom", 250, 0)], box=(0, 0, 500, 500))
+    _glyph(ufo, "f", [("top", 200, 700)], box=(0, 0, 400, 700))
+    _glyph(ufo, "i", [("top", 100, 600)], box=(0, 0, 200, 600))
+    _glyph(
+        ufo,
+        "acutecomb",
+        [("_top", 100, 500), ("top", 100, 700)],
+        box=(50, 550, 150, 650),
+    )
+    _glyph(
+        ufo,
+        "gravecomb",
+        [("_top", 80, 500), ("top", 80, 720)],
+        box=(30, 560, 130, 660),
+    )
+    _glyph(
+        ufo,
+        "tildecomb",
+        [("_top", 120, 500), ("top", 120, 690)],
+        box=(20, 540, 220, 620),
+    )
+    _glyph(
+        ufo,
+        "cedillacomb",
+        [("_bottom", 100, 0), ("bottom", 100, -200)],
+        box=(60, -180, 140, 0),
+    )
+    return ufo
+
+
+def test_marks_on_a_base(ufo):
+    _glyph(
+        ufo,
+        "aacute",
+        components=[("a", IDENTITY), ("acutecomb", (1, 0, 0, 1, 150, 0))],
+    )
+    _glyph(
+        ufo,
+        "acedilla",
+        components=[("a", IDENTITY), ("cedillacomb", (1, 0, 0, 1, 150, 0))],
+    )
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["aacute"]) == [("bottom", 250, 0), ("top", 250, 700)]
+    assert _anchors(ufo["acedilla"]) == [("bottom", 250, -200), ("top", 250, 500)]
+
+
+def test_stacked_marks(ufo):
+    _glyph(
+        ufo,
+        "agrave_acute",
+        components=[
+            ("a", IDENTITY),
+            ("gravecomb", (1, 0, 0, 1, 170, 0)),
+            ("acutecomb", (1, 0, 0, 1, 150, 220)),
+        ],
+    )
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["agrave_acute"]) == [("bottom", 250, 0), ("top", 250, 920)]
+
+
+def test_ligature_of_marks(ufo):
+    # The lowest mark becomes the base
+    _glyph(
+        ufo,
+        "acutecomb_tildecomb",
+        components=[("tildecomb", (1, 0, 0, 1, 0, 200)), ("acutecomb", IDENTITY)],
+    )
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["acutecomb_tildecomb"]) == [
+        ("_top", 100, 500),
+        ("top", 120, 890),
+    ]
+
+
+def test_ligature_with_mark_on_component_anchor(ufo):
+    _glyph(ufo, "f_i", components=[("f", IDENTITY), ("i", (1, 0, 0, 1, 400, 0))])
+    ligature = _glyph(
+        ufo,
+        "f_iacute",
+        components=[("f_i", IDENTITY), ("acutecomb", (1, 0, 0, 1, 400, 100))],
+    )
+    ligature.lib[COMPONENT_INFO_KEY] = [
+        {"name": "acutecomb", "index": 1, "anchor": "top_2"}
+    ]
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["f_i"]) == [("top_1", 200, 700), ("top_2", 500, 600)]
+    assert _anchors(ufo["f_iacute"]) == [("top_1", 200, 700), ("top_2", 500, 800)]
+
+
+def test_existing_and_transformed_anchors(ufo):
+    _glyph(ufo, "a.alt", [("top_1", 0, 0)], components=[("a", IDENTITY)])
+    _glyph(ufo, "a.big", components=[("a", (2, 0, 0, 2, 10, 10))])
+    _glyph(ufo, "a.turned", components=[("a", (-1, 0, 0, -1, 500, 500))])
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["a.alt"]) == [("top_1", 0, 0), ("bottom", 250, 0)]
+    assert _anchors(ufo["a.big"]) == [("bottom", 510, 10), ("top", 510, 1010)]
+    assert _anchors(ufo["a.turned"]) == [("bottom", 250, 500), ("top", 250, 0)]
+
+
+def test_component_cycle(ufo):
+    _glyph(ufo, "cycle1", [("top", 1, 2)], components=[("cycle2", (1, 0, 0, 1, 5, 5))])
+    _glyph(ufo, "cycle2", [("bottom", 3, 4)], components=[("cycle3", IDENTITY)])
+    _glyph(ufo, "cycle3", components=[("cycle1", (1, 0, 0, 1, -5, 0)), ("a", IDENTITY)])
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["cycle1"]) == [
+        ("top", 1, 2),
+        ("bottom", 8, 9),
+        ("top_1", 1, 7),
+        ("top_2", 255, 505),
+    ]
+    assert _anchors(ufo["cycle2"]) == [
+        ("bottom", 3, 4),
+        ("top_1", -4, 2),
+        ("top_2", 250, 500),
+    ]
+    assert _anchors(ufo["cycle3"]) == [
+        ("bottom", 250, 0),
+        ("top_1", -4, 2),
+        ("top_2", 250, 500),
+    ]
+
+
+def test_missing_component(ufo, caplog):
+    _glyph(ufo, "missing", components=[("nosuchglyph", IDENTITY), ("a", IDENTITY)])
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    assert _anchors(ufo["missing"]) == [("bottom", 250, 0), ("top", 250, 500)]
+    assert "inexistent component nosuchglyph" in caplog.text
+
+
+def test_deep_component_chain():
+    # Deeper than the recursion limit, with each glyph before its component
+    length = 3000
+    ufo = ufoLib2.Font()
+    for i in reversed(range(1, length)):
+        _glyph(ufo, f"chain{i}", components=[(f"chain{i - 1}", (1, 0, 0, 1, 1, 1))])
+    _glyph(ufo, "chain0", [("top", 0, 0)], box=(0, 0, 10, 10))
+    to_ufo_propagate_font_anchors(_Builder(), ufo)
+    last = length - 1
+    assert _anchors(ufo[f"chain{last}"]) == [("top", last, last)]